@@ -5,6 +5,7 @@ from django.shortcuts import render
 
 from apps.common import utils as common_utils
 from apps.capabilities.product_management import forms as mgt_forms, models as mgt
+from apps.capabilities.product_management.services import AreaMove, ProductTreeCache, ProductTreeMover
 
 adjectives = [
     "Magnificent",
@@ -85,6 +86,7 @@ def add_node_helper(request, product_area, context):
         return JsonResponse({"error": "Something went wrong."}, status=400)
 
     context["node"] = [common_utils.serialize_tree(product_area.add_child(**form.cleaned_data))]
+    ProductTreeCache.invalidate_area(product_area)
     context["parent"] = product_area
     context["depth"] = int(request.POST.get("depth", 0))
     context["margin_left"] = int(request.POST.get("margin_left", 0))
@@ -100,7 +102,8 @@ def update_node_helper(request, product_area):
 
     if not has_cancelled and has_dropped and parent_id:
         parent = mgt.ProductArea.objects.get(pk=parent_id)
-        product_area.move(parent, "last-child")
+        ProductTreeMover.move([AreaMove(product_area.id, parent.id)])
+        product_area.refresh_from_db()
         talent_target_parent = product_area.get_parent() or 0
         context = {
             "child_count": (
@@ -114,6 +117,7 @@ def update_node_helper(request, product_area):
         product_area.name = form.cleaned_data["name"]
         product_area.description = form.cleaned_data["description"]
         product_area.save()
+        ProductTreeCache.invalidate_area(product_area)
 
     context = {
         "product_area": product_area,
@@ -131,6 +135,7 @@ def add_root_node_helper(request, tree_id, context):
         return JsonResponse({"error": "Something went wrong."}, status=400)
 
     product_area = mgt.ProductArea.add_root(**form.cleaned_data, product_tree_id=tree_id)
+    ProductTreeCache.invalidate(product_area.product_tree_id)
     context["product_area"] = product_area
     context["depth"] = int(request.POST.get("depth", 0)) + 1
     context["margin_left"] = int(request.POST.get("margin_left", 0))
@@ -146,7 +151,7 @@ def shareable_tree_helper(request, product_tree, show_share_button=False):
         "can_modify_product": True,
         "product_tree": product_tree,
         "sharable_link": f"{domain}/product-tree/share/{product_tree.pk}",
-        "tree_data": [common_utils.serialize_tree(node) for node in product_tree.product_areas.filter(depth=1)],
+        "tree_data": ProductTreeCache.get_tree_data(product_tree.pk),
         "show_share_button": show_share_button,
         "margin_left": int(request.GET.get("margin_left", 0)),
         "depth": int(request.GET.get("depth", 0)),
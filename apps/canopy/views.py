@@ -7,6 +7,7 @@ from django.views import generic
 
 from apps.canopy import utils
 from apps.capabilities.product_management import models as mgt
+from apps.capabilities.product_management.services import ProductAreaRollupService, ProductTreeCache
 
 
 def introduction(request):
@@ -96,7 +97,11 @@ def delete_node(request, pk):
 
     if product_area.numchild > 0:
         return JsonResponse({"error": "Unable to delete a node with a child."}, status=400)
+    product_tree_id = product_area.get_product_tree_id()
+    # Its challenges are left without an area, so its ancestors no longer count them
+    ProductAreaRollupService.detach({product_area.id: product_area.path})
     product_area.delete()
+    ProductTreeCache.invalidate(product_tree_id)
     context = {
         "message": "The node has deleted successfully",
         "parent_id": parent.id if parent else None,
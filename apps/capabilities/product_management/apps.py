@@ -5,3 +5,6 @@ class ProductManagementConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.capabilities.product_management"
     verbose_name = "Product Management"
+
+    def ready(self) -> None:
+        import apps.capabilities.product_management.signals
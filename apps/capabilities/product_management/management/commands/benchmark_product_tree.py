@@ -0,0 +1,97 @@
+import time
+import uuid
+from statistics import median
+
+from django.core.management.base import BaseCommand
+
+from apps.capabilities.product_management.models import Product, ProductArea, ProductTree
+from apps.capabilities.product_management.services import ProductTreeService
+from apps.capabilities.talent.models import Person
+from apps.capabilities.security.models import User
+from apps.common.benchmarks import ROLLED_BACK_HELP, count_queries, rolled_back
+
+
+def _legacy_serialize(node):
+    """The recursive serializer as it was: one get_children query per node"""
+    return {
+        "id": node.pk,
+        "node_id": uuid.uuid4(),
+        "name": node.name,
+        "description": node.description,
+        "video_link": node.video_link,
+        "video_name": node.video_name,
+        "video_duration": node.video_duration,
+        "has_saved": True,
+        "children": [_legacy_serialize(child) for child in node.get_children()],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark serializing a product tree: per-node recursion against one path-ordered query. "
+        + ROLLED_BACK_HELP
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nodes", type=int, default=5_000)
+        parser.add_argument("--fanout", type=int, default=8, help="Children per area")
+        parser.add_argument("--roots", type=int, default=5)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with rolled_back(self.stdout):
+            product = self._seed(options)
+            self._run(product, options["repeat"])
+
+    def _seed(self, options):
+        user = User.objects.create(username="benchtreeowner", email="benchtreeowner@example.com")
+        person = Person.objects.create(user=user, full_name="Bench Tree", preferred_name="bench")
+        product = Product.objects.create(
+            name="Tree Benchmark", slug="tree-benchmark", person=person, visibility=Product.Visibility.GLOBAL
+        )
+        product_tree = ProductTree.objects.create(name="Tree Benchmark", product=product)
+
+        # Breadth first, so each level fills up before the next one starts
+        last_root = ProductArea.get_last_root_node()
+        first_step = ProductArea._str2int(last_root.path) + 1 if last_root else 1
+        areas = []
+        frontier = []
+        for step in range(first_step, first_step + min(options["roots"], options["nodes"])):
+            area = ProductArea(name=f"Area {len(areas)}", path=ProductArea._get_path(None, 1, step), depth=1,
+                               numchild=0, product_tree=product_tree)
+            areas.append(area)
+            frontier.append(area)
+        while len(areas) < options["nodes"]:
+            parent = frontier.pop(0)
+            for step in range(1, options["fanout"] + 1):
+                if len(areas) >= options["nodes"]:
+                    break
+                path = ProductArea._get_path(parent.path, parent.depth + 1, step)
+                area = ProductArea(name=f"Area {len(areas)}", path=path, depth=parent.depth + 1, numchild=0)
+                parent.numchild += 1
+                areas.append(area)
+                frontier.append(area)
+        ProductArea.objects.bulk_create(areas, batch_size=2_000)
+        self.stdout.write(f"Seeded {len(areas)} areas, {max(area.depth for area in areas)} levels deep.")
+        return product
+
+    def _time(self, label, repeat, serialize):
+        timings = []
+        for _ in range(repeat):
+            with count_queries() as queries:
+                start = time.perf_counter()
+                serialize()
+                timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(
+            f"{label:<12} median {median(timings):9.2f} ms   queries {queries.count:6d}"
+        )
+
+    def _run(self, product, repeat):
+        product_tree = product.product_trees.first()
+
+        def legacy():
+            roots = ProductArea.get_root_nodes().filter(product_tree=product_tree)
+            return [_legacy_serialize(node) for node in roots]
+
+        self._time("recursive", repeat, legacy)
+        self._time("one query", repeat, lambda: ProductTreeService.get_product_tree_data(product))
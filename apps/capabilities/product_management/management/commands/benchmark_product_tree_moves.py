@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.capabilities.product_management.models import ProductArea, ProductTree
+from apps.capabilities.product_management.services import AreaMove, ProductTreeMover, ProductTreeWriter
+from apps.common.benchmarks import ROLLED_BACK_HELP, count_queries, rolled_back
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark moving large ProductArea subtrees: treebeard's move against ProductTreeMover. "
+        + ROLLED_BACK_HELP
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subtree-size", type=int, default=1_000, help="Areas in each moved subtree")
+        parser.add_argument("--fanout", type=int, default=10, help="Children per area inside a subtree")
+        parser.add_argument("--siblings", type=int, default=20, help="Subtrees under the source area")
+
+    def handle(self, *args, **options):
+        with rolled_back(self.stdout):
+            source, target = self._seed(options)
+            self._run(source, target)
+
+    def _subtree(self, prefix, size, fanout):
+        # Breadth first, so each level fills up before the next one starts
+        root = {"name": prefix, "children": []}
+        frontier, count = [root], 1
+        while count < size:
+            parent = frontier.pop(0)
+            for _ in range(fanout):
+                if count >= size:
+                    break
+                child = {"name": f"{prefix}.{count}", "children": []}
+                parent["children"].append(child)
+                frontier.append(child)
+                count += 1
+        return root
+
+    def _seed(self, options):
+        product_tree = ProductTree.objects.create(name="Move Benchmark")
+        size, fanout = options["subtree_size"], options["fanout"]
+        ProductTreeWriter.replace(product_tree, [
+            {"name": "Source", "children": [self._subtree(f"S{i}", size, fanout) for i in range(options["siblings"])]},
+            {"name": "Target", "children": [self._subtree("T0", size, fanout)]},
+        ])
+        roots = ProductArea.get_product_tree(product_tree.id).filter(depth=1)
+        source, target = sorted(roots, key=lambda area: area.path)
+        self.stdout.write(f"Seeded {ProductArea.get_product_tree(product_tree.id).count()} areas.")
+        return source, target
+
+    def _time(self, label, apply):
+        # Each scenario starts from the same seeded tree
+        with rolled_back():
+            with count_queries() as queries:
+                start = time.perf_counter()
+                apply()
+                elapsed = (time.perf_counter() - start) * 1000
+            if any(ProductArea.find_problems()):
+                self.stderr.write(f"{label}: tree left inconsistent")
+        self.stdout.write(f"{label:<36} {elapsed:9.2f} ms   queries {queries.count:6d}")
+
+    def _run(self, source, target):
+        subtrees = list(source.get_children())
+        first, last = subtrees[0], subtrees[-1]
+
+        def treebeard_move():
+            ProductArea.objects.get(pk=first.pk).move(ProductArea.objects.get(pk=target.pk), "last-child")
+
+        def treebeard_reorder():
+            ProductArea.objects.get(pk=last.pk).move(ProductArea.objects.get(pk=first.pk), "left")
+
+        self._time("treebeard move subtree", treebeard_move)
+        self._time("mover move subtree", lambda: ProductTreeMover.move([AreaMove(first.pk, target.pk)]))
+        self._time("treebeard reorder last to first", treebeard_reorder)
+        self._time("mover reorder last to first", lambda: ProductTreeMover.move([AreaMove(last.pk, source.pk, 0)]))
+
+        def treebeard_batch():
+            for subtree in subtrees:
+                ProductArea.objects.get(pk=subtree.pk).move(ProductArea.objects.get(pk=target.pk), "last-child")
+
+        label = f"all {len(subtrees)} subtrees to target"
+        self._time(f"treebeard {label}", treebeard_batch)
+        self._time(f"mover {label}", lambda: ProductTreeMover.move([AreaMove(s.pk, target.pk) for s in subtrees]))
@@ -0,0 +1,127 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.capabilities.commerce.models import Organisation
+from apps.capabilities.product_management.models import Bounty, Challenge, Product
+from apps.capabilities.product_management.services import SearchService
+from apps.common.benchmarks import ROLLED_BACK_HELP, rolled_back
+
+
+WORDS = (
+    "api authentication backend billing cache dashboard database deploy design docker email export "
+    "frontend graphql import integration invoice kubernetes layout login migration mobile monitoring "
+    "notification onboarding payment performance profile python react refactor report search security "
+    "signup stripe testing translation upload webhook"
+).split()
+
+QUERIES = [
+    "payment",
+    "search performance",
+    "docker deploy",
+    "react dashboard",
+    "stripe webhook",
+    "login -mobile",
+    '"email notification"',
+    "graphql api",
+]
+
+
+# Filler vocabulary so term frequencies look like real text: a long tail of
+# rare words with the domain words above mixed in at varying ranks
+FILLER = [f"word{i}" for i in range(5_000)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark bounty full-text search against a synthetic data set. " + ROLLED_BACK_HELP
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bounties", type=int, default=1_000_000)
+        parser.add_argument("--products", type=int, default=1_000)
+        parser.add_argument("--rounds", type=int, default=25, help="Times each query is repeated")
+        parser.add_argument("--target-ms", type=float, default=50.0, help="p95 latency budget")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        with rolled_back(self.stdout):
+            self._seed(options)
+            self._run(options)
+
+    def _sentence(self, length):
+        return " ".join(random.choices(self.vocabulary, weights=self.weights, k=length))
+
+    def _seed(self, options):
+        batch_size = 10_000
+        self.vocabulary = FILLER[:]
+        for word in WORDS:
+            self.vocabulary.insert(random.randint(0, len(self.vocabulary)), word)
+        # Zipf-like: the n-th most common word appears about 1/n as often as the first
+        self.weights = [1 / rank for rank in range(1, len(self.vocabulary) + 1)]
+        self.stdout.write(f"Seeding {options['bounties']} bounties...")
+        organisation = Organisation.objects.create(name="Search Benchmark Org", username="searchbenchorg")
+        products = Product.objects.bulk_create(
+            [
+                Product(
+                    name=f"Search Product {i}",
+                    slug=f"search-bench-product-{i}",
+                    visibility=random.choice(list(Product.Visibility.values)),
+                    organisation=organisation,
+                )
+                for i in range(options["products"])
+            ],
+            batch_size=batch_size,
+        )
+        challenges = Challenge.objects.bulk_create(
+            [
+                Challenge(title=self._sentence(5), description=self._sentence(30), product=product)
+                for product in products
+            ],
+            batch_size=batch_size,
+        )
+
+        remaining = options["bounties"]
+        while remaining:
+            count = min(batch_size, remaining)
+            Bounty.objects.bulk_create(
+                [
+                    Bounty(
+                        title=self._sentence(6),
+                        description=self._sentence(40),
+                        challenge=random.choice(challenges),
+                        points=random.randint(10, 500),
+                    )
+                    for _ in range(count)
+                ]
+            )
+            remaining -= count
+
+        # bulk_create bypasses post_save, fill the vectors the way a backfill would
+        started = time.perf_counter()
+        SearchService.rebuild_search_vectors(Bounty, batch_size=50_000)
+        self.stdout.write(f"Built bounty vectors in {time.perf_counter() - started:.1f}s")
+        # Give the planner the statistics autovacuum would have gathered on a live table
+        with connection.cursor() as cursor:
+            for model in (Product, Challenge, Bounty):
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    def _run(self, options):
+        timings = []
+        for _ in range(options["rounds"]):
+            for query in QUERIES:
+                started = time.perf_counter()
+                SearchService.search_model(Bounty, query, user=None, limit=10)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p50 = timings[len(timings) // 2]
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(f"{len(timings)} searches   p50 {p50:.2f} ms   p95 {p95:.2f} ms")
+        if p95 <= options["target_ms"]:
+            self.stdout.write(self.style.SUCCESS(f"p95 within the {options['target_ms']:.0f} ms budget"))
+        else:
+            self.stdout.write(self.style.ERROR(f"p95 over the {options['target_ms']:.0f} ms budget"))
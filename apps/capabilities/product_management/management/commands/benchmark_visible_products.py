@@ -0,0 +1,131 @@
+import random
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.capabilities.commerce.models import Organisation
+from apps.capabilities.product_management.models import Product
+from apps.capabilities.product_management.services import ProductService, VisibleProductCache
+from apps.capabilities.security.models import OrganisationPersonRoleAssignment, ProductRoleAssignment, User
+from apps.capabilities.talent.models import Person
+from apps.common.benchmarks import ROLLED_BACK_HELP, rolled_back
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the visible product listing against a synthetic data set. " + ROLLED_BACK_HELP
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10_000)
+        parser.add_argument("--people", type=int, default=100_000)
+        parser.add_argument("--organisations", type=int, default=500)
+        parser.add_argument("--samples", type=int, default=200, help="Number of people to time listings for")
+        parser.add_argument("--page-size", type=int, default=24)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        with rolled_back(self.stdout):
+            people = self._seed(options)
+            self._run(people, options)
+
+    def _seed(self, options):
+        batch_size = 5_000
+        self.stdout.write("Seeding organisations, people and products...")
+        organisations = Organisation.objects.bulk_create(
+            [
+                Organisation(name=f"Benchmark Org {i}", username=f"benchorg{i}")
+                for i in range(options["organisations"])
+            ],
+            batch_size=batch_size,
+        )
+        users = User.objects.bulk_create(
+            [User(username=f"benchuser{i}", email=f"benchuser{i}@example.com") for i in range(options["people"])],
+            batch_size=batch_size,
+        )
+        people = Person.objects.bulk_create(
+            [Person(user=user, full_name=user.username, preferred_name=user.username) for user in users],
+            batch_size=batch_size,
+        )
+
+        visibilities = [Product.Visibility.GLOBAL, Product.Visibility.ORG_ONLY, Product.Visibility.RESTRICTED]
+        products = []
+        for i in range(options["products"]):
+            visibility = random.choice(visibilities)
+            if visibility == Product.Visibility.GLOBAL and i % 4 == 0:
+                products.append(Product(name=f"Product {i}", slug=f"bench-product-{i}", visibility=visibility,
+                                        person=random.choice(people)))
+            else:
+                products.append(Product(name=f"Product {i}", slug=f"bench-product-{i}", visibility=visibility,
+                                        organisation=random.choice(organisations)))
+        products = Product.objects.bulk_create(products, batch_size=batch_size)
+
+        OrganisationPersonRoleAssignment.objects.bulk_create(
+            [
+                OrganisationPersonRoleAssignment(
+                    person=person,
+                    organisation=random.choice(organisations),
+                    role=OrganisationPersonRoleAssignment.OrganisationRoles.MEMBER,
+                )
+                for person in people
+                if random.random() < 0.3
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        ProductRoleAssignment.objects.bulk_create(
+            [
+                ProductRoleAssignment(
+                    person=person,
+                    product=random.choice(products),
+                    role=ProductRoleAssignment.ProductRoles.MEMBER,
+                )
+                for person in people
+                if random.random() < 0.2
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        return random.sample(people, min(options["samples"], len(people)))
+
+    @staticmethod
+    def _join_queryset(person):
+        """The listing query as it was built before visible ids were cached"""
+        user_orgs = Organisation.objects.filter(person_role_assignments__person=person)
+        user_products = Product.objects.filter(
+            Q(role_assignments__person=person)
+            | Q(organisation__in=user_orgs)
+            | Q(person=person)
+        ).distinct()
+        return (
+            Product.objects
+            .filter(Q(visibility=Product.Visibility.GLOBAL) | Q(id__in=user_products.values_list('id', flat=True)))
+            .distinct()
+            .order_by('-created_at')
+            .select_related('person', 'organisation')
+        )
+
+    def _time(self, label, people, build_queryset, page_size):
+        timings = []
+        for person in people:
+            start = time.perf_counter()
+            list(build_queryset(person)[:page_size])
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1] if timings else 0
+        self.stdout.write(f"{label:<28} median {median(timings):8.2f} ms   p95 {p95:8.2f} ms")
+
+    def _run(self, people, options):
+        page_size = options["page_size"]
+
+        def cached(person):
+            return ProductService.get_visible_products(person.user)
+
+        self._time("join query", people, self._join_queryset, page_size)
+        # Start cold for the sampled people only; other entries in the shared cache are left alone
+        VisibleProductCache.invalidate_people(person.id for person in people)
+        self._time("materialised (cold cache)", people, cached, page_size)
+        self._time("materialised (warm cache)", people, cached, page_size)
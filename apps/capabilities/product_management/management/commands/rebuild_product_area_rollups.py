@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.capabilities.product_management.models import ProductTree
+from apps.capabilities.product_management.services import ProductAreaRollupService
+
+
+class Command(BaseCommand):
+    help = "Recount product area rollups, e.g. after bulk imports or updates that bypass the model signals"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tree",
+            type=int,
+            action="append",
+            help="Only rebuild the given product tree (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        tree_ids = options["tree"] or ProductTree.objects.order_by("id").values_list("id", flat=True)
+        areas = sum(ProductAreaRollupService.rebuild(tree_id) for tree_id in tree_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {areas} product areas."))
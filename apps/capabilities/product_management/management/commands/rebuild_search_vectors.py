@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.capabilities.product_management.services import SearchService
+
+
+class Command(BaseCommand):
+    help = "Recompute full-text search vectors, e.g. after bulk imports that bypass post_save"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=[model._meta.model_name for model in SearchService.DOCUMENTS],
+            help="Only rebuild the given model (repeatable)",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        selected = options["model"]
+        for model in SearchService.DOCUMENTS:
+            if selected and model._meta.model_name not in selected:
+                continue
+            updated = SearchService.rebuild_search_vectors(model, batch_size=options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Updated {updated} {model._meta.verbose_name_plural}."))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.2 on 2026-10-17 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_management', '0061_alter_bounty_options_alter_fileattachment_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['visibility', '-created_at'], name='product_man_visibil_45bde2_idx'),
+        ),
+    ]
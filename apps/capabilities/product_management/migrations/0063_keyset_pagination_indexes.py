@@ -0,0 +1,21 @@
+# Generated by Django 4.2.2 on 2026-10-17 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_management', '0062_product_visibility_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bounty',
+            index=models.Index(fields=['-created_at', '-id'], name='product_man_created_d85681_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at', '-id'], name='product_man_created_14ed3f_idx'),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.2 on 2026-10-17 04:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+SEARCHED_FIELDS = {
+    'product': ('name', 'short_description'),
+    'challenge': ('title', 'description'),
+    'bounty': ('title', 'description'),
+    'idea': ('title', 'description'),
+    'bug': ('title', 'description'),
+}
+
+
+def populate_search_vectors(apps, schema_editor):
+    from django.contrib.postgres.search import SearchVector
+
+    config = getattr(settings, 'SEARCH_CONFIG', 'english')
+    for model_name, (heavy, light) in SEARCHED_FIELDS.items():
+        model = apps.get_model('product_management', model_name)
+        model.objects.update(
+            search_vector=SearchVector(heavy, weight='A', config=config) + SearchVector(light, weight='B', config=config)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_management', '0063_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bounty',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bug',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='challenge',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='idea',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Fill vectors before building the GIN indexes, bulk-building is much cheaper
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='bounty',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_man_search__22be5b_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='bug',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_man_search__4d0f99_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='challenge',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_man_search__dfa790_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='idea',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_man_search__f29b37_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='product_man_search__d91dd0_gin'),
+        ),
+    ]
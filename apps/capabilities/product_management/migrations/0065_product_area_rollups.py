@@ -0,0 +1,67 @@
+# Generated by Django 4.2.2 on 2026-10-17 05:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+STEPLEN = 4  # ProductArea.steplen
+FIELDS = ('active_challenges', 'open_bounties', 'open_points', 'total_points')
+
+
+def populate_rollups(apps, schema_editor):
+    ProductArea = apps.get_model('product_management', 'ProductArea')
+    Challenge = apps.get_model('product_management', 'Challenge')
+    Bounty = apps.get_model('product_management', 'Bounty')
+    ProductAreaRollup = apps.get_model('product_management', 'ProductAreaRollup')
+
+    paths = dict(ProductArea.objects.values_list('id', 'path'))
+    by_path = {path: area_id for area_id, path in paths.items()}
+    subtree = {area_id: dict.fromkeys(FIELDS, 0) for area_id in paths}
+
+    def add(area_id, field, value):
+        path = paths.get(area_id)
+        if path is None or not value:
+            return
+        for end in range(STEPLEN, len(path) + 1, STEPLEN):
+            ancestor_id = by_path.get(path[:end])
+            if ancestor_id is not None:
+                subtree[ancestor_id][field] += value
+
+    for area_id in Challenge.objects.filter(status='Active').values_list('product_area_id', flat=True):
+        add(area_id, 'active_challenges', 1)
+    bounties = Bounty.objects.exclude(status='Cancelled').values_list(
+        'challenge__product_area_id', 'status', 'is_active', 'points'
+    )
+    for area_id, status, is_active, points in bounties:
+        add(area_id, 'total_points', points)
+        if is_active and status == 'Available':
+            add(area_id, 'open_bounties', 1)
+            add(area_id, 'open_points', points)
+
+    ProductAreaRollup.objects.bulk_create(
+        [ProductAreaRollup(product_area_id=area_id, **totals) for area_id, totals in subtree.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_management', '0064_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductAreaRollup',
+            fields=[
+                ('product_area', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='product_management.productarea')),
+                ('active_challenges', models.IntegerField(default=0)),
+                ('open_bounties', models.IntegerField(default=0)),
+                ('open_points', models.IntegerField(default=0)),
+                ('total_points', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Product Area Rollups',
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
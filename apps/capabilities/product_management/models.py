@@ -1,6 +1,11 @@
+from functools import reduce
+from operator import or_
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
@@ -69,11 +74,55 @@ class ProductArea(MP_Node, common.AbstractModel, common.AttachmentAbstract):
 
     def __str__(self):
         return self.name
-    
+
+    @classmethod
+    def get_product_tree(cls, product_tree):
+        """
+        Every area of a product tree, ordered by path.
+
+        Only root areas are sure to have product_tree set (children added with
+        add_child don't), so areas are matched on a path prefix of one of its
+        roots, which the path index can serve.
+        """
+        root_paths = cls.objects.filter(product_tree=product_tree, depth=1).values_list("path", flat=True)
+        prefixes = [models.Q(path__startswith=path) for path in root_paths]
+        if not prefixes:
+            return cls.objects.none()
+        return cls.objects.filter(reduce(or_, prefixes)).order_by("path")
+
+    def get_product_tree_id(self):
+        """Tree the area belongs to; children don't store it, so it is read from their root"""
+        if self.product_tree_id or self.is_root():
+            return self.product_tree_id
+        return (
+            type(self).objects.filter(path=self.path[:self.steplen])
+            .values_list("product_tree_id", flat=True)
+            .first()
+        )
+
     class Meta:
         verbose_name_plural = "Product Areas"
 
 
+class ProductAreaRollup(models.Model):
+    """
+    Challenge and bounty totals over an area and every area below it.
+
+    Kept up to date by the challenge and bounty signals, and shifted between
+    ancestors by ProductAreaRollupService when areas move or are deleted.
+    """
+    product_area = models.OneToOneField(
+        ProductArea, on_delete=models.CASCADE, primary_key=True, related_name="rollup"
+    )
+    active_challenges = models.IntegerField(default=0)
+    open_bounties = models.IntegerField(default=0)
+    open_points = models.IntegerField(default=0)
+    total_points = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Product Area Rollups"
+
+
 class Product(TimeStampMixin, UUIDMixin, common.AttachmentAbstract):
     """
     Represents a product that can be owned by either a Person or an Organisation, but not both.
@@ -119,18 +168,23 @@ class Product(TimeStampMixin, UUIDMixin, common.AttachmentAbstract):
 
     name = models.CharField(max_length=255)
     short_description = models.TextField(max_length=256, blank=True, null=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     full_description = models.TextField(blank=True, null=True)
     website = models.URLField(max_length=255, blank=True, null=True)
     detail_url = models.URLField(max_length=255, blank=True, null=True)
     video_url = models.URLField(max_length=255, blank=True, null=True)
     slug = models.SlugField(max_length=255, unique=True)
     photo = models.ImageField(upload_to='products', blank=True, null=True)
+    tracker = FieldTracker(fields=['visibility', 'organisation', 'person', 'name', 'short_description'])
 
     class Meta:
         indexes = [
             models.Index(fields=['slug']),
             models.Index(fields=['organisation']),
             models.Index(fields=['person']),
+            models.Index(fields=['visibility', '-created_at']),
+            models.Index(fields=['-created_at', '-id']),
+            GinIndex(fields=['search_vector']),
         ]
         constraints = [
             models.CheckConstraint(
@@ -355,9 +409,13 @@ class Challenge(TimeStampMixin, UUIDMixin, common.AttachmentAbstract):
         choices=RewardType.choices,
         default=RewardType.NON_LIQUID_POINTS,
     )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name_plural = "Challenges"
+        indexes = [
+            GinIndex(fields=['search_vector']),
+        ]
 
     def __str__(self):
         return self.title
@@ -488,10 +546,17 @@ class Bounty(TimeStampMixin, common.AttachmentAbstract):
         blank=True,
         null=True,
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    tracker = FieldTracker(fields=['title', 'description', 'status', 'points', 'is_active', 'challenge'])
 
     class Meta:
         ordering = ("-created_at",)
         verbose_name_plural = "Bounties"
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            GinIndex(fields=['search_vector']),
+        ]
         
 
     @property
@@ -564,6 +629,14 @@ class Idea(TimeStampMixin):
     description = models.TextField()
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     person = models.ForeignKey("talent.Person", on_delete=models.CASCADE)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    tracker = FieldTracker(fields=['title', 'description'])
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector']),
+        ]
 
     def get_absolute_url(self):
         return reverse("add_product_idea", kwargs={"pk": self.pk})
@@ -577,6 +650,14 @@ class Bug(TimeStampMixin):
     description = models.TextField()
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     person = models.ForeignKey("talent.Person", on_delete=models.CASCADE)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    tracker = FieldTracker(fields=['title', 'description'])
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector']),
+        ]
 
     def get_absolute_url(self):
         return reverse("add_product_bug", kwargs={"product_slug": self.product.slug})
@@ -1,27 +1,39 @@
+import hashlib
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import reduce
 import logging
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from typing import Dict, List, Optional, Tuple
-from django.db.models import Q, QuerySet
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import Case, Count, F, Q, QuerySet, Sum, Value, When
+from django.db.models.functions import Concat, Substr
 from django.http import HttpResponse
 from itertools import groupby
-from operator import attrgetter
+from operator import attrgetter, or_
 from urllib.parse import urlparse
 from abc import ABC, abstractmethod
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.core.serializers.json import DjangoJSONEncoder
 import httpx
 import time
 import json
 from django.urls import reverse
 
 from apps.capabilities.talent.models import Person, Expertise
-from apps.capabilities.security.services import RoleService
+from apps.capabilities.security.services import RoleCache, RoleService
 from apps.common import utils
 from apps.event_hub.events import EventTypes
-from .models import Bounty, Challenge, Product, Idea, Bug, IdeaVote, ProductContributorAgreementTemplate, ProductArea, Initiative
+from .models import (
+    Bounty, Challenge, Product, Idea, Bug, IdeaVote, ProductContributorAgreementTemplate, ProductArea,
+    ProductAreaRollup, Initiative,
+)
 from apps.capabilities.commerce.models import Organisation
 from . import forms
-from apps.capabilities.security.models import ProductRoleAssignment
+from apps.capabilities.security.models import OrganisationPersonRoleAssignment, ProductRoleAssignment
 from apps.common.exceptions import ServiceException, InvalidInputError, ResourceNotFoundError
 from apps.portal.services.ai_services import LLMService
 from apps.event_hub.services.factory import get_event_bus
@@ -94,6 +106,79 @@ class ChallengeCreationService:
             logger.error(f"Error creating challenge: {e}")
             return False, f"Failed to create challenge: {str(e)}"
 
+class VisibleProductCache:
+    """
+    Materialised per-person set of non-GLOBAL product ids a person can see.
+
+    GLOBAL products are matched in SQL through the (visibility, created_at)
+    index, so only the usually small set of private products a person has
+    access to is cached. An entry is keyed by the person's role version (which
+    moves whenever their product or organisation roles change) and by a
+    per-person version bumped by ``invalidate_people`` when a product's
+    visibility or ownership changes.
+    """
+
+    KEY_PREFIX = 'product_management:visible_products'
+
+    @classmethod
+    def _version_key(cls, person_id: int) -> str:
+        return f"{cls.KEY_PREFIX}:{person_id}:version"
+
+    @classmethod
+    def _entry_key(cls, person_id: int) -> str:
+        version = cache.get(cls._version_key(person_id), 1)
+        return f"{cls.KEY_PREFIX}:{person_id}:r{RoleCache.get_version(person_id)}:v{version}"
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'VISIBLE_PRODUCTS_CACHE_TIMEOUT', 600)
+
+    @classmethod
+    def get_product_ids(cls, person: Person) -> List[int]:
+        """Ids of the non-GLOBAL products the person can see"""
+        entry_key = cls._entry_key(person.id)
+        product_ids = cache.get(entry_key)
+        if product_ids is None:
+            product_ids = list(
+                RoleService.get_user_products(person)
+                .exclude(visibility=Product.Visibility.GLOBAL)
+                .values_list('id', flat=True)
+            )
+            cache.set(entry_key, product_ids, cls._timeout())
+        return product_ids
+
+    @classmethod
+    def invalidate_people(cls, person_ids) -> None:
+        """Force the visible set of each given person to be rebuilt on next use"""
+        for person_id in set(person_ids):
+            version_key = cls._version_key(person_id)
+            try:
+                cache.incr(version_key)
+            except ValueError:
+                if not cache.add(version_key, 2, None):
+                    cache.incr(version_key)
+
+    @staticmethod
+    def people_affected_by(product: Product, organisation_ids=(), person_ids=()) -> set:
+        """
+        People whose visible set can contain this product: members of the
+        given organisations (old and new owner), the given owners and anyone
+        holding a role on the product.
+        """
+        affected = set(person_id for person_id in person_ids if person_id)
+        organisation_ids = [org_id for org_id in organisation_ids if org_id]
+        if organisation_ids:
+            affected.update(
+                OrganisationPersonRoleAssignment.objects.filter(
+                    organisation_id__in=organisation_ids
+                ).values_list('person_id', flat=True)
+            )
+        affected.update(
+            ProductRoleAssignment.objects.filter(product=product).values_list('person_id', flat=True)
+        )
+        return affected
+
+
 class ProductService:
     @staticmethod
     def convert_youtube_link_to_embed(url: str) -> str:
@@ -154,20 +239,39 @@ class ProductService:
                    .order_by('-created_at')
                    .select_related('person', 'organisation'))
         
-        # For authenticated users, get all products they have access to
-        user_products = RoleService.get_user_products(user.person)
+        # For authenticated users, add the private products they have access to
+        private_product_ids = VisibleProductCache.get_product_ids(user.person)
         
         return (
             Product.objects
             .filter(
                 Q(visibility=Product.Visibility.GLOBAL) |
-                Q(id__in=user_products.values_list('id', flat=True))
+                Q(id__in=private_product_ids)
             )
-            .distinct()
             .order_by('-created_at')
             .select_related('person', 'organisation')
         )
 
+    @staticmethod
+    def get_visibility_filter(user, product_path: str = '') -> Q:
+        """
+        Q object applying the get_visible_products rules to any model related
+        to Product, without joining through a products subquery.
+
+        Args:
+            user: The authenticated user or None
+            product_path: Lookup path from the filtered model to its Product,
+                e.g. 'challenge__product' for bounties; empty for Product itself
+
+        Returns:
+            Q object limiting rows to products visible to the user
+        """
+        prefix = f"{product_path}__" if product_path else ""
+        visibility_filter = Q(**{f"{prefix}visibility": Product.Visibility.GLOBAL})
+        if user and user.is_authenticated:
+            visibility_filter |= Q(**{f"{prefix}id__in": VisibleProductCache.get_product_ids(user.person)})
+        return visibility_filter
+
     @staticmethod
     def has_product_visibility_access(user, product: Product) -> bool:
         """
@@ -189,9 +293,8 @@ class ProductService:
             return product.visibility == Product.Visibility.GLOBAL
             
         # Check if product is in user's accessible products
-        user_products = RoleService.get_user_products(user.person)
-        return (product.visibility == Product.Visibility.GLOBAL or 
-                user_products.filter(id=product.id).exists())
+        return (product.visibility == Product.Visibility.GLOBAL or
+                product.id in VisibleProductCache.get_product_ids(user.person))
 
 class IdeaService:
     @staticmethod
@@ -413,6 +516,7 @@ class ProductAreaService:
     def create_area(form_data: Dict) -> Tuple[bool, Optional[str], Optional[ProductArea]]:
         try:
             area = ProductArea.add_root(**form_data)
+            ProductTreeCache.invalidate_area(area)
             return True, None, area
         except Exception as e:
             logger.error(f"Error creating product area: {e}")
@@ -421,9 +525,13 @@ class ProductAreaService:
     @staticmethod
     def update_area(area: ProductArea, form_data: Dict) -> Tuple[bool, Optional[str]]:
         try:
+            previous_tree_id = area.get_product_tree_id()
             for key, value in form_data.items():
                 setattr(area, key, value)
             area.save()
+            ProductTreeCache.invalidate(previous_tree_id)
+            if 'product_tree' in form_data:
+                ProductTreeCache.invalidate_area(area)
             return True, None
         except Exception as e:
             logger.error(f"Error updating product area: {e}")
@@ -477,6 +585,800 @@ class ChallengeService:
             'bounty_set'
         )
 
+class ProductTreeCache:
+    """
+    Cross-request cache of serialized product trees.
+
+    Each tree is stored as compact JSON under a per-tree version number, which
+    every add, move, update or delete of one of its areas must bump through
+    invalidate, as must every change to their rollups. Versions live in the
+    shared Django cache, so a bump in one process reaches every web and worker
+    process. A lost version counter restarts from the clock rather than from 1,
+    so it never points back at a snapshot cached before the loss. The ETag is
+    a hash of the JSON rather than the version.
+    """
+
+    KEY_PREFIX = 'product_tree'
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def _version_key(cls, product_tree_id: int) -> str:
+        return f"{cls.KEY_PREFIX}:{product_tree_id}:version"
+
+    @classmethod
+    def _entry_key(cls, product_tree_id: int, version: int) -> str:
+        return f"{cls.KEY_PREFIX}:{product_tree_id}:v{version}"
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'PRODUCT_TREE_CACHE_TIMEOUT', 86400)
+
+    @classmethod
+    def get_version(cls, product_tree_id: int) -> int:
+        """Current version of a tree; changes whenever its areas change"""
+        version_key = cls._version_key(product_tree_id)
+        version = cache.get(version_key)
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(version_key, version, None):
+                version = cache.get(version_key, version)
+        return version
+
+    @classmethod
+    def get_snapshot(cls, product_tree_id: int) -> Dict[str, str]:
+        """
+        Get the serialized tree, building it from the tree's areas on a miss.
+
+        Returns:
+            Dict with 'json', the compact JSON list of root nodes, and 'etag',
+            a quoted strong ETag for it
+        """
+        entry_key = cls._entry_key(product_tree_id, cls.get_version(product_tree_id))
+        snapshot = cache.get(entry_key)
+        if snapshot is not None:
+            cls.hits += 1
+            return snapshot
+
+        cls.misses += 1
+        tree_json = json.dumps(
+            utils.build_tree(
+                ProductArea.get_product_tree(product_tree_id).select_related('rollup'), serialize=cls._serialize_node
+            ),
+            separators=(',', ':'),
+            cls=DjangoJSONEncoder,
+        )
+        snapshot = {'json': tree_json, 'etag': f'"{hashlib.sha1(tree_json.encode()).hexdigest()}"'}
+        cache.set(entry_key, snapshot, cls._timeout())
+        return snapshot
+
+    @staticmethod
+    def _serialize_node(area: ProductArea) -> Dict:
+        return {**utils.serialize_node(area), 'rollup': ProductAreaRollupService.serialize(area)}
+
+    @classmethod
+    def get_tree_data(cls, product_tree_id: int) -> List:
+        return json.loads(cls.get_snapshot(product_tree_id)['json'])
+
+    @classmethod
+    def invalidate(cls, product_tree_id: Optional[int]) -> None:
+        """
+        Make the cached tree unreachable now, and again on commit in case a
+        read cached the old areas meanwhile.
+        """
+        if product_tree_id is None:
+            return
+        cls._bump(product_tree_id)
+        transaction.on_commit(lambda: cls._bump(product_tree_id))
+
+    @classmethod
+    def invalidate_area(cls, area: ProductArea) -> None:
+        """Invalidate the tree an area belongs to"""
+        cls.invalidate(area.get_product_tree_id())
+
+    @classmethod
+    def _bump(cls, product_tree_id: int) -> None:
+        version_key = cls._version_key(product_tree_id)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # No version stored; any new one is past those already used
+            if not cache.add(version_key, time.time_ns(), None):
+                cache.incr(version_key)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        return {'hits': cls.hits, 'misses': cls.misses}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls.hits = 0
+        cls.misses = 0
+
+
+class ProductAreaRollupService:
+    """
+    Maintains ProductAreaRollup, the challenge and bounty totals of every
+    area's subtree.
+
+    A challenge or bounty counts towards the area it is filed under and all of
+    that area's ancestors, which are the prefixes of its materialized path. A
+    change adds its difference to those rows with a single UPDATE, so the
+    totals never have to be recounted on read. Moving or deleting areas shifts
+    what their subtrees add between ancestors the same way (detach, then
+    attach); rebuild recounts a whole tree and is left to the
+    rebuild_product_area_rollups command.
+    """
+
+    FIELDS = ('active_challenges', 'open_bounties', 'open_points', 'total_points')
+
+    @staticmethod
+    def challenge_totals(status: str) -> Dict[str, int]:
+        """What a challenge adds on its own, leaving its bounties out"""
+        return {'active_challenges': int(status == Challenge.ChallengeStatus.ACTIVE)}
+
+    @staticmethod
+    def bounty_totals(status: str, is_active: bool, points: int) -> Dict[str, int]:
+        """What a bounty adds"""
+        is_open = bool(is_active) and status == Bounty.BountyStatus.AVAILABLE
+        return {
+            'open_bounties': int(is_open),
+            'open_points': points if is_open else 0,
+            'total_points': points if status != Bounty.BountyStatus.CANCELLED else 0,
+        }
+
+    @classmethod
+    def _bounty_filters(cls) -> Dict[str, Q]:
+        is_open = Q(bounty__is_active=True, bounty__status=Bounty.BountyStatus.AVAILABLE)
+        return {
+            'open_bounties': Count('bounty', filter=is_open),
+            'open_points': Sum('bounty__points', filter=is_open),
+            'total_points': Sum('bounty__points', filter=~Q(bounty__status=Bounty.BountyStatus.CANCELLED)),
+        }
+
+    @classmethod
+    def get_challenge_totals(cls, challenge: Challenge, status: Optional[str] = None) -> Dict[str, int]:
+        """What a challenge adds together with its bounties, optionally as if it had another status"""
+        totals = Challenge.objects.filter(pk=challenge.pk).aggregate(**cls._bounty_filters())
+        return {
+            **cls.challenge_totals(status or challenge.status),
+            **{field: value or 0 for field, value in totals.items()},
+        }
+
+    @staticmethod
+    def get_challenge_area_id(challenge_id: Optional[int]) -> Optional[int]:
+        return Challenge.objects.filter(pk=challenge_id).values_list('product_area_id', flat=True).first()
+
+    @staticmethod
+    def subtract(first: Dict[str, int], second: Dict[str, int]) -> Dict[str, int]:
+        return {field: first.get(field, 0) - second.get(field, 0) for field in {*first, *second}}
+
+    @classmethod
+    def add(cls, product_area_id: Optional[int], totals: Dict[str, int]) -> int:
+        """
+        Add totals, which may be negative, to the area and its ancestors.
+
+        Returns:
+            Number of rollup rows updated
+        """
+        totals = {field: value for field, value in totals.items() if value}
+        if product_area_id is None or not totals:
+            return 0
+        path = ProductArea.objects.filter(pk=product_area_id).values_list('path', flat=True).first()
+        if path is None:
+            return 0
+
+        steplen = ProductArea.steplen
+        prefixes = [path[:end] for end in range(steplen, len(path) + 1, steplen)]
+        ancestors = dict(ProductArea.objects.filter(path__in=prefixes).values_list('path', 'id'))
+        # Areas get a row the first time something under them changes
+        ProductAreaRollup.objects.bulk_create(
+            [ProductAreaRollup(product_area_id=area_id) for area_id in ancestors.values()],
+            ignore_conflicts=True,
+        )
+        updated = ProductAreaRollup.objects.filter(product_area_id__in=ancestors.values()).update(
+            **{field: F(field) + value for field, value in totals.items()}
+        )
+        root_id = ancestors.get(prefixes[0])
+        if root_id is not None:
+            ProductTreeCache.invalidate(
+                ProductArea.objects.filter(pk=root_id).values_list('product_tree_id', flat=True).first()
+            )
+        return updated
+
+    @classmethod
+    def move(cls, from_area_id: Optional[int], to_area_id: Optional[int],
+             before: Dict[str, int], after: Dict[str, int]) -> None:
+        """Replace what something added under one area with what it adds under another"""
+        if from_area_id == to_area_id:
+            cls.add(to_area_id, cls.subtract(after, before))
+            return
+        cls.add(from_area_id, {field: -value for field, value in before.items()})
+        cls.add(to_area_id, after)
+
+    @classmethod
+    def detach(cls, areas: Dict[int, str]) -> Dict[int, Dict[str, int]]:
+        """
+        Take what the areas' subtrees add off the ancestors of their paths; call
+        it with the paths the areas have before they move or are deleted.
+
+        An area moved together with one of its ancestors only counts once: each
+        area carries its rollup less those of the moved areas nearest below it.
+
+        Returns:
+            What each area carries, for attach once the areas have their new paths
+        """
+        if not areas:
+            return {}
+        rows = ProductAreaRollup.objects.filter(product_area_id__in=areas).values('product_area_id', *cls.FIELDS)
+        rollups = {row.pop('product_area_id'): row for row in rows}
+        carried = {area_id: dict(rollups.get(area_id) or dict.fromkeys(cls.FIELDS, 0)) for area_id in areas}
+        by_path = {path: area_id for area_id, path in areas.items()}
+        steplen = ProductArea.steplen
+        for area_id, path in areas.items():
+            above = next(
+                (by_path[path[:end]] for end in range(len(path) - steplen, 0, -steplen) if path[:end] in by_path),
+                None,
+            )
+            if above is not None and area_id in rollups:
+                carried[above] = cls.subtract(carried[above], rollups[area_id])
+        cls._shift(areas, carried, sign=-1)
+        return carried
+
+    @classmethod
+    def attach(cls, carried: Dict[int, Dict[str, int]]) -> int:
+        """
+        Add what detach returned to the ancestors of the areas' current paths.
+
+        Returns:
+            Number of rollup rows updated
+        """
+        carried = {area_id: totals for area_id, totals in carried.items() if any(totals.values())}
+        if not carried:
+            return 0
+        paths = dict(ProductArea.objects.filter(id__in=carried).values_list('id', 'path'))
+        return cls._shift(paths, carried, sign=1)
+
+    @classmethod
+    def _shift(cls, paths: Dict[int, str], carried: Dict[int, Dict[str, int]], sign: int) -> int:
+        """
+        Add sign times each area's totals to the areas strictly above its path,
+        with one read of the ancestors and one UPDATE for all of them.
+        """
+        steplen = ProductArea.steplen
+        prefixes = {
+            area_id: [path[:end] for end in range(steplen, len(path), steplen)]
+            for area_id, path in paths.items()
+            if any(carried.get(area_id, {}).values())
+        }
+        ancestors = dict(
+            ProductArea.objects.filter(path__in={prefix for chain in prefixes.values() for prefix in chain})
+            .values_list('path', 'id')
+        )
+        deltas: Dict[int, Dict[str, int]] = {}
+        for area_id, chain in prefixes.items():
+            for prefix in chain:
+                if prefix not in ancestors:
+                    continue
+                delta = deltas.setdefault(ancestors[prefix], dict.fromkeys(cls.FIELDS, 0))
+                for field, value in carried[area_id].items():
+                    delta[field] += sign * value
+        deltas = {area_id: delta for area_id, delta in deltas.items() if any(delta.values())}
+        if not deltas:
+            return 0
+        ProductAreaRollup.objects.bulk_create(
+            [ProductAreaRollup(product_area_id=area_id) for area_id in deltas], ignore_conflicts=True
+        )
+        return ProductAreaRollup.objects.filter(product_area_id__in=deltas).update(**{
+            field: F(field) + Case(
+                *(When(product_area_id=area_id, then=Value(delta[field]))
+                  for area_id, delta in deltas.items() if delta[field]),
+                default=Value(0),
+            )
+            for field in cls.FIELDS
+        })
+
+    @classmethod
+    def rebuild(cls, product_tree_id: Optional[int]) -> int:
+        """
+        Recount the rollups of every area of a tree: one read of the areas,
+        one per model for what is filed under each area, then the subtree sums
+        are accumulated over path prefixes and written with one upsert. For
+        repairs after bulk writes that bypass the signals.
+
+        Returns:
+            Number of areas in the tree
+        """
+        if product_tree_id is None:
+            return 0
+        areas = dict(ProductArea.get_product_tree(product_tree_id).values_list('id', 'path'))
+        own = {area_id: dict.fromkeys(cls.FIELDS, 0) for area_id in areas}
+        challenges = (
+            Challenge.objects.filter(product_area_id__in=areas)
+            .values('product_area_id')
+            .annotate(
+                active_challenges=Count('id', filter=Q(status=Challenge.ChallengeStatus.ACTIVE), distinct=True),
+            )
+        )
+        bounties = (
+            Challenge.objects.filter(product_area_id__in=areas)
+            .values('product_area_id')
+            .annotate(**cls._bounty_filters())
+        )
+        for row in [*challenges, *bounties]:
+            totals = own[row.pop('product_area_id')]
+            for field, value in row.items():
+                totals[field] += value or 0
+
+        steplen = ProductArea.steplen
+        by_path = {path: area_id for area_id, path in areas.items()}
+        subtree = {area_id: dict.fromkeys(cls.FIELDS, 0) for area_id in areas}
+        for area_id, totals in own.items():
+            if not any(totals.values()):
+                continue
+            path = areas[area_id]
+            for end in range(steplen, len(path) + 1, steplen):
+                ancestor_id = by_path.get(path[:end])
+                if ancestor_id is not None:
+                    for field, value in totals.items():
+                        subtree[ancestor_id][field] += value
+
+        ProductAreaRollup.objects.bulk_create(
+            [ProductAreaRollup(product_area_id=area_id, **totals) for area_id, totals in subtree.items()],
+            update_conflicts=True,
+            unique_fields=['product_area'],
+            update_fields=list(cls.FIELDS),
+            batch_size=1000,
+        )
+        ProductTreeCache.invalidate(product_tree_id)
+        return len(areas)
+
+    @staticmethod
+    def serialize(area: ProductArea) -> Dict[str, int]:
+        """The area's rollup as a dict, zero if it has none yet; select_related('rollup') avoids a query"""
+        try:
+            rollup = area.rollup
+        except ProductAreaRollup.DoesNotExist:
+            return dict.fromkeys(ProductAreaRollupService.FIELDS, 0)
+        return {field: getattr(rollup, field) for field in ProductAreaRollupService.FIELDS}
+
+
+class ProductTreeWriter:
+    """
+    Persists a whole ProductArea hierarchy in a fixed number of queries.
+
+    treebeard's add_child costs several queries per node. Here the materialized
+    path, depth and numchild of every node are computed in Python from the
+    nested input, and the areas are written with one bulk_create (plus one
+    bulk_update and one delete in diff mode) inside a transaction.
+
+    Nodes are dicts with a name, an optional description and optional
+    children; a node may carry the id of an existing area of the tree, as
+    get_tree_nodes returns them. Every written area gets product_tree set,
+    children included.
+    """
+
+    NAME_LENGTH = ProductArea._meta.get_field('name').max_length
+    DESCRIPTION_LENGTH = ProductArea._meta.get_field('description').max_length
+
+    @staticmethod
+    def get_tree_nodes(product_tree_id: int) -> List[Dict]:
+        """The tree's areas as nested {id, name, description, children} dicts"""
+        def strip(node):
+            return {
+                'id': node['id'],
+                'name': node['name'],
+                'description': node['description'] or '',
+                'children': [strip(child) for child in node['children']],
+            }
+        return [strip(node) for node in ProductTreeCache.get_tree_data(product_tree_id)]
+
+    @classmethod
+    def replace(cls, product_tree, nodes: List[Dict]) -> Dict[str, int]:
+        """
+        Delete every area of the tree and insert nodes in their place.
+
+        Returns:
+            Dict with the number of areas created and deleted
+        """
+        with transaction.atomic():
+            deleted = cls._delete(ProductArea.get_product_tree(product_tree.id).values('id'))
+            areas = [
+                cls._build(ProductArea(), node, path, depth, numchild, product_tree)
+                for node, path, depth, numchild in cls._layout(nodes, [])
+            ]
+            ProductArea.objects.bulk_create(areas, batch_size=1000)
+            ProductTreeCache.invalidate(product_tree.id)
+        return {'created': len(areas), 'updated': 0, 'deleted': deleted}
+
+    @classmethod
+    def apply(cls, product_tree, nodes: List[Dict]) -> Dict[str, int]:
+        """
+        Diff mode: bring the tree in line with nodes, writing only what changed.
+
+        A node matches an existing area by id, or failing that by name among
+        the unmatched children of its parent's area, so a refined tree keeps
+        the areas (and the challenges pointing at them) it still contains.
+        Matched areas are updated, and moved if their position changed;
+        unmatched nodes are created; areas no node matched are deleted.
+
+        Returns:
+            Dict with the number of areas created, updated and deleted
+        """
+        with transaction.atomic():
+            existing = list(ProductArea.get_product_tree(product_tree.id).select_for_update())
+            by_id = {area.id: area for area in existing}
+            children_of: Dict[Optional[int], List[ProductArea]] = {}
+            parent_before: Dict[int, Optional[int]] = {}
+            by_path = {}
+            for area in existing:
+                parent = by_path.get(area.path[:-area.steplen])
+                parent_before[area.id] = parent.id if parent else None
+                children_of.setdefault(parent_before[area.id], []).append(area)
+                by_path[area.path] = area
+
+            matched: Dict[int, ProductArea] = {}
+
+            def match(node, parent_area):
+                area = by_id.get(cls._id(node))
+                if area is None or area.id in matched:
+                    siblings = children_of.get(parent_area.id if parent_area else None, [])
+                    area = next(
+                        (a for a in siblings if a.id not in matched and a.name == node.get('name')), None
+                    )
+                if area is not None:
+                    matched[area.id] = area
+                node['_area'] = area
+                for child in node.get('children') or []:
+                    match(child, area)
+
+            nodes = cls._copy(nodes)
+            for node in nodes:
+                match(node, None)
+
+            root_paths = sorted(area.path for area in existing if area.depth == 1)
+            to_create, to_update = [], []
+            for node, path, depth, numchild in cls._layout(nodes, root_paths):
+                area = node['_area']
+                if area is None:
+                    to_create.append(cls._build(ProductArea(), node, path, depth, numchild, product_tree))
+                    continue
+                before = (area.name, area.description, area.path, area.depth, area.numchild, area.product_tree_id)
+                cls._build(area, node, path, depth, numchild, product_tree)
+                if before != (area.name, area.description, area.path, area.depth, area.numchild,
+                              area.product_tree_id):
+                    to_update.append((area, before[2]))
+
+            # Deleted areas and areas under another parent take what they add off
+            # their old ancestors; a parent created by this diff is id 0 here
+            ids_after = {area.path: area.id for area in matched.values()}
+
+            def parent_after(area):
+                return ids_after.get(area.path[:-area.steplen], 0) if area.depth > 1 else None
+
+            carried = ProductAreaRollupService.detach({
+                area.id: path for path, area in by_path.items()
+                if area.id not in matched or parent_after(area) != parent_before[area.id]
+            })
+            carried = {area_id: totals for area_id, totals in carried.items() if area_id in matched}
+
+            deleted = 0
+            stale = [area.id for area in existing if area.id not in matched]
+            if stale:
+                deleted = cls._delete(stale)
+
+            moved = [area for area, old_path in to_update if area.path != old_path]
+            if moved:
+                # Paths are unique and checked row by row, so park moved areas on
+                # paths outside treebeard's alphabet before giving them their new ones
+                final_paths = {area.id: area.path for area in moved}
+                for area in moved:
+                    area.path = f"~{area.id}"
+                ProductArea.objects.bulk_update(moved, ['path'], batch_size=1000)
+                for area in moved:
+                    area.path = final_paths[area.id]
+            now = timezone.now()
+            for area, _ in to_update:
+                area.updated_at = now
+            ProductArea.objects.bulk_update(
+                [area for area, _ in to_update],
+                ['name', 'description', 'path', 'depth', 'numchild', 'product_tree', 'updated_at'],
+                batch_size=1000,
+            )
+            ProductArea.objects.bulk_create(to_create, batch_size=1000)
+            ProductAreaRollupService.attach(carried)
+            ProductTreeCache.invalidate(product_tree.id)
+        return {'created': len(to_create), 'updated': len(to_update), 'deleted': deleted}
+
+    @staticmethod
+    def _id(node: Dict) -> Optional[int]:
+        try:
+            return int(node.get('id'))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _delete(ids) -> int:
+        """
+        Delete exactly these areas. treebeard's queryset delete would also take
+        their descendants by path, including areas about to move elsewhere.
+        """
+        _, deleted = QuerySet.delete(ProductArea.objects.filter(id__in=ids))
+        return deleted.get(ProductArea._meta.label, 0)
+
+    @staticmethod
+    def _copy(nodes: List[Dict]) -> List[Dict]:
+        return [{**node, 'children': ProductTreeWriter._copy(node.get('children') or [])} for node in nodes]
+
+    @classmethod
+    def _layout(cls, nodes: List[Dict], root_paths: List[str]):
+        """
+        Yield (node, path, depth, numchild) for every node, parents first.
+        Roots take root_paths in order, then paths after the current last root.
+        """
+        root_paths = list(root_paths)
+        if len(root_paths) < len(nodes):
+            last_root = ProductArea.get_last_root_node()
+            step = ProductArea._str2int(last_root.path) if last_root else 0
+            for _ in range(len(nodes) - len(root_paths)):
+                step += 1
+                root_paths.append(ProductArea._get_path(None, 1, step))
+
+        stack = [(node, path, 1) for node, path in reversed(list(zip(nodes, root_paths)))]
+        while stack:
+            node, path, depth = stack.pop()
+            children = node.get('children') or []
+            if not str(node.get('name') or '').strip():
+                raise ValueError(f"Product area at depth {depth} has no name")
+            yield node, path, depth, len(children)
+            for step in range(len(children), 0, -1):
+                stack.append((children[step - 1], ProductArea._get_path(path, depth + 1, step), depth + 1))
+
+    @classmethod
+    def _build(cls, area: ProductArea, node: Dict, path: str, depth: int, numchild: int, product_tree) -> ProductArea:
+        area.name = str(node['name']).strip()[:cls.NAME_LENGTH]
+        area.description = str(node.get('description') or '')[:cls.DESCRIPTION_LENGTH]
+        area.path = path
+        area.depth = depth
+        area.numchild = numchild
+        area.product_tree = product_tree
+        return area
+
+
+@dataclass(frozen=True)
+class AreaMove:
+    """Move an area, with its subtree, under parent_id (None for a new root) at index (None to append)"""
+    area_id: int
+    parent_id: Optional[int] = None
+    index: Optional[int] = None
+
+
+class ProductTreeMover:
+    """
+    Applies a batch of subtree moves and reorders in one transaction.
+
+    treebeard's move rewrites paths one call at a time, and the alternative in
+    canopy, deleting and recreating nodes, is worse. Here the moves are first
+    played out in memory on the sibling lists they touch. Then the subtrees of
+    all areas whose parent or position changed are rewritten by one set-based
+    UPDATE, whatever the number of moves, or two when some area lands on a path
+    that is still in use: paths are unique, so the subtrees are first parked on
+    temporary prefixes. Siblings keep their step where the new order allows it, so
+    inserting in the middle of a group rewrites as few subtrees as possible.
+    """
+
+    @classmethod
+    def move(cls, moves: List[AreaMove]) -> Dict[str, int]:
+        """
+        Apply the moves in order; later moves see the effect of earlier ones.
+
+        Raises:
+            ValueError: An area or parent doesn't exist, or an area would end up inside its own subtree
+
+        Returns:
+            Dict with the number of moves, subtrees rewritten and rows updated
+        """
+        if not moves:
+            return {'moves': 0, 'subtrees': 0, 'rows': 0}
+
+        steplen = ProductArea.steplen
+        with transaction.atomic():
+            ids = {move.area_id for move in moves} | {move.parent_id for move in moves if move.parent_id}
+            nodes = {area.id: area for area in ProductArea.objects.select_for_update().filter(id__in=ids)}
+            missing = ids - nodes.keys()
+            if missing:
+                raise ValueError(f"Product areas not found: {sorted(missing)}")
+
+            # Original parents of the moved areas, and every sibling list involved
+            parent_paths = {nodes[move.area_id].path[:-steplen] for move in moves} - {''}
+            for area in ProductArea.objects.filter(path__in=parent_paths):
+                nodes.setdefault(area.id, area)
+            by_path = {area.path: area for area in nodes.values()}
+            parents = [area for area in nodes.values() if area.path in parent_paths or area.id in ids]
+            children = ProductArea.objects.none()
+            for parent in parents:
+                children = children | ProductArea.objects.filter(depth=parent.depth + 1, path__startswith=parent.path)
+            for area in children:
+                nodes.setdefault(area.id, area)
+                by_path.setdefault(area.path, area)
+
+            def original_parent(area):
+                parent = by_path.get(area.path[:-steplen])
+                return parent.id if parent else None
+
+            def step(area):
+                return ProductArea._str2int(area.path[-steplen:])
+
+            parent_of = {area.id: original_parent(area) for area in nodes.values()}
+            groups: Dict[int, List[int]] = {parent.id: [] for parent in parents}
+            for area in sorted(nodes.values(), key=attrgetter('path')):
+                if parent_of[area.id] in groups:
+                    groups[parent_of[area.id]].append(area.id)
+            new_roots: List[int] = []
+
+            for move in moves:
+                current = groups.get(parent_of[move.area_id]) if parent_of[move.area_id] else new_roots
+                if move.area_id in current:
+                    current.remove(move.area_id)
+                if move.parent_id is None:
+                    new_roots.append(move.area_id)
+                else:
+                    siblings = groups[move.parent_id]
+                    siblings.insert(len(siblings) if move.index is None else move.index, move.area_id)
+                parent_of[move.area_id] = move.parent_id
+
+            # Final (parent, step) of every area whose position changed
+            placed: Dict[int, Tuple[Optional[int], int]] = {}
+            for parent_id, members in groups.items():
+                for area_id, new_step in cls._assign_steps(members, nodes, parent_id, original_parent, step):
+                    placed[area_id] = (parent_id, new_step)
+            if new_roots:
+                last_root = ProductArea.get_last_root_node()
+                next_step = step(last_root) if last_root else 0
+                for area_id in new_roots:
+                    next_step += 1
+                    placed[area_id] = (None, next_step)
+
+            changed = {area_id: nodes[area_id] for area_id in placed}
+            final: Dict[int, str] = {}
+
+            def final_path(area, visiting=()):
+                if area.id in changed:
+                    if area.id in final:
+                        return final[area.id]
+                    if area.id in visiting:
+                        raise ValueError(f"Product area {area.id} cannot be moved into its own subtree")
+                    parent_id, new_step = placed[area.id]
+                    parent_path = final_path(nodes[parent_id], visiting + (area.id,)) if parent_id else None
+                    depth = len(parent_path) // steplen + 1 if parent_path else 1
+                    final[area.id] = ProductArea._get_path(parent_path, depth, new_step)
+                    return final[area.id]
+                ancestor = max(
+                    (other for other in changed.values() if area.path.startswith(other.path)),
+                    key=lambda other: len(other.path),
+                    default=None,
+                )
+                if ancestor is None:
+                    return area.path
+                return final_path(ancestor, visiting) + area.path[len(ancestor.path):]
+
+            for area in changed.values():
+                final_path(area)
+
+            trees = cls._tree_ids([area.path for area in nodes.values()])
+            # Areas that only changed step keep their ancestors and carry nothing across
+            carried = ProductAreaRollupService.detach({
+                area.id: area.path for area in changed.values() if placed[area.id][0] != original_parent(area)
+            })
+            rows = 0
+            if changed:
+                # Deepest first, so a row follows the nearest area above it that changed
+                ordered = sorted(changed.values(), key=lambda area: -area.depth)
+                rewrites = [
+                    (area.path, final[area.id], len(final[area.id]) // steplen - area.depth) for area in ordered
+                ]
+                if ProductArea.objects.filter(path__in=list(final.values())).exists():
+                    # Some areas land on paths still in use, and paths are unique and
+                    # checked row by row: park every subtree on a temporary prefix first
+                    temporary = [f"~{number}~" for number in range(len(rewrites))]
+                    cls._rewrite([(old, parked, 0) for (old, _, _), parked in zip(rewrites, temporary)])
+                    rewrites = [(parked, new, delta) for (_, new, delta), parked in zip(rewrites, temporary)]
+                rows = cls._rewrite(rewrites)
+
+            counts = [
+                ProductArea(id=parent_id, numchild=len(members))
+                for parent_id, members in groups.items()
+                if len(members) != nodes[parent_id].numchild
+            ]
+            ProductArea.objects.bulk_update(counts, ['numchild'])
+            # Roots must carry their tree; children added under a root inherit it
+            for area_id in new_roots:
+                tree_id = trees.get(nodes[area_id].path[:steplen])
+                if tree_id and nodes[area_id].product_tree_id != tree_id:
+                    ProductArea.objects.filter(id=area_id).update(product_tree_id=tree_id)
+            ProductAreaRollupService.attach(carried)
+            for tree_id in set(trees.values()):
+                ProductTreeCache.invalidate(tree_id)
+        return {'moves': len(moves), 'subtrees': len(changed), 'rows': rows}
+
+    @staticmethod
+    def _rewrite(rewrites: List[Tuple[str, str, int]]) -> int:
+        """
+        Replace path prefixes and shift depths in one UPDATE. Each row takes the
+        first (old_prefix, new_prefix, depth_change) whose old prefix it starts with.
+        """
+        return ProductArea.objects.filter(
+            reduce(or_, (Q(path__startswith=old) for old, _, _ in rewrites))
+        ).update(
+            path=Case(*(
+                When(path__startswith=old, then=Concat(Value(new), Substr('path', len(old) + 1)))
+                for old, new, _ in rewrites
+            )),
+            depth=Case(*(When(path__startswith=old, then=F('depth') + delta) for old, _, delta in rewrites)),
+        )
+
+    @staticmethod
+    def _assign_steps(members, nodes, parent_id, original_parent, step):
+        """
+        Yield (area_id, step) for the members of a sibling list whose step has
+        to change. The longest run of original members already in step order
+        keeps its steps; the rest take free steps between them, or the whole
+        list is renumbered when there's no room.
+        """
+        original = [
+            step(nodes[area_id]) if original_parent(nodes[area_id]) == parent_id else None
+            for area_id in members
+        ]
+        keep = ProductTreeMover._longest_increasing(original)
+        wanted = list(original)
+        previous = 0
+        for i, area_id in enumerate(members):
+            if i in keep:
+                previous = original[i]
+                continue
+            following = next((original[j] for j in range(i + 1, len(members)) if j in keep), None)
+            if following is not None and previous + 1 >= following:
+                wanted = list(range(1, len(members) + 1))
+                break
+            previous += 1
+            wanted[i] = previous
+        for area_id, before, after in zip(members, original, wanted):
+            if before != after:
+                yield area_id, after
+
+    @staticmethod
+    def _longest_increasing(values: List[Optional[int]]) -> set:
+        """Indexes of a longest strictly increasing subsequence of the non-None values"""
+        tails, tail_index, previous = [], [], {}
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            position = bisect_left(tails, value)
+            if position == len(tails):
+                tails.append(value)
+                tail_index.append(i)
+            else:
+                tails[position] = value
+                tail_index[position] = i
+            previous[i] = tail_index[position - 1] if position else None
+        result = set()
+        i = tail_index[-1] if tail_index else None
+        while i is not None:
+            result.add(i)
+            i = previous[i]
+        return result
+
+    @staticmethod
+    def _tree_ids(paths: List[str]) -> Dict[str, int]:
+        """Map root paths to the id of the tree that root belongs to"""
+        roots = {path[:ProductArea.steplen] for path in paths}
+        return dict(
+            ProductArea.objects.filter(path__in=roots, product_tree__isnull=False)
+            .values_list('path', 'product_tree_id')
+        )
+
+
 class ProductTreeService:
     @staticmethod
     def get_product_tree_data(product: Product) -> List:
@@ -485,8 +1387,7 @@ class ProductTreeService:
         if not product_tree:
             return []
             
-        product_areas = ProductArea.get_root_nodes().filter(product_tree=product_tree)
-        return [utils.serialize_tree(node) for node in product_areas]
+        return ProductTreeCache.get_tree_data(product_tree.id)
 
 class ProductPeopleService:
     @staticmethod
@@ -512,9 +1413,8 @@ class BountyService:
     @staticmethod
     def get_visible_bounties(user) -> QuerySet:
         """Get all bounties visible to the user."""
-        visible_products = ProductService.get_visible_products(user)
         return (Bounty.objects
-                .filter(challenge__product__in=visible_products)
+                .filter(ProductService.get_visibility_filter(user, 'challenge__product'))
                 .select_related('challenge', 'challenge__product')
                 .order_by('-created_at'))
 
@@ -526,6 +1426,148 @@ class BountyService:
                 .select_related('challenge', 'challenge__product')
                 .order_by('-created_at'))
 
+class SearchService:
+    """
+    Ranked full-text search over products, challenges, bounties, ideas and bugs.
+
+    Each searchable model keeps a weighted tsvector in ``search_vector`` (GIN
+    indexed). Vectors are refreshed by a post_save receiver when one of the
+    searched fields changes, and can be rebuilt in bulk with the
+    ``rebuild_search_vectors`` management command.
+    """
+
+    # model -> (searched fields, heaviest first; lookup path to the product)
+    DOCUMENTS = {
+        Product: (('name', 'short_description'), ''),
+        Challenge: (('title', 'description'), 'product'),
+        Bounty: (('title', 'description'), 'challenge__product'),
+        Idea: (('title', 'description'), 'product'),
+        Bug: (('title', 'description'), 'product'),
+    }
+    RELATED = {
+        Product: (),
+        Challenge: ('product',),
+        Bounty: ('challenge', 'challenge__product'),
+        Idea: ('product',),
+        Bug: ('product',),
+    }
+    WEIGHTS = ('A', 'B', 'C', 'D')
+    MIN_QUERY_LENGTH = 2
+
+    @staticmethod
+    def _config() -> str:
+        return getattr(settings, 'SEARCH_CONFIG', 'english')
+
+    @staticmethod
+    def _max_candidates() -> int:
+        return getattr(settings, 'SEARCH_MAX_CANDIDATES', 1000)
+
+    @classmethod
+    def get_search_vector(cls, model) -> SearchVector:
+        """Weighted vector expression over the searched fields of a model"""
+        fields, _ = cls.DOCUMENTS[model]
+        vector = None
+        for field, weight in zip(fields, cls.WEIGHTS):
+            part = SearchVector(field, weight=weight, config=cls._config())
+            vector = part if vector is None else vector + part
+        return vector
+
+    @classmethod
+    def needs_update(cls, instance, created: bool, update_fields=None) -> bool:
+        """Whether a save touched any of the searched fields"""
+        fields, _ = cls.DOCUMENTS[type(instance)]
+        if created:
+            return True
+        if update_fields is not None and not set(fields) & set(update_fields):
+            return False
+        return any(instance.tracker.has_changed(field) for field in fields)
+
+    @classmethod
+    def update_search_vector(cls, instance) -> None:
+        """Recompute the vector of a single row"""
+        model = type(instance)
+        model.objects.filter(pk=instance.pk).update(search_vector=cls.get_search_vector(model))
+        # The in-memory value is now stale; leaving the field deferred makes
+        # a later save() of this instance skip the column instead of
+        # overwriting the fresh vector.
+        instance.__dict__.pop('search_vector', None)
+
+    @classmethod
+    def rebuild_search_vectors(cls, model, batch_size: int = 10000) -> int:
+        """
+        Recompute vectors for every row of a model in primary key batches,
+        so no single statement locks the whole table.
+
+        Returns:
+            Number of rows updated
+        """
+        vector = cls.get_search_vector(model)
+        updated = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                return updated
+            updated += model.objects.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(search_vector=vector)
+            last_pk = pks[-1]
+
+    @classmethod
+    def search_model(cls, model, query: str, user=None, limit: int = 10) -> List:
+        """
+        Rank rows of one model against a web-search style query.
+
+        Args:
+            model: One of the models in DOCUMENTS
+            query: Raw user input, parsed with websearch_to_tsquery
+            user: Requesting user, results are limited to products they can see
+            limit: Maximum number of rows returned
+
+        Returns:
+            List of model instances annotated with ``rank``, best match first
+
+        Only the first SEARCH_MAX_CANDIDATES matches the GIN index yields are
+        ranked, so a query matching most of the table costs a bounded number
+        of rank computations instead of one per matching row.
+        """
+        _, product_path = cls.DOCUMENTS[model]
+        search_query = SearchQuery(query, search_type='websearch', config=cls._config())
+        candidates = (
+            model.objects
+            .filter(search_vector=search_query)
+            .filter(ProductService.get_visibility_filter(user, product_path))
+            .values('pk')[:cls._max_candidates()]
+        )
+        queryset = (
+            model.objects
+            .filter(pk__in=candidates)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-id')
+        )
+        related = cls.RELATED[model]
+        if related:
+            queryset = queryset.select_related(*related)
+        return list(queryset[:limit])
+
+    @classmethod
+    def search(cls, query: str, user=None, limit: int = 10) -> Dict[str, List]:
+        """
+        Search every document type.
+
+        Returns:
+            Dict of model name ('product', 'challenge', ...) to ranked results;
+            empty for queries shorter than MIN_QUERY_LENGTH
+        """
+        query = (query or '').strip()
+        if len(query) < cls.MIN_QUERY_LENGTH:
+            return {}
+        return {
+            model._meta.model_name: cls.search_model(model, query, user=user, limit=limit)
+            for model in cls.DOCUMENTS
+        }
+
+
 class ProductContentService:
     """Handles ideas, bugs and other product content"""
     
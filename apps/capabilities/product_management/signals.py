@@ -0,0 +1,123 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch.dispatcher import receiver
+
+from .models import Bounty, Bug, Challenge, Idea, Product
+
+
+@receiver(post_save, sender=Product)
+def invalidate_visible_products(sender, instance, created, **kwargs):
+    """
+    Rebuild the cached visible-product sets that can contain this product when
+    it is created or its visibility or ownership changes. Only the members of
+    the old and new owning organisation, the old and new owner and the people
+    holding a role on the product are affected.
+    """
+    tracker = instance.tracker
+    if not created and not any(
+        tracker.has_changed(field) for field in ('visibility', 'organisation', 'person')
+    ):
+        return
+
+    from .services import VisibleProductCache
+
+    person_ids = VisibleProductCache.people_affected_by(
+        instance,
+        organisation_ids={instance.organisation_id, tracker.previous('organisation')},
+        person_ids={instance.person_id, tracker.previous('person')},
+    )
+    VisibleProductCache.invalidate_people(person_ids)
+    transaction.on_commit(lambda: VisibleProductCache.invalidate_people(person_ids))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Challenge)
+@receiver(post_save, sender=Bounty)
+@receiver(post_save, sender=Idea)
+@receiver(post_save, sender=Bug)
+def update_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the full-text vector when a searched field was written"""
+    from .services import SearchService
+
+    if SearchService.needs_update(instance, created, update_fields):
+        SearchService.update_search_vector(instance)
+
+
+def _saved_changes(instance, fields, update_fields=None):
+    """Tracked fields this save changed in the database"""
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields or field.removesuffix('_id') in update_fields]
+    return [field for field in fields if instance.tracker.has_changed(field)]
+
+
+@receiver(post_save, sender=Challenge)
+def update_challenge_rollups(sender, instance, created, update_fields=None, **kwargs):
+    """Carry a new challenge, or a change of its status or area, into the area rollups"""
+    from .services import ProductAreaRollupService as rollups
+
+    if created:
+        rollups.add(instance.product_area_id, rollups.challenge_totals(instance.status))
+        return
+
+    changed = _saved_changes(instance, ('status', 'product_area_id'), update_fields)
+    if not changed:
+        return
+    previous_status = instance.tracker.previous('status') if 'status' in changed else instance.status
+    if 'product_area_id' in changed:
+        # The challenge takes its bounties along to the new area
+        after = rollups.get_challenge_totals(instance)
+        before = {**after, **rollups.challenge_totals(previous_status)}
+        rollups.move(instance.tracker.previous('product_area_id'), instance.product_area_id, before, after)
+    else:
+        rollups.add(
+            instance.product_area_id,
+            rollups.subtract(rollups.challenge_totals(instance.status), rollups.challenge_totals(previous_status)),
+        )
+
+
+@receiver(post_save, sender=Bounty)
+def update_bounty_rollups(sender, instance, created, update_fields=None, **kwargs):
+    """Carry a new bounty, or a change of its status, points or challenge, into the area rollups"""
+    from .services import ProductAreaRollupService as rollups
+
+    after = rollups.bounty_totals(instance.status, instance.is_active, instance.points)
+    if created:
+        rollups.add(rollups.get_challenge_area_id(instance.challenge_id), after)
+        return
+
+    changed = _saved_changes(instance, ('status', 'is_active', 'points', 'challenge'), update_fields)
+    if not changed:
+        return
+    previous = {
+        field: instance.tracker.previous(field) if field in changed else getattr(instance, field)
+        for field in ('status', 'is_active', 'points')
+    }
+    previous_challenge_id = instance.tracker.previous('challenge') if 'challenge' in changed else instance.challenge_id
+    rollups.move(
+        rollups.get_challenge_area_id(previous_challenge_id),
+        rollups.get_challenge_area_id(instance.challenge_id),
+        rollups.bounty_totals(**previous),
+        after,
+    )
+
+
+@receiver(post_delete, sender=Challenge)
+def remove_challenge_rollups(sender, instance, **kwargs):
+    """Bounties are deleted before their challenge and take their own totals out"""
+    from .services import ProductAreaRollupService as rollups
+
+    rollups.add(
+        instance.product_area_id,
+        {field: -value for field, value in rollups.challenge_totals(instance.status).items()},
+    )
+
+
+@receiver(post_delete, sender=Bounty)
+def remove_bounty_rollups(sender, instance, **kwargs):
+    from .services import ProductAreaRollupService as rollups
+
+    totals = rollups.bounty_totals(instance.status, instance.is_active, instance.points)
+    rollups.add(
+        rollups.get_challenge_area_id(instance.challenge_id),
+        {field: -value for field, value in totals.items()},
+    )
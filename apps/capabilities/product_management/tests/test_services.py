@@ -1,14 +1,17 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from apps.capabilities.product_management.models import Product, Challenge, Bounty, Idea, Bug, Initiative, ProductContributorAgreementTemplate, ProductArea, ProductTree
 from apps.capabilities.product_management.services import (
     ProductService, IdeaService, BugService, ChallengeCreationService,
     ProductManagementService, ContributorAgreementService, ProductAreaService,
     InitiativeService, ChallengeService, ProductTreeService, ProductPeopleService,
-    BountyService, ProductContentService
+    BountyService, ProductContentService, SearchService, ProductTreeCache,
+    ProductTreeWriter, ProductTreeMover, AreaMove, ProductAreaRollupService
 )
 from apps.capabilities.talent.models import Person
 from apps.capabilities.commerce.models import Organisation
+from apps.capabilities.security.models import OrganisationPersonRoleAssignment
 from django.utils import timezone
 from apps.common.exceptions import InvalidInputError
 import logging
@@ -76,6 +79,27 @@ class TestProductService:
         assert global_product in visible_products
         assert restricted_product in visible_products
 
+    def test_visible_products_follow_ownership_and_role_changes(self, authenticated_user):
+        member_org = Organisation.objects.create(name="Member Org", username="memberorg")
+        other_org = Organisation.objects.create(name="Other Org", username="otherorg")
+        product = Product.objects.create(
+            name="Cached Product",
+            visibility=Product.Visibility.ORG_ONLY,
+            organisation=other_org
+        )
+        assert product not in ProductService.get_visible_products(authenticated_user)
+
+        OrganisationPersonRoleAssignment.objects.create(
+            person=authenticated_user.person,
+            organisation=member_org,
+            role=OrganisationPersonRoleAssignment.OrganisationRoles.MEMBER
+        )
+        assert product not in ProductService.get_visible_products(authenticated_user)
+
+        product.organisation = member_org
+        product.save()
+        assert product in ProductService.get_visible_products(authenticated_user)
+
     def test_convert_youtube_link_valid(self):
         url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         result = ProductService.convert_youtube_link_to_embed(url)
@@ -397,6 +421,214 @@ class TestProductAreaService:
         area.refresh_from_db()
         assert area.name == "Updated Area"
 
+@pytest.mark.django_db
+class TestProductTreeService:
+    def test_tree_data_is_read_in_path_order_with_stable_ids(self, authenticated_user, django_assert_num_queries):
+        product = Product.objects.create(
+            name="Tree Product",
+            person=authenticated_user.person,
+            visibility=Product.Visibility.GLOBAL
+        )
+        product_tree = ProductTree.objects.create(name="Tree", product=product)
+        other_tree = ProductTree.objects.create(name="Other Tree")
+        first = ProductArea.add_root(name="First", product_tree=product_tree)
+        second = ProductArea.add_root(name="Second", product_tree=product_tree)
+        child = first.add_child(name="Child")
+        child.add_child(name="Grandchild")
+        second.add_child(name="Second Child")
+        ProductArea.add_root(name="Elsewhere", product_tree=other_tree)
+        cache.clear()
+
+        with django_assert_num_queries(3):  # the product's tree, its root paths, then its areas
+            tree_data = ProductTreeService.get_product_tree_data(product)
+
+        assert [node["name"] for node in tree_data] == ["First", "Second"]
+        assert [node["name"] for node in tree_data[0]["children"]] == ["Child"]
+        assert tree_data[0]["children"][0]["children"][0]["name"] == "Grandchild"
+        assert tree_data[1]["children"][0]["name"] == "Second Child"
+        # Served from the snapshot cache until the tree changes
+        with django_assert_num_queries(1):
+            assert ProductTreeService.get_product_tree_data(product) == tree_data
+        ProductTreeCache.invalidate_area(child)
+        assert ProductTreeService.get_product_tree_data(product) == tree_data
+        assert ProductTreeCache.stats()['misses'] >= 2
+
+@pytest.mark.django_db
+class TestProductTreeWriter:
+    def test_replace_and_apply_keep_a_valid_tree(self, django_assert_max_num_queries):
+        cache.clear()
+        ProductArea.add_root(name="Unrelated")
+        product_tree = ProductTree.objects.create(name="Writer Tree")
+        nodes = [
+            {"name": "Onboarding", "description": "First steps", "children": [
+                {"name": "Sign up", "children": [{"name": "Email"}, {"name": "Social"}]},
+                {"name": "Tour"},
+            ]},
+            {"name": "Billing", "children": [{"name": "Invoices"}]},
+        ]
+
+        with django_assert_max_num_queries(8):
+            totals = ProductTreeWriter.replace(product_tree, nodes)
+
+        assert totals["created"] == 7
+        assert all(not problems for problems in ProductArea.find_problems())
+        saved = ProductTreeWriter.get_tree_nodes(product_tree.id)
+        assert [node["name"] for node in saved] == ["Onboarding", "Billing"]
+        assert [child["name"] for child in saved[0]["children"][0]["children"]] == ["Email", "Social"]
+        ids = {area.name: area.id for area in ProductArea.get_product_tree(product_tree.id)}
+
+        # Refined: Tour renamed by id, Social moved under Billing, Invoices dropped, Refunds added
+        onboarding, billing = saved
+        sign_up, tour = onboarding["children"]
+        social = sign_up["children"].pop()
+        tour["name"] = "Product tour"
+        billing["children"] = [social, {"name": "Refunds"}]
+        totals = ProductTreeWriter.apply(product_tree, [onboarding, billing])
+
+        assert totals == {"created": 1, "updated": 4, "deleted": 1}
+        assert all(not problems for problems in ProductArea.find_problems())
+        areas = {area.name: area for area in ProductArea.get_product_tree(product_tree.id)}
+        assert set(areas) == {"Onboarding", "Sign up", "Email", "Product tour", "Billing", "Social", "Refunds"}
+        assert areas["Product tour"].id == ids["Tour"]
+        assert areas["Social"].id == ids["Social"]
+        assert areas["Social"].get_parent() == areas["Billing"]
+        assert areas["Sign up"].numchild == 1
+        assert ProductArea.objects.filter(name="Unrelated").exists()
+
+@pytest.mark.django_db
+class TestProductTreeMover:
+    @staticmethod
+    def names(nodes):
+        return [(node["name"], TestProductTreeMover.names(node["children"])) for node in nodes]
+
+    def test_moves_and_reorders_subtrees(self):
+        cache.clear()
+        product_tree = ProductTree.objects.create(name="Mover Tree")
+        ProductTreeWriter.replace(product_tree, [
+            {"name": "A", "children": [
+                {"name": "A1", "children": [{"name": "A1a"}, {"name": "A1b"}]},
+                {"name": "A2"},
+                {"name": "A3"},
+            ]},
+            {"name": "B", "children": [{"name": "B1"}]},
+        ])
+        areas = {area.name: area for area in ProductArea.get_product_tree(product_tree.id)}
+
+        totals = ProductTreeMover.move([
+            AreaMove(areas["A3"].id, areas["A"].id, 0),
+            AreaMove(areas["A1"].id, areas["B"].id, 0),
+            AreaMove(areas["A1b"].id, None),
+        ])
+
+        assert totals["moves"] == 3
+        assert all(not problems for problems in ProductArea.find_problems())
+        assert self.names(ProductTreeWriter.get_tree_nodes(product_tree.id)) == [
+            ("A", [("A3", []), ("A2", [])]),
+            ("B", [("A1", [("A1a", [])]), ("B1", [])]),
+            ("A1b", []),
+        ]
+
+    def test_rejects_moves_into_own_subtree(self):
+        product_tree = ProductTree.objects.create(name="Cycle Tree")
+        ProductTreeWriter.replace(product_tree, [{"name": "A", "children": [{"name": "A1"}]}])
+        areas = {area.name: area for area in ProductArea.get_product_tree(product_tree.id)}
+
+        with pytest.raises(ValueError):
+            ProductTreeMover.move([AreaMove(areas["A"].id, areas["A1"].id)])
+
+@pytest.mark.django_db
+class TestProductAreaRollupService:
+    @staticmethod
+    def rollups(product_tree):
+        return {
+            area.name: ProductAreaRollupService.serialize(area)
+            for area in ProductArea.get_product_tree(product_tree.id).select_related("rollup")
+        }
+
+    def test_rollups_follow_status_changes_and_moves(self, authenticated_user):
+        cache.clear()
+        product = Product.objects.create(
+            name="Rollup Product", person=authenticated_user.person, visibility=Product.Visibility.GLOBAL
+        )
+        product_tree = ProductTree.objects.create(name="Rollup Tree", product=product)
+        ProductTreeWriter.replace(product_tree, [
+            {"name": "A", "children": [{"name": "A1", "children": [{"name": "A1a"}]}, {"name": "A2"}]},
+            {"name": "B"},
+        ])
+        areas = {area.name: area for area in ProductArea.get_product_tree(product_tree.id)}
+
+        challenge = Challenge.objects.create(
+            title="Deep", product=product, product_area=areas["A1a"], status=Challenge.ChallengeStatus.ACTIVE
+        )
+        Bounty.objects.create(title="Open", challenge=challenge, points=30)
+        claimed = Bounty.objects.create(title="Claimed", challenge=challenge, points=20)
+        claimed.status = Bounty.BountyStatus.CLAIMED
+        claimed.save()
+        other = Challenge.objects.create(title="Shallow", product=product, product_area=areas["A2"])
+        Bounty.objects.create(title="Cancelled", challenge=other, points=5, status=Bounty.BountyStatus.CANCELLED)
+
+        rollups = self.rollups(product_tree)
+        assert rollups["A"] == {"active_challenges": 1, "open_bounties": 1, "open_points": 30, "total_points": 50}
+        assert rollups["A1"] == rollups["A1a"] == rollups["A"]
+        assert rollups["A2"] == rollups["B"] == dict.fromkeys(ProductAreaRollupService.FIELDS, 0)
+
+        challenge.status = Challenge.ChallengeStatus.COMPLETED
+        challenge.product_area = areas["B"]
+        challenge.save()
+        claimed.delete()
+        rollups = self.rollups(product_tree)
+        assert rollups["A"]["total_points"] == 0
+        assert rollups["B"] == {"active_challenges": 0, "open_bounties": 1, "open_points": 30, "total_points": 30}
+
+        # Moving a subtree takes its rollup off its old ancestors and adds it to the new ones
+        ProductTreeMover.move([AreaMove(areas["B"].id, areas["A2"].id)])
+        incremental = self.rollups(product_tree)
+        assert incremental["A"] == incremental["A2"] == incremental["B"]
+        ProductAreaRollupService.rebuild(product_tree.id)
+        assert self.rollups(product_tree) == incremental
+
+        tree_data = ProductTreeService.get_product_tree_data(product)
+        assert tree_data[0]["rollup"]["open_points"] == 30
+
+        challenge.delete()
+        assert all(rollup == dict.fromkeys(ProductAreaRollupService.FIELDS, 0)
+                   for rollup in self.rollups(product_tree).values())
+
+    def test_rollups_follow_nested_moves_and_diffs(self, authenticated_user):
+        cache.clear()
+        product = Product.objects.create(
+            name="Nested Rollups", person=authenticated_user.person, visibility=Product.Visibility.GLOBAL
+        )
+        product_tree = ProductTree.objects.create(name="Nested Tree", product=product)
+        ProductTreeWriter.replace(product_tree, [
+            {"name": "A", "children": [{"name": "A1", "children": [{"name": "A1a"}, {"name": "A1b"}]}]},
+            {"name": "B", "children": [{"name": "B1"}]},
+        ])
+        areas = {area.name: area for area in ProductArea.get_product_tree(product_tree.id)}
+        for name, points in [("A1", 1), ("A1a", 10), ("A1b", 100), ("B1", 1000)]:
+            challenge = Challenge.objects.create(title=name, product=product, product_area=areas[name])
+            Bounty.objects.create(title=name, challenge=challenge, points=points)
+
+        def check():
+            incremental = self.rollups(product_tree)
+            ProductAreaRollupService.rebuild(product_tree.id)
+            assert self.rollups(product_tree) == incremental
+            return {name: rollup["total_points"] for name, rollup in incremental.items()}
+
+        # A1 moves under B while A1b, inside it, moves back under A
+        ProductTreeMover.move([AreaMove(areas["A1"].id, areas["B"].id), AreaMove(areas["A1b"].id, areas["A"].id)])
+        assert check() == {"A": 100, "A1": 11, "A1a": 10, "A1b": 100, "B": 1011, "B1": 1000}
+
+        # A diff deletes A1 and moves its child A1a to the root, and B1 under A1b
+        ProductTreeWriter.apply(product_tree, [
+            {"id": areas["A"].id, "name": "A", "children": [
+                {"id": areas["A1b"].id, "name": "A1b", "children": [{"id": areas["B1"].id, "name": "B1"}]},
+            ]},
+            {"id": areas["B"].id, "name": "B"},
+            {"id": areas["A1a"].id, "name": "A1a"},
+        ])
+        assert check() == {"A": 1100, "A1a": 10, "A1b": 1100, "B": 0, "B1": 1000}
+
 @pytest.mark.django_db
 class TestInitiativeService:
     def test_create_initiative(self, authenticated_user):
@@ -518,6 +750,57 @@ class TestBountyService:
         # Create test bounties...
         # Test retrieval...
 
+@pytest.mark.django_db
+class TestSearchService:
+    def test_ranked_and_limited_to_visible_products(self, authenticated_user):
+        org = Organisation.objects.create(name="Search Org", username="searchorg")
+        public_product = Product.objects.create(
+            name="Public Product",
+            visibility=Product.Visibility.GLOBAL,
+            organisation=org
+        )
+        private_product = Product.objects.create(
+            name="Private Product",
+            visibility=Product.Visibility.RESTRICTED,
+            organisation=org
+        )
+        public_challenge = Challenge.objects.create(title="Payments", product=public_product)
+        private_challenge = Challenge.objects.create(title="Payments", product=private_product)
+        title_match = Bounty.objects.create(
+            title="Stripe payment webhook", description="Handle events", challenge=public_challenge, points=10
+        )
+        description_match = Bounty.objects.create(
+            title="Billing page", description="Show the last payment", challenge=public_challenge, points=10
+        )
+        Bounty.objects.create(
+            title="Payment retries", description="Retry failed charges", challenge=private_challenge, points=10
+        )
+
+        results = SearchService.search("payment", user=authenticated_user)
+
+        assert results['bounty'] == [title_match, description_match]
+        assert results['challenge'] == [public_challenge]
+
+    def test_vector_follows_edits(self, authenticated_user):
+        product = Product.objects.create(
+            name="Search Product",
+            visibility=Product.Visibility.GLOBAL,
+            person=authenticated_user.person
+        )
+        idea = Idea.objects.create(
+            title="Dark mode", description="Add a theme", product=product, person=authenticated_user.person
+        )
+        assert SearchService.search_model(Idea, "dark") == [idea]
+
+        idea.title = "Keyboard shortcuts"
+        idea.save()
+        assert SearchService.search_model(Idea, "dark") == []
+        assert SearchService.search_model(Idea, "keyboard") == [idea]
+
+        idea.description = "Vim bindings"
+        idea.save()
+        assert SearchService.search_model(Idea, "keyboard vim") == [idea]
+
 @pytest.mark.django_db
 class TestProductContentService:
     def test_get_product_content(self, authenticated_user):
@@ -167,6 +167,33 @@ class TestProductListView:
         assert product in response.context['products']
         assert restricted_product not in response.context['products']
 
+    def test_cursor_pagination_walks_every_product_once(self, client, organisation):
+        products = [
+            Product.objects.create(
+                slug=f'product-{i}',
+                name=f'Product {i}',
+                visibility=Product.Visibility.GLOBAL,
+                organisation=organisation
+            )
+            for i in range(15)
+        ]
+
+        first_page = client.get(reverse('product_management:products'))
+        page_obj = first_page.context['page_obj']
+        assert len(first_page.context['products']) == 12
+        assert page_obj.has_next() and not page_obj.has_previous()
+
+        second_page = client.get(reverse('product_management:products'), {'cursor': page_obj.next_cursor})
+        seen = list(first_page.context['products']) + list(second_page.context['products'])
+        assert sorted(p.id for p in seen) == sorted(p.id for p in products)
+        assert not second_page.context['page_obj'].has_next()
+
+        back = client.get(
+            reverse('product_management:products'),
+            {'cursor': second_page.context['page_obj'].previous_cursor}
+        )
+        assert list(back.context['products']) == list(first_page.context['products'])
+
     def test_authenticated_user_sees_create_button(self, authenticated_client, product, mocker):
         response = authenticated_client.get(reverse('product_management:products'))
         assert response.status_code == 200
@@ -250,6 +277,31 @@ class TestProductTreeInteractiveView:
         assert response.context['tree_data'] == mock_tree_data
         assert response.context['can_manage'] == True
 
+@pytest.mark.django_db
+class TestProductTreeSnapshotView:
+    def test_snapshot_is_revalidated_until_the_tree_changes(self, client, product):
+        from django.core.cache import cache
+        from apps.capabilities.product_management.models import ProductArea, ProductTree
+        from apps.capabilities.product_management.services import ProductAreaService
+
+        cache.clear()
+        product_tree = ProductTree.objects.create(name="Snapshot Tree", product=product)
+        area = ProductArea.add_root(name="Area 1", product_tree=product_tree)
+        url = reverse('product_management:product-tree-snapshot', kwargs={'product_slug': product.slug})
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.json()[0]['name'] == 'Area 1'
+        etag = response['ETag']
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        ProductAreaService.update_area(area, {'name': 'Area One'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()[0]['name'] == 'Area One'
+        assert response['ETag'] != etag
+
 @pytest.mark.django_db
 class TestProductPeopleView:
     def test_people_view_uses_services(self, authenticated_client, product, mocker):
@@ -8,6 +8,7 @@ from .views.visibility_managed_marketplace_views import (
     ProductInitiativesView,
     ProductChallengesView,
     ProductTreeInteractiveView,
+    ProductTreeSnapshotView,
     ProductPeopleView,
     ProductListView,
     BountyDetailView,
@@ -17,6 +18,7 @@ from .views.visibility_managed_marketplace_views import (
     ProductBugListView,
     ProductIdeaDetail,
     ProductBugDetail,
+    SearchView,
 )
 
 from .views.authenticated_marketplace_views import (
@@ -50,12 +52,14 @@ app_name = 'product_management'
 # Visibility Manage routes - no login required, visibility controlled by ProductVisibilityCheckMixin
 urlpatterns = [
     path("bounties/", PublicBountyListView.as_view(), name="bounty-list"),
+    path("search/", SearchView.as_view(), name="search"),
     path("<str:product_slug>/challenge/<int:challenge_id>/bounty/<int:pk>/", BountyDetailView.as_view(), name="bounty-detail"),
     path("<str:product_slug>/bounties/", ProductBountyListView.as_view(), name="product-bounties"),
     path("<str:product_slug>/summary/", ProductSummaryView.as_view(), name="product-summary"),
     path("<str:product_slug>/initiatives/", ProductInitiativesView.as_view(), name="product-initiatives"),
     path("<str:product_slug>/challenges/", ProductChallengesView.as_view(), name="product-challenges"),
     path("<str:product_slug>/tree/", ProductTreeInteractiveView.as_view(), name="product-tree"),
+    path("<str:product_slug>/tree.json", ProductTreeSnapshotView.as_view(), name="product-tree-snapshot"),
     path("<str:product_slug>/people/", ProductPeopleView.as_view(), name="product-people"),
     path("<str:product_slug>/ideas-and-bugs/", ProductIdeasAndBugsView.as_view(), name="product-ideas-bugs"),
     path("<str:product_slug>/ideas/", ProductIdeaListView.as_view(), name="product-ideas"),
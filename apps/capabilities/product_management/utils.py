@@ -8,6 +8,7 @@ from django.shortcuts import HttpResponseRedirect, get_object_or_404, redirect
 
 from apps.capabilities.security.models import ProductRoleAssignment
 from apps.capabilities.security.services import RoleService
+from apps.common.utils import serialize_tree  # noqa: F401
 
 from .models import Product
 
@@ -63,21 +64,6 @@ def modify_permission_required(view_func):
     return _wrapped_view
 
 
-def serialize_tree(node):
-    """Serializer for the tree."""
-    return {
-        "id": node.pk,
-        "node_id": uuid.uuid4(),
-        "name": node.name,
-        "description": node.description,
-        "video_link": node.video_link,
-        "video_name": node.video_name,
-        "video_duration": node.video_duration,
-        "has_saved": True,
-        "children": [serialize_tree(child) for child in node.get_children()],
-    }
-
-
 class BaseProductDetailView:
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
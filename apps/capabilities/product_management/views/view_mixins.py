@@ -37,6 +37,11 @@ class ProductVisibilityCheckMixin:
         print(f"\nStarting dispatch, authenticated: {request.user.is_authenticated}")  # Debug print
         
         try:
+            # Load the person's roles once so every RoleService check made while
+            # rendering this request is answered from memory
+            if request.user.is_authenticated and hasattr(request.user, 'person'):
+                RoleService.load_permission_snapshot(request.user.person)
+
             # Get the product first, without requiring authentication
             product = self.get_product()
             print(f"Product visibility value: {product.visibility}")  # Debug print
@@ -60,6 +65,7 @@ class ProductVisibilityCheckMixin:
                     from apps.capabilities.talent.models import Person
                     person, _ = Person.objects.get_or_create(user=request.user)
                     request.user.person = person
+                    RoleService.load_permission_snapshot(person)
                 
                 # Check product access
                 if RoleService.has_product_access(request.user.person, product):
@@ -101,6 +107,8 @@ class ProductManagementRequiredMixin:
         # Check if user has management access
         if not request.user.is_authenticated:
             return redirect_to_login(request.get_full_path())
+
+        RoleService.load_permission_snapshot(request.user.person)
             
         if not RoleService.has_product_management_access(request.user.person, product):
             raise PermissionDenied
@@ -33,6 +33,9 @@ View Types and Visibility Enforcement
 """
 
 
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
 from django.views.generic import ListView, DetailView, TemplateView
 from django.shortcuts import get_object_or_404, redirect
 from django.db.models import Count
@@ -54,39 +57,40 @@ from ..models import (
     Bug
 )
 from .view_mixins import ProductVisibilityCheckMixin
+from apps.common.mixins import KeysetPaginationMixin
 from apps.capabilities.security.services import RoleService
 from apps.capabilities.security.models import ProductRoleAssignment
 from ..services import ProductService
 from apps.capabilities.product_management.services import (
     ChallengeService,
     InitiativeService,
+    ProductTreeCache,
     ProductTreeService,
     ProductPeopleService,
-    BountyService
+    BountyService,
+    SearchService
 )
 from apps.capabilities.product_management.models import Challenge, Bounty
 from apps.capabilities.security.services import RoleService
 
 
-class PublicBountyListView(ListView):
+class PublicBountyListView(KeysetPaginationMixin, ListView):
     """View for listing all public bounties across products"""
     model = Bounty
     template_name = "product_management/bounty/list.html"
+    partial_template_name = "product_management/bounty/partials/list_partials.html"
     context_object_name = 'bounties'
     paginate_by = 20
 
     def get_queryset(self):
-        bounties = BountyService.get_visible_bounties(self.request.user)
-        # Mark descriptions as safe HTML
-        for bounty in bounties:
-            bounty.description = mark_safe(bounty.description)
-        return bounties
+        return BountyService.get_visible_bounties(self.request.user)
 
 
-class ProductBountyListView(ProductVisibilityCheckMixin, ListView):
+class ProductBountyListView(ProductVisibilityCheckMixin, KeysetPaginationMixin, ListView):
     """View for listing bounties for a specific product"""
     model = Bounty
     template_name = "product_management/product_bounties.html"
+    partial_template_name = "product_management/bounty/partials/list_partials.html"
     context_object_name = 'bounties'
     paginate_by = 20
 
@@ -212,6 +216,28 @@ class ProductTreeInteractiveView(ProductVisibilityCheckMixin, DetailView):
         return context
 
 
+class ProductTreeSnapshotView(ProductVisibilityCheckMixin, View):
+    """
+    The product tree as compact JSON, with an ETag so clients can revalidate
+    it and get a 304 until the tree changes.
+    """
+
+    def get(self, request, *args, **kwargs):
+        product_tree = self.get_product().product_trees.first()
+        if product_tree:
+            snapshot = ProductTreeCache.get_snapshot(product_tree.id)
+        else:
+            snapshot = {'json': '[]', 'etag': '"empty"'}
+
+        response = get_conditional_response(request, etag=snapshot['etag'])
+        if response is None:
+            response = HttpResponse(snapshot['json'], content_type='application/json')
+        response['ETag'] = snapshot['etag']
+        # Cacheable by the browser only, and always revalidated
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
 class ProductPeopleView(ProductVisibilityCheckMixin, ListView):
     """Public view for product people/contributors"""
     template_name = 'product_management/product_people.html'
@@ -233,7 +259,7 @@ class ProductPeopleView(ProductVisibilityCheckMixin, ListView):
         return context 
 
 
-class ProductListView(ListView):
+class ProductListView(KeysetPaginationMixin, ListView):
     """View for listing all visible products"""
     model = Product
     template_name = "product_management/products.html"
@@ -444,4 +470,21 @@ class BountyDetailView(ProductVisibilityCheckMixin, DetailView):
         # Add expertise list if needed
         context['expertise_list'] = []  # Add actual expertise list here if you have one
         
-        return context
\ No newline at end of file
+        return context
+
+
+class SearchView(TemplateView):
+    """Full-text search across products, challenges, bounties, ideas and bugs"""
+    template_name = "product_management/search.html"
+
+    def get_template_names(self):
+        if self.request.htmx:
+            return ["product_management/partials/search_results.html"]
+        return [self.template_name]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        context['query'] = query
+        context['results'] = SearchService.search(query, user=self.request.user)
+        return context
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 from apps.common.mixins import TimeStampMixin, UUIDMixin
@@ -38,6 +40,10 @@ class User(AbstractUser, TimeStampMixin):
 
     class Meta:
         app_label = 'security'
+        indexes = [
+            # Django's icontains/istartswith compare UPPER(column), index that expression
+            GinIndex(OpClass(Upper("email"), name="gin_trgm_ops"), name="security_user_email_trgm"),
+        ]
 
 
 class SignUpRequest(TimeStampMixin):
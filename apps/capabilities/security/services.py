@@ -1,5 +1,7 @@
 from typing import List, Dict, Optional, Union, Tuple
 from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import QuerySet, Q
 import logging
 
@@ -60,7 +62,215 @@ class UserService:
         return User.objects.filter(username=username).first()
 
 
+class RoleCache:
+    """
+    Cross-request cache of each person's product and organisation role maps.
+
+    Entries live in the Django cache under a per-person version number.
+    Invalidation bumps the version instead of deleting the entry, so a reader
+    that loaded roles just before a change can only write them under the old,
+    no longer used version.
+    """
+
+    KEY_PREFIX = 'security:roles'
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def _version_key(cls, person_id: int) -> str:
+        return f"{cls.KEY_PREFIX}:{person_id}:version"
+
+    @classmethod
+    def _entry_key(cls, person_id: int, version: int) -> str:
+        return f"{cls.KEY_PREFIX}:{person_id}:v{version}"
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'ROLE_CACHE_TIMEOUT', 300)
+
+    @classmethod
+    def get_version(cls, person_id: int) -> int:
+        """Current role version of a person; changes whenever their roles change"""
+        version_key = cls._version_key(person_id)
+        version = cache.get(version_key)
+        if version is None:
+            version = 1
+            cache.add(version_key, version, None)
+        return version
+
+    @classmethod
+    def get_role_maps(cls, person_id: int) -> Tuple[Dict[int, set], Dict[int, set]]:
+        """
+        Get (product_roles, organisation_roles) for a person, each mapping an
+        object id to the set of roles held on it.
+        """
+        entry_key = cls._entry_key(person_id, cls.get_version(person_id))
+        entry = cache.get(entry_key)
+        if entry is not None:
+            cls.hits += 1
+        else:
+            cls.misses += 1
+            entry = cls._load_role_maps(person_id)
+            cache.set(entry_key, entry, cls._timeout())
+
+        return (
+            {product_id: set(roles) for product_id, roles in entry['products'].items()},
+            {organisation_id: set(roles) for organisation_id, roles in entry['organisations'].items()},
+        )
+
+    @staticmethod
+    def _load_role_maps(person_id: int) -> Dict:
+        products: Dict[int, List[str]] = {}
+        for product_id, role in ProductRoleAssignment.objects.filter(
+            person_id=person_id
+        ).values_list('product_id', 'role'):
+            products.setdefault(product_id, []).append(role)
+
+        organisations: Dict[int, List[str]] = {}
+        for organisation_id, role in OrganisationPersonRoleAssignment.objects.filter(
+            person_id=person_id
+        ).values_list('organisation_id', 'role'):
+            organisations.setdefault(organisation_id, []).append(role)
+
+        return {'products': products, 'organisations': organisations}
+
+    @classmethod
+    def invalidate(cls, person_id: int) -> None:
+        """Make the cached role maps of a person unreachable"""
+        version_key = cls._version_key(person_id)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # No version stored yet; start past the default version readers use
+            if not cache.add(version_key, 2, None):
+                cache.incr(version_key)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        return {'hits': cls.hits, 'misses': cls.misses}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls.hits = 0
+        cls.misses = 0
+
+
+class PermissionSnapshot:
+    """
+    In-memory view of all product and organisation roles held by a person.
+
+    Loaded from RoleCache (two queries on a miss, none on a hit) and then used
+    to answer every RoleService predicate for the rest of the request, instead
+    of one query per check.
+    """
+
+    PRODUCT_ACCESS_ROLES = frozenset([
+        ProductRoleAssignment.ProductRoles.ADMIN,
+        ProductRoleAssignment.ProductRoles.MANAGER,
+        ProductRoleAssignment.ProductRoles.MEMBER
+    ])
+    PRODUCT_MANAGEMENT_ROLES = frozenset([
+        ProductRoleAssignment.ProductRoles.ADMIN,
+        ProductRoleAssignment.ProductRoles.MANAGER
+    ])
+    ORGANISATION_ACCESS_ROLES = frozenset([
+        OrganisationPersonRoleAssignment.OrganisationRoles.OWNER,
+        OrganisationPersonRoleAssignment.OrganisationRoles.MANAGER,
+        OrganisationPersonRoleAssignment.OrganisationRoles.MEMBER
+    ])
+    ORGANISATION_MANAGEMENT_ROLES = frozenset([
+        OrganisationPersonRoleAssignment.OrganisationRoles.OWNER,
+        OrganisationPersonRoleAssignment.OrganisationRoles.MANAGER
+    ])
+
+    def __init__(
+        self,
+        person_id: int,
+        product_roles: Dict[int, set],
+        organisation_roles: Dict[int, set]
+    ):
+        self.person_id = person_id
+        self.product_roles = product_roles
+        self.organisation_roles = organisation_roles
+
+    @classmethod
+    def load(cls, person: Person) -> "PermissionSnapshot":
+        """Load every role assignment of a person"""
+        product_roles, organisation_roles = RoleCache.get_role_maps(person.id)
+        return cls(person.id, product_roles, organisation_roles)
+
+    @staticmethod
+    def _as_role_set(roles: Union[str, List[str]]) -> set:
+        if not isinstance(roles, (list, tuple, set, frozenset)):
+            return {roles}
+        return set(roles)
+
+    def has_product_role(self, product: Product, roles: Union[str, List[str]]) -> bool:
+        held = self.product_roles.get(product.id, ())
+        return not self._as_role_set(roles).isdisjoint(held)
+
+    def has_organisation_role(self, organisation: Organisation, roles: Union[str, List[str]]) -> bool:
+        if organisation is None:
+            return False
+        held = self.organisation_roles.get(organisation.id, ())
+        return not self._as_role_set(roles).isdisjoint(held)
+
+    def _has_organisation_role_by_id(self, organisation_id: Optional[int], roles: frozenset) -> bool:
+        if organisation_id is None:
+            return False
+        return not roles.isdisjoint(self.organisation_roles.get(organisation_id, ()))
+
+    def has_product_access(self, product: Product) -> bool:
+        if product.person_id == self.person_id:
+            return True
+        if self.has_product_role(product, self.PRODUCT_ACCESS_ROLES):
+            return True
+        return self._has_organisation_role_by_id(product.organisation_id, self.ORGANISATION_ACCESS_ROLES)
+
+    def has_product_management_access(self, product: Product) -> bool:
+        if product.person_id == self.person_id:
+            return True
+        if self.has_product_role(product, self.PRODUCT_MANAGEMENT_ROLES):
+            return True
+        return self._has_organisation_role_by_id(product.organisation_id, self.ORGANISATION_MANAGEMENT_ROLES)
+
+    def can_access_product_by_visibility(self, product: Product) -> bool:
+        if product.visibility == Product.Visibility.GLOBAL:
+            return True
+        if product.visibility == Product.Visibility.ORG_ONLY:
+            return self._has_organisation_role_by_id(product.organisation_id, self.ORGANISATION_ACCESS_ROLES)
+        if product.visibility == Product.Visibility.RESTRICTED:
+            return self.has_product_role(product, self.PRODUCT_ACCESS_ROLES)
+        return False
+
+
 class RoleService:
+    @staticmethod
+    def load_permission_snapshot(person: Person) -> PermissionSnapshot:
+        """
+        Load a person's roles once and attach them to the person instance.
+
+        While attached, RoleService predicates called with this same person
+        instance answer from memory. Views call this at the start of a request
+        so every later check on ``request.user.person`` is query-free.
+        """
+        snapshot = getattr(person, '_permission_snapshot', None)
+        if snapshot is None:
+            snapshot = PermissionSnapshot.load(person)
+            person._permission_snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def _get_permission_snapshot(person: Optional[Person]) -> Optional[PermissionSnapshot]:
+        return getattr(person, '_permission_snapshot', None)
+
+    @staticmethod
+    def clear_permission_snapshot(person: Person) -> None:
+        """Drop a snapshot attached to the person so the next check hits the database"""
+        if hasattr(person, '_permission_snapshot'):
+            del person._permission_snapshot
+
     @staticmethod
     def get_product_roles(person: Person, product: Optional[Product] = None) -> QuerySet:
         """
@@ -115,6 +325,10 @@ class RoleService:
         Returns:
             bool indicating if person has any of the specified roles
         """
+        snapshot = RoleService._get_permission_snapshot(person)
+        if snapshot is not None:
+            return snapshot.has_product_role(product, roles)
+
         if not isinstance(roles, (list, tuple)):
             roles = [roles]
         return ProductRoleAssignment.objects.filter(
@@ -140,6 +354,10 @@ class RoleService:
         Returns:
             bool indicating if person has any of the specified roles
         """
+        snapshot = RoleService._get_permission_snapshot(person)
+        if snapshot is not None:
+            return snapshot.has_organisation_role(organisation, roles)
+
         if not isinstance(roles, (list, tuple)):
             roles = [roles]
         return OrganisationPersonRoleAssignment.objects.filter(
@@ -282,6 +500,8 @@ class RoleService:
             product=product,
             defaults={'role': role}
         )
+        RoleCache.invalidate(person.id)
+        cls.clear_permission_snapshot(person)
         return assignment
 
     @classmethod
@@ -307,6 +527,8 @@ class RoleService:
             organisation=organisation,
             defaults={'role': role}
         )
+        RoleCache.invalidate(person.id)
+        cls.clear_permission_snapshot(person)
         return assignment
 
     @classmethod
@@ -316,6 +538,8 @@ class RoleService:
             person=person,
             product=product
         ).delete()
+        RoleCache.invalidate(person.id)
+        cls.clear_permission_snapshot(person)
 
     @classmethod
     def remove_organisation_role(cls, person: Person, organisation: Organisation) -> None:
@@ -324,6 +548,8 @@ class RoleService:
             person=person,
             organisation=organisation
         ).delete()
+        RoleCache.invalidate(person.id)
+        cls.clear_permission_snapshot(person)
 
     @staticmethod
     def get_managed_products(person: Person) -> QuerySet:
@@ -333,28 +559,26 @@ class RoleService:
         2. Has management rights through organizations
         3. Is the direct owner (person field)
         """
-        # Get organizations where person has management rights
-        managed_orgs = Organisation.objects.filter(
-            person_role_assignments__person=person,
-            person_role_assignments__role__in=[
-                OrganisationPersonRoleAssignment.OrganisationRoles.OWNER,
-                OrganisationPersonRoleAssignment.OrganisationRoles.MANAGER
-            ]
-        )
+        product_roles, organisation_roles = RoleCache.get_role_maps(person.id)
+        managed_product_ids = [
+            product_id for product_id, roles in product_roles.items()
+            if not PermissionSnapshot.PRODUCT_MANAGEMENT_ROLES.isdisjoint(roles)
+        ]
+        managed_org_ids = [
+            organisation_id for organisation_id, roles in organisation_roles.items()
+            if not PermissionSnapshot.ORGANISATION_MANAGEMENT_ROLES.isdisjoint(roles)
+        ]
 
         # Combine products where:
         # 1. Person has direct management role assignments
         # 2. Products owned by organizations they manage
         # 3. Products where person is the direct owner
+        # Role ids come from the cached role maps, so no joins (or DISTINCT) are needed
         return Product.objects.filter(
-            Q(role_assignments__person=person,
-              role_assignments__role__in=[
-                  ProductRoleAssignment.ProductRoles.ADMIN,
-                  ProductRoleAssignment.ProductRoles.MANAGER
-              ]) |
-            Q(organisation__in=managed_orgs) |
-            Q(person=person)  # Add this condition for directly owned products
-        ).distinct()
+            Q(id__in=managed_product_ids) |
+            Q(organisation_id__in=managed_org_ids) |
+            Q(person=person)
+        )
 
     @staticmethod
     def get_managed_organisations(person: Person) -> QuerySet:
@@ -411,20 +635,17 @@ class RoleService:
         2. Has access through organizations
         3. Is the direct owner
         """
-        # Get organizations where person has any role
-        user_orgs = Organisation.objects.filter(
-            person_role_assignments__person=person
-        )
+        product_roles, organisation_roles = RoleCache.get_role_maps(person.id)
 
         # Combine products where:
         # 1. Person has any role assignment
         # 2. Products owned by organizations they're part of
         # 3. Products where person is the direct owner
         return Product.objects.filter(
-            Q(role_assignments__person=person) |
-            Q(organisation__in=user_orgs) |
+            Q(id__in=list(product_roles)) |
+            Q(organisation_id__in=list(organisation_roles)) |
             Q(person=person)
-        ).distinct()
+        )
 
     @staticmethod
     def has_product_access(person: Person, product: Product) -> bool:
@@ -437,6 +658,10 @@ class RoleService:
         3. Is the direct owner of the product
         4. Has access through organization roles
         """
+        snapshot = RoleService._get_permission_snapshot(person)
+        if snapshot is not None:
+            return snapshot.has_product_access(product)
+
         # Direct product ownership
         if product.person == person:
             return True
@@ -475,6 +700,10 @@ class RoleService:
             product = product_or_challenge.product
         else:
             product = product_or_challenge
+
+        snapshot = RoleService._get_permission_snapshot(person)
+        if snapshot is not None:
+            return snapshot.has_product_management_access(product)
             
         logger.info(f"Checking product management access for person {person.id} on product {product.id}")
         
@@ -544,6 +773,10 @@ class RoleService:
         # All other visibility levels require authentication
         if person is None:
             return False
+
+        snapshot = RoleService._get_permission_snapshot(person)
+        if snapshot is not None:
+            return snapshot.can_access_product_by_visibility(product)
             
         # ORG_ONLY requires org membership
         if product.visibility == Product.Visibility.ORG_ONLY:
@@ -588,6 +821,10 @@ class RoleService:
     @staticmethod
     def has_organisation_admin_rights(person: Person, organisation: Organisation) -> bool:
         """Check if person has admin rights (OWNER or MANAGER) in the organisation"""
+        snapshot = RoleService._get_permission_snapshot(person)
+        if snapshot is not None:
+            return snapshot.has_organisation_role(organisation, PermissionSnapshot.ORGANISATION_MANAGEMENT_ROLES)
+
         return OrganisationPersonRoleAssignment.objects.filter(
             person=person,
             organisation=organisation,
@@ -1,7 +1,8 @@
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch.dispatcher import receiver
 
-from .models import User
+from .models import OrganisationPersonRoleAssignment, ProductRoleAssignment, User
 
 
 @receiver(pre_save, sender=User)
@@ -24,3 +25,22 @@ def pre_save_receiver(sender, instance, **kwargs):
     if instance.password != old_user.password:
         instance.remaining_budget_for_failed_logins = 3
         instance.password_reset_required = False
+
+
+@receiver(post_save, sender=ProductRoleAssignment)
+@receiver(post_delete, sender=ProductRoleAssignment)
+@receiver(post_save, sender=OrganisationPersonRoleAssignment)
+@receiver(post_delete, sender=OrganisationPersonRoleAssignment)
+def invalidate_role_cache(sender, instance, **kwargs):
+    """
+    Drop the cached role maps of the person whose assignment changed.
+
+    Invalidated straight away for readers inside the same transaction, and
+    again on commit so a concurrent request that re-read the old rows before
+    the commit cannot keep serving them.
+    """
+    from .services import RoleCache
+
+    person_id = instance.person_id
+    RoleCache.invalidate(person_id)
+    transaction.on_commit(lambda: RoleCache.invalidate(person_id))
@@ -0,0 +1,150 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from apps.capabilities.commerce.models import Organisation
+from apps.capabilities.product_management.models import Product
+from apps.capabilities.security.models import OrganisationPersonRoleAssignment, ProductRoleAssignment
+from apps.capabilities.security.services import RoleCache, RoleService
+from apps.capabilities.talent.models import Person
+
+User = get_user_model()
+
+
+@pytest.fixture
+def person(db):
+    user = User.objects.create_user(username='snapshotuser', password='12345')
+    return Person.objects.create(user=user, full_name="Snapshot User")
+
+
+@pytest.fixture
+def organisation(db):
+    return Organisation.objects.create(name="Snapshot Org", username="snapshotorg")
+
+
+@pytest.fixture
+def org_product(organisation):
+    return Product.objects.create(
+        name="Org Product",
+        slug="org-product",
+        visibility=Product.Visibility.ORG_ONLY,
+        organisation=organisation
+    )
+
+
+@pytest.fixture
+def restricted_product(organisation):
+    return Product.objects.create(
+        name="Restricted Product",
+        slug="restricted-product",
+        visibility=Product.Visibility.RESTRICTED,
+        organisation=organisation
+    )
+
+
+@pytest.mark.django_db
+class TestPermissionSnapshot:
+    def test_predicates_answer_from_memory(
+        self, person, organisation, org_product, restricted_product, django_assert_num_queries
+    ):
+        OrganisationPersonRoleAssignment.objects.create(
+            person=person,
+            organisation=organisation,
+            role=OrganisationPersonRoleAssignment.OrganisationRoles.MEMBER
+        )
+        ProductRoleAssignment.objects.create(
+            person=person,
+            product=restricted_product,
+            role=ProductRoleAssignment.ProductRoles.MANAGER
+        )
+
+        with django_assert_num_queries(2):
+            RoleService.load_permission_snapshot(person)
+
+        with django_assert_num_queries(0):
+            assert RoleService.has_product_access(person, org_product)
+            assert not RoleService.has_product_management_access(person, org_product)
+            assert RoleService.has_product_management_access(person, restricted_product)
+            assert RoleService.can_access_product_by_visibility(person, org_product)
+            assert RoleService.can_access_product_by_visibility(person, restricted_product)
+            assert RoleService.is_product_manager(person, restricted_product)
+            assert not RoleService.is_organisation_manager(person, organisation)
+
+    def test_snapshot_matches_database_checks(self, person, organisation, org_product, restricted_product):
+        OrganisationPersonRoleAssignment.objects.create(
+            person=person,
+            organisation=organisation,
+            role=OrganisationPersonRoleAssignment.OrganisationRoles.OWNER
+        )
+        products = [org_product, restricted_product]
+        expected = [
+            (
+                RoleService.has_product_access(person, product),
+                RoleService.has_product_management_access(person, product),
+                RoleService.can_access_product_by_visibility(person, product),
+            )
+            for product in products
+        ]
+
+        RoleService.load_permission_snapshot(person)
+
+        assert expected == [
+            (
+                RoleService.has_product_access(person, product),
+                RoleService.has_product_management_access(person, product),
+                RoleService.can_access_product_by_visibility(person, product),
+            )
+            for product in products
+        ]
+
+    def test_role_changes_drop_the_snapshot(self, person, restricted_product):
+        RoleService.load_permission_snapshot(person)
+        assert not RoleService.has_product_access(person, restricted_product)
+
+        RoleService.assign_product_role(person, restricted_product, ProductRoleAssignment.ProductRoles.MEMBER)
+        assert RoleService.has_product_access(person, restricted_product)
+
+        RoleService.load_permission_snapshot(person)
+        RoleService.remove_product_role(person, restricted_product)
+        assert not RoleService.has_product_access(person, restricted_product)
+
+
+@pytest.mark.django_db
+class TestRoleCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        RoleCache.reset_stats()
+
+    def test_role_maps_are_shared_across_requests(self, person, restricted_product, django_assert_num_queries):
+        ProductRoleAssignment.objects.create(
+            person=person,
+            product=restricted_product,
+            role=ProductRoleAssignment.ProductRoles.ADMIN
+        )
+
+        RoleService.load_permission_snapshot(person)
+        fresh_person = Person.objects.get(pk=person.pk)
+        with django_assert_num_queries(0):
+            RoleService.load_permission_snapshot(fresh_person)
+
+        assert RoleCache.stats() == {'hits': 1, 'misses': 1}
+        assert RoleService.has_product_management_access(fresh_person, restricted_product)
+
+    def test_saving_or_deleting_an_assignment_invalidates(self, person, organisation, org_product):
+        assert org_product not in RoleService.get_user_products(person)
+
+        assignment = OrganisationPersonRoleAssignment.objects.create(
+            person=person,
+            organisation=organisation,
+            role=OrganisationPersonRoleAssignment.OrganisationRoles.MEMBER
+        )
+        assert org_product in RoleService.get_user_products(person)
+        assert org_product not in RoleService.get_managed_products(person)
+
+        assignment.role = OrganisationPersonRoleAssignment.OrganisationRoles.MANAGER
+        assignment.save()
+        assert org_product in RoleService.get_managed_products(person)
+
+        assignment.delete()
+        assert org_product not in RoleService.get_user_products(person)
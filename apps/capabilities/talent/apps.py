@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
 
 
 class TalentConfig(AppConfig):
@@ -7,3 +8,5 @@ class TalentConfig(AppConfig):
 
     def ready(self) -> None:
         import apps.capabilities.talent.signals
+
+        pre_migrate.connect(apps.capabilities.talent.signals.install_trigram_extension, sender=self)
@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.capabilities.talent.models import Person
+from apps.capabilities.talent.services import PersonSearchService
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay typeahead keystroke streams against PersonSearchService. "
+        "Each simulated user picks an existing person and types their name one "
+        "key at a time, querying on every keystroke like the search dropdown does."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="Concurrent typists")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run for")
+        parser.add_argument("--keystroke-ms", type=float, default=180.0, help="Mean delay between keystrokes")
+        parser.add_argument("--pause-ms", type=float, default=1500.0, help="Mean pause between two searches")
+        parser.add_argument("--max-typed", type=int, default=8, help="Stop typing a name after this many keys")
+        parser.add_argument("--sample", type=int, default=2000, help="Number of names to draw search targets from")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        names = list(
+            Person.objects.exclude(full_name="").order_by("?").values_list("full_name", flat=True)[:options["sample"]]
+        )
+        if not names:
+            raise CommandError("No people to search for; create some first.")
+
+        PersonSearchService.reset_stats()
+        latencies = []
+        lock = threading.Lock()
+        deadline = time.monotonic() + options["duration"]
+
+        def typist(seed):
+            rng = random.Random(seed)
+            local = []
+            try:
+                while time.monotonic() < deadline:
+                    name = rng.choice(names)
+                    for typed in range(1, min(len(name), options["max_typed"]) + 1):
+                        started = time.perf_counter()
+                        PersonSearchService.typeahead(name[:typed])
+                        local.append((time.perf_counter() - started) * 1000)
+                        time.sleep(rng.expovariate(1000 / options["keystroke_ms"]))
+                        if time.monotonic() >= deadline:
+                            break
+                    time.sleep(rng.expovariate(1000 / options["pause_ms"]))
+            finally:
+                connections.close_all()
+                with lock:
+                    latencies.extend(local)
+
+        threads = [threading.Thread(target=typist, args=(options["seed"] + i,)) for i in range(options["users"])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        if not latencies:
+            raise CommandError("No keystrokes were replayed; increase --duration.")
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+        stats = PersonSearchService.stats()
+        lookups = stats["hits"] + stats["misses"]
+        self.stdout.write(f"{len(latencies)} keystrokes from {options['users']} users in {elapsed:.1f}s "
+                          f"({len(latencies) / elapsed:.0f} req/s)")
+        self.stdout.write(f"p50 {percentile(0.50):.2f} ms   p95 {percentile(0.95):.2f} ms   "
+                          f"p99 {percentile(0.99):.2f} ms   max {latencies[-1]:.2f} ms")
+        if lookups:
+            self.stdout.write(f"cache hit rate {stats['hits'] / lookups:.0%} ({stats['hits']}/{lookups} lookups)")
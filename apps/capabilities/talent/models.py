@@ -3,9 +3,11 @@ from datetime import date
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
 from django.urls import reverse
@@ -61,6 +63,10 @@ class Person(TimeStampMixin):
     class Meta:
         db_table = "talent_person"
         verbose_name_plural = "People"
+        indexes = [
+            # Django's icontains/istartswith compare UPPER(column), index that expression
+            GinIndex(OpClass(Upper("full_name"), name="gin_trgm_ops"), name="talent_person_full_name_trgm"),
+        ]
 
     @property
     def points_status(self):
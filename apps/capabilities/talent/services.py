@@ -1,10 +1,13 @@
 from typing import Dict, List, Optional, Tuple
 from django.db import transaction
 from django.core.exceptions import ValidationError, PermissionDenied, ObjectDoesNotExist
-from django.db.models import QuerySet, Avg, Count
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import BooleanField, Case, QuerySet, Avg, Count, Value, When
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
+import hashlib
 import json
 
 from apps.capabilities.product_management.models import Bounty
@@ -489,3 +492,111 @@ class PersonStatusService:
             'next_status': person.get_next_status(),
             'points_needed': person.get_points_needed_for_next_status()
         }
+
+
+class PersonSearchService:
+    """
+    Typeahead lookup of people by name or email.
+
+    Name and email are matched in two separate queries so each can use its
+    pg_trgm GIN index. Prefix matches rank first, then trigram similarity,
+    and at most PERSON_TYPEAHEAD_LIMIT people are returned. Results are cached
+    per normalised query for a few seconds, since a burst of users typing the
+    same names hits the same prefixes.
+    """
+
+    CACHE_PREFIX = 'talent:person_typeahead'
+    MIN_QUERY_LENGTH = 2
+    # Below this length there are no inner trigrams to match, only prefixes
+    TRIGRAM_MIN_LENGTH = 3
+    MAX_QUERY_LENGTH = 64
+
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def normalise_query(cls, query: Optional[str]) -> str:
+        return " ".join((query or "").lower().split())[:cls.MAX_QUERY_LENGTH]
+
+    @staticmethod
+    def _limit() -> int:
+        return getattr(settings, 'PERSON_TYPEAHEAD_LIMIT', 10)
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'PERSON_TYPEAHEAD_CACHE_TIMEOUT', 30)
+
+    @classmethod
+    def _cache_key(cls, query: str, limit: int) -> str:
+        digest = hashlib.md5(query.encode()).hexdigest()
+        return f"{cls.CACHE_PREFIX}:{limit}:{digest}"
+
+    @classmethod
+    def typeahead(cls, query: Optional[str], limit: Optional[int] = None) -> List[Person]:
+        """
+        People whose name or email matches what has been typed so far.
+
+        Args:
+            query: Raw input from the search box
+            limit: Number of results wanted, capped at PERSON_TYPEAHEAD_LIMIT
+
+        Returns:
+            List of Person objects (only id and full_name loaded), best match first
+        """
+        query = cls.normalise_query(query)
+        if len(query) < cls.MIN_QUERY_LENGTH:
+            return []
+        limit = min(limit or cls._limit(), cls._limit())
+
+        key = cls._cache_key(query, limit)
+        people = cache.get(key)
+        if people is not None:
+            cls.hits += 1
+            return people
+
+        cls.misses += 1
+        people = cls._search(query, limit)
+        cache.set(key, people, cls._timeout())
+        return people
+
+    @classmethod
+    def _ranked(cls, field: str, query: str, limit: int) -> QuerySet:
+        lookup = 'icontains' if len(query) >= cls.TRIGRAM_MIN_LENGTH else 'istartswith'
+        return (
+            Person.objects
+            .filter(**{f"{field}__{lookup}": query})
+            .annotate(
+                prefix_match=Case(
+                    When(**{f"{field}__istartswith": query}, then=Value(True)),
+                    default=Value(False),
+                    output_field=BooleanField(),
+                ),
+                similarity=TrigramSimilarity(field, query),
+            )
+            .order_by('-prefix_match', '-similarity', 'full_name', 'id')
+            .only('id', 'full_name')[:limit]
+        )
+
+    @classmethod
+    def _search(cls, query: str, limit: int) -> List[Person]:
+        best = {}
+        for person in list(cls._ranked('full_name', query, limit)) + list(cls._ranked('user__email', query, limit)):
+            current = best.get(person.id)
+            rank = (person.prefix_match, person.similarity)
+            if current is None or rank > (current.prefix_match, current.similarity):
+                best[person.id] = person
+        ranked = sorted(
+            best.values(),
+            key=lambda person: (not person.prefix_match, -person.similarity, person.full_name.lower(), person.id),
+        )
+        return ranked[:limit]
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        return {'hits': cls.hits, 'misses': cls.misses}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls.hits = 0
+        cls.misses = 0
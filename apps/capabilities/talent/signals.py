@@ -1,3 +1,4 @@
+from django.db import connections
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -33,3 +34,14 @@ def update_bounty_delivery_status(sender, instance, created, **kwargs):
 
             instance.bounty_claim.bounty.challenge.status = actions["challenge_status"]
             instance.bounty_claim.bounty.challenge.save()
+
+
+def install_trigram_extension(sender, using, **kwargs):
+    """
+    Create pg_trgm before migrate runs, so the trigram indexes on Person and
+    User also build when tables are created without migrations, as in tests.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
@@ -0,0 +1,49 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.capabilities.talent.models import Person
+from apps.capabilities.talent.services import PersonSearchService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def people(db):
+    def make(username, email, full_name):
+        user = User.objects.create_user(username=username, email=email, password='12345')
+        return Person.objects.create(user=user, full_name=full_name, preferred_name=full_name.split()[0])
+
+    return {
+        'ada': make('ada', 'ada@example.com', 'Ada Lovelace'),
+        'grace': make('grace', 'admiral@navy.example.com', 'Grace Hopper'),
+        'adam': make('adam', 'adam@example.com', 'Adam Smith'),
+    }
+
+
+@pytest.mark.django_db
+class TestPersonSearchService:
+    @pytest.fixture(autouse=True)
+    def reset_stats(self):
+        PersonSearchService.reset_stats()
+
+    def test_prefix_matches_rank_first_and_email_matches(self, people):
+        results = PersonSearchService.typeahead('ad')
+
+        # Name prefixes first, then Grace through the "admiral@..." email prefix
+        assert set(results[:2]) == {people['ada'], people['adam']}
+        assert results[2] == people['grace']
+
+    def test_results_are_capped_and_cached(self, people, settings, django_assert_num_queries):
+        settings.PERSON_TYPEAHEAD_LIMIT = 1
+
+        with django_assert_num_queries(2):
+            assert len(PersonSearchService.typeahead('Ad', limit=5)) == 1
+        with django_assert_num_queries(0):
+            assert len(PersonSearchService.typeahead('  ad ')) == 1
+
+        assert PersonSearchService.stats() == {'hits': 1, 'misses': 1}
+
+    def test_too_short_queries_do_not_search(self, people, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert PersonSearchService.typeahead('a') == []
+            assert PersonSearchService.typeahead(None) == []
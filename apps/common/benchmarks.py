@@ -0,0 +1,51 @@
+"""Shared plumbing for the benchmark_* management commands."""
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+ROLLED_BACK_HELP = "The data is created inside a transaction that is rolled back afterwards."
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back(stdout=None):
+    """
+    Run the block in a transaction that is always rolled back, so synthetic
+    data never outlives the benchmark. Any other exception propagates.
+
+    Args:
+        stdout: Where to report the rollback, e.g. a command's self.stdout
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        if stdout is not None:
+            stdout.write("Synthetic data rolled back.")
+
+
+class QueryCounter:
+    """Execute wrapper counting the queries that go through it"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """
+    Count the queries run in the block. Unlike CaptureQueriesContext this
+    doesn't read the query log, which stops growing at 9000 entries, so a
+    benchmark that has already seeded a large tree still gets a real count.
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
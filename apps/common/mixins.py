@@ -1,7 +1,10 @@
+import base64
 import json
 import uuid
+from datetime import datetime
 
 from django.db import models
+from django.http import Http404
 
 
 class TimeStampMixin(models.Model):
@@ -123,14 +126,119 @@ class PersonSearchMixin:
         return Person
 
     def get_person_queryset(self):
-        from django.db.models import Q
+        from apps.capabilities.talent.services import PersonSearchService
 
-        if query_parameter := self.request.GET.get("search"):
-            query = Q(Q(full_name__icontains=query_parameter) | Q(user__email__icontains=query_parameter))
-            return self.get_person_model().objects.filter(query)
-        return self.get_person_model().objects.none()
+        return PersonSearchService.typeahead(self.request.GET.get("search"))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["search_result"] = self.get_person_queryset()
-        return context
\ No newline at end of file
+        return context
+
+
+class KeysetPage:
+    """One page of a keyset-paginated listing, used in place of a Django Page"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginationMixin:
+    """
+    Cursor pagination for ListViews ordered newest first on (created_at, id).
+
+    Instead of OFFSET, each page filters on the (created_at, id) of the last
+    row shown, so deep pages cost the same as the first one and only the rows
+    of the rendered page are fetched. Templates get a ``page_obj`` with
+    ``next_cursor``/``previous_cursor`` to pass back in ``?cursor=``. HTMX
+    requests are answered with ``partial_template_name`` when it is set.
+    """
+
+    cursor_query_param = "cursor"
+    partial_template_name = None
+
+    def get_template_names(self):
+        if self.partial_template_name and self.request.htmx:
+            return [self.partial_template_name]
+        return super().get_template_names()
+
+    @staticmethod
+    def encode_cursor(row, reverse=False):
+        position = {
+            "c": row.created_at.isoformat(),
+            "i": row.id,
+            "r": reverse,
+        }
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(position["c"]), int(position["i"]), bool(position["r"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise Http404("Invalid cursor") from e
+
+    @staticmethod
+    def _after(created_at, row_id):
+        """Rows after the given position in newest-first order; the created_at bound keeps it index-friendly"""
+        return models.Q(created_at__lte=created_at) & (
+            models.Q(created_at__lt=created_at) | models.Q(id__lt=row_id)
+        )
+
+    @staticmethod
+    def _before(created_at, row_id):
+        """Rows before the given position in newest-first order"""
+        return models.Q(created_at__gte=created_at) & (
+            models.Q(created_at__gt=created_at) | models.Q(id__gt=row_id)
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        # created_at is set on insert, rows without it cannot be placed on the key
+        queryset = queryset.filter(created_at__isnull=False)
+
+        cursor = self.request.GET.get(self.cursor_query_param)
+        backwards = False
+        if cursor:
+            created_at, row_id, backwards = self.decode_cursor(cursor)
+            if backwards:
+                queryset = queryset.filter(self._before(created_at, row_id)).order_by("created_at", "id")
+            else:
+                queryset = queryset.filter(self._after(created_at, row_id)).order_by("-created_at", "-id")
+        else:
+            queryset = queryset.order_by("-created_at", "-id")
+
+        # One extra row tells whether there is another page in this direction
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or backwards:
+                next_cursor = self.encode_cursor(rows[-1])
+            if cursor and (has_more or not backwards):
+                previous_cursor = self.encode_cursor(rows[0], reverse=True)
+
+        page = KeysetPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
+        return None, page, rows, page.has_other_pages()
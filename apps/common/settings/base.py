@@ -55,6 +55,8 @@ BUILTIN_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    # Registers OpClass as an index expression wrapper, needed by the trigram indexes
+    "django.contrib.postgres",
 ]
 
 INSTALLED_APPS = BUILTIN_APPS + PLATFORM_APPS + THIRD_PARTIES
@@ -113,6 +115,20 @@ DATABASES = {
     }
 }
 
+# Cache
+# Shared by every web and Django-Q process, like the Django-Q broker below, so that
+# invalidating cached roles, visible products, product trees or templates reaches all
+# of them. Create the table with `manage.py createcachetable`.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": os.environ.get("CACHE_TABLE", "django_cache"),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "1000000")),
+        },
+    }
+}
+
 AUTH_USER_MODEL = 'security.User'
 
 # Password validation
@@ -410,6 +426,14 @@ class Media:
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 if not GROQ_API_KEY:
     raise ImproperlyConfigured("GROQ_API_KEY is required")
+# Where Groq requests go; None means Groq itself. Point it at `manage.py fake_llm_server` to work offline
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL') or None
+# LLM gateway (apps.portal.services.llm_gateway): requests sent at once per process, pooled
+# connections, seconds per request or between streamed tokens, and how long replies are cached
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '4'))
+LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', '10'))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '60'))
+LLM_CACHE_TIMEOUT = int(os.getenv('LLM_CACHE_TIMEOUT', '604800'))
 
 # Event Hub Configuration
 EVENT_BUS = {
@@ -417,11 +441,64 @@ EVENT_BUS = {
     'LOGGING_ENABLED': True,
     'TASK_TIMEOUT': 300,  # 5 minutes
     'TASK_RETRIES': 3,
+    # Flush size for apps.event_hub.services.backends.batched.BatchedDjangoQBackend
+    'BATCH_SIZE': int(os.getenv('EVENT_BUS_BATCH_SIZE', '500')),
+    # Used by apps.event_hub.services.backends.threaded.ThreadedBackend
+    'THREAD_POOL_SIZE': int(os.getenv('EVENT_BUS_THREAD_POOL_SIZE', '4')),
+    'LISTENER_TIMEOUT': float(os.getenv('EVENT_BUS_LISTENER_TIMEOUT', '5')),
+    'SYNC': os.getenv('EVENT_BUS_SYNC', 'False') == 'True',
+    # apps.event_hub.services.metrics: seconds between adding in-process totals to the cache
+    'METRICS_ENABLED': os.getenv('EVENT_BUS_METRICS_ENABLED', 'True') == 'True',
+    'METRICS_FLUSH_INTERVAL': float(os.getenv('EVENT_BUS_METRICS_FLUSH_INTERVAL', '5')),
+    # Seconds repeats of an EventTypes.COALESCE_KEYS event for one entity are merged over; 0 disables
+    'COALESCE_WINDOW': float(os.getenv('EVENT_BUS_COALESCE_WINDOW', '30')),
     'ERROR_CALLBACK': 'apps.common.utils.error_reporting.report_event_bus_error',  # optional
 }
 
 # Event Hub Settings
 EVENT_LOG_RETENTION_DAYS = int(os.getenv('EVENT_LOG_RETENTION_DAYS', '30'))
+# Width of each event_hub_eventlog range partition: 'day', 'week' or 'month'
+EVENT_LOG_PARTITION_INTERVAL = os.getenv('EVENT_LOG_PARTITION_INTERVAL', 'week')
+
+# Security Settings
+# How long (seconds) a person's cached product/organisation role maps are kept
+ROLE_CACHE_TIMEOUT = int(os.getenv('ROLE_CACHE_TIMEOUT', '300'))
+# How long (seconds) a person's materialised set of visible private products is kept
+VISIBLE_PRODUCTS_CACHE_TIMEOUT = int(os.getenv('VISIBLE_PRODUCTS_CACHE_TIMEOUT', '600'))
+# How long (seconds) a serialized product tree snapshot is kept; changes invalidate it immediately
+# in every process, since CACHES is shared
+PRODUCT_TREE_CACHE_TIMEOUT = int(os.getenv('PRODUCT_TREE_CACHE_TIMEOUT', '86400'))
+
+# Engagement Settings
+# How long (seconds) a process keeps compiled notification templates before reloading them
+NOTIFICATION_TEMPLATE_CACHE_TIMEOUT = int(os.getenv('NOTIFICATION_TEMPLATE_CACHE_TIMEOUT', '300'))
+# How long (seconds) a person's cached unread notification count is kept
+UNREAD_NOTIFICATION_CACHE_TIMEOUT = int(os.getenv('UNREAD_NOTIFICATION_CACHE_TIMEOUT', '300'))
+# Expired notification and event log cleanup (apps.engagement.tasks.cleanup_expired_rows):
+# ids per DELETE, pause between DELETEs, and time budget per scheduled run
+CLEANUP_CHUNK_SIZE = int(os.getenv('CLEANUP_CHUNK_SIZE', '5000'))
+CLEANUP_THROTTLE_SECONDS = float(os.getenv('CLEANUP_THROTTLE_SECONDS', '0.1'))
+CLEANUP_MAX_SECONDS = float(os.getenv('CLEANUP_MAX_SECONDS', '60'))
+# Email outbox (apps.engagement.services.EmailOutboxService)
+EMAIL_OUTBOX_PROVIDER = os.getenv('EMAIL_OUTBOX_PROVIDER', 'apps.engagement.email_providers.SendGridProvider')
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '500'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '5'))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_RETRY_BASE_SECONDS', '60'))
+# A claimed email whose worker hasn't reported back within this many seconds is claimed again
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', '300'))
+EMAIL_OUTBOX_MAX_SECONDS = float(os.getenv('EMAIL_OUTBOX_MAX_SECONDS', '50'))
+# Hour of the day (UTC) daily notification digests go out
+NOTIFICATION_DIGEST_HOUR = int(os.getenv('NOTIFICATION_DIGEST_HOUR', '8'))
+
+# Search Settings
+# Postgres text search configuration used to build and query search vectors
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'english')
+# Matches ranked per searched model; a query matching more rows ranks the first ones found
+SEARCH_MAX_CANDIDATES = int(os.getenv('SEARCH_MAX_CANDIDATES', '1000'))
+# Maximum number of people returned by the person typeahead
+PERSON_TYPEAHEAD_LIMIT = int(os.getenv('PERSON_TYPEAHEAD_LIMIT', '10'))
+# How long (seconds) typeahead results for a prefix are cached
+PERSON_TYPEAHEAD_CACHE_TIMEOUT = int(os.getenv('PERSON_TYPEAHEAD_CACHE_TIMEOUT', '30'))
 
 # Django Q Configuration (using PostgreSQL as broker)
 Q_CLUSTER = {
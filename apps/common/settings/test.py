@@ -15,6 +15,13 @@ DATABASES = {
     }
 }
 
+# Tests run in one process, so the shared database cache isn't needed
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
@@ -46,6 +53,8 @@ Q_CLUSTER = {
     'log_level': 'DEBUG',
 }
 
+EMAIL_OUTBOX_PROVIDER = 'apps.engagement.email_providers.FakeEmailProvider'
+
 # Use synchronous event bus in tests
 EVENT_BUS = {
     'BACKEND': 'apps.event_hub.services.backends.django_q.DjangoQBackend',
@@ -2,6 +2,7 @@ import random
 import string
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 
 import pytest
 from model_bakery import baker
@@ -11,6 +12,12 @@ def generate_random_string(length=10):
     return "".join(random.choice(string.ascii_letters) for _ in range(length))
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Role maps and visible products are cached; don't let them leak between tests"""
+    cache.clear()
+
+
 @pytest.fixture
 def random_email_string(length=10):
     string_random = "".join(random.choice(string.ascii_letters) for _ in range(length))
@@ -6,6 +6,7 @@ from django.views.generic.base import RedirectView
 from django.contrib.auth import views as auth_views
 
 from apps.canopy.views import ProductTreeUpdateView, ProductTreeView
+from apps.event_hub.views import event_metrics_view
 from apps.marketing.views import MarketingPageView
 
 from . import views
@@ -34,6 +35,7 @@ urlpatterns += [
     path("canopy/", include("apps.canopy.urls")),
     path("canopy", RedirectView.as_view(url="/canopy/")),
     path("version/", views.version_view, name="version"),
+    path("event-hub/metrics/", event_metrics_view, name="event_hub_metrics"),
     path("talent/", include("apps.capabilities.talent.urls")),
     path("freshlatte", RedirectView.as_view(url="/canopy/")),
     path('s/', include('apps.capabilities.security.urls', namespace='security')),
@@ -1,5 +1,7 @@
+import logging
 import os
 import uuid
+from functools import lru_cache
 
 from django.conf import settings
 from django.forms import ModelForm
@@ -7,8 +9,17 @@ from django.forms import ModelForm
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _sendgrid_client():
+    """One client per process instead of one per email"""
+    return SendGridAPIClient(os.environ.get("SENDGRID_API_KEY"))
+
 
 def send_sendgrid_email(to_emails, subject, content):
+    """Send one email straight away. Notification emails go through EmailOutboxService instead."""
     try:
         message = Mail(
             from_email=settings.DEFAULT_FROM_EMAIL,
@@ -18,13 +29,11 @@ def send_sendgrid_email(to_emails, subject, content):
         )
 
         if not settings.DEBUG:
-            sg = SendGridAPIClient(os.environ.get("SENDGRID_API_KEY"))
-            sg.send(message)
+            _sendgrid_client().send(message)
         else:
-            print("Email sent:", flush=True)
-            print(message, flush=True)
+            logger.info(f"Email not sent in DEBUG: {message}")
     except Exception as e:
-        print("Send Grid Email Failed:", e, flush=True)
+        logger.error(f"SendGrid email failed: {e}", exc_info=True)
 
 
 class BaseModelForm(ModelForm):
@@ -39,17 +48,43 @@ class BaseModelForm(ModelForm):
             else:
                 field.widget.attrs['class'] = 'form-control'
 
-def serialize_tree(node):
-    """Serializer for the tree."""
+# Namespace of the node_id of serialized tree nodes, so a node keeps its id across renders
+TREE_NODE_NAMESPACE = uuid.UUID("5b0f1d7e-3c62-4f4e-9a51-2d8e6c4b7a90")
+
+
+def serialize_node(node):
+    """Serializer for one tree node, with no children yet."""
     return {
         "id": node.pk,
-        "node_id": uuid.uuid4(),
+        "node_id": uuid.uuid5(TREE_NODE_NAMESPACE, f"{node._meta.label_lower}:{node.pk}"),
         "name": node.name,
         "description": node.description,
         "video_link": node.video_link,
         "video_name": node.video_name,
         "video_duration": node.video_duration,
         "has_saved": True,
-        "children": [serialize_tree(child) for child in node.get_children()],
+        "children": [],
     }
 
+
+def build_tree(nodes, serialize=serialize_node):
+    """
+    Nest materialized path (treebeard MP_Node) nodes in one pass.
+
+    The nodes must be ordered by path, so every parent comes before its
+    children. A node whose parent isn't among them becomes a root of the
+    returned list. serialize turns one node into a dict with empty children.
+    """
+    serialized = {}
+    roots = []
+    for node in nodes:
+        data = serialize(node)
+        parent = serialized.get(node.path[:-node.steplen])
+        (parent["children"] if parent else roots).append(data)
+        serialized[node.path] = data
+    return roots
+
+
+def serialize_tree(node):
+    """Serializer for the tree below node, read with a single query."""
+    return build_tree(type(node).get_tree(node))[0]
@@ -17,7 +17,8 @@ class NotifiableEventAdmin(admin.ModelAdmin):
 
 @admin.register(NotificationPreference)
 class NotificationPreferenceAdmin(admin.ModelAdmin):
-    list_display = ('person', 'product_notifications')
+    list_display = ('person', 'product_notifications', 'digest')
+    list_filter = ('product_notifications', 'digest')
     search_fields = ('person__email', 'person__first_name', 'person__last_name')
     readonly_fields = ('created_at',)
 
@@ -0,0 +1,143 @@
+"""
+Email providers used by EmailOutboxService.
+
+A provider takes a batch of OutboundEmail and sends it with as few round
+trips as it can, returning an error message for every email that failed.
+One provider instance is created per process (see get_email_provider), so
+whatever connection pool it holds is reused across batches.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import requests
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OutboundEmail:
+    notification_id: int
+    to: str
+    subject: str
+    html: str
+
+
+class EmailProvider:
+    # Most emails sent in one call; EmailOutboxService splits claims to fit
+    max_batch_size = 100
+
+    def send_batch(self, emails: List[OutboundEmail]) -> Dict[int, Optional[str]]:
+        """
+        Send the emails.
+
+        Returns:
+            Mapping of notification id to None when sent, or the error message
+        """
+        raise NotImplementedError
+
+
+class SendGridProvider(EmailProvider):
+    """
+    Sends a batch as one SendGrid v3 mail/send request, one personalization
+    per email with its own subject and body substitution. Requests go through
+    a keep-alive session, so consecutive batches reuse the TLS connection.
+    """
+
+    API_URL = 'https://api.sendgrid.com/v3/mail/send'
+    BODY_TAG = '-body-'
+    max_batch_size = 500  # SendGrid allows 1000 personalizations per request
+
+    def __init__(self, api_key: str = None, timeout: float = 10):
+        self.api_key = api_key or settings.SENDGRID_API_KEY
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=10))
+        self.session.headers.update({
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+        })
+
+    def send_batch(self, emails: List[OutboundEmail]) -> Dict[int, Optional[str]]:
+        message = {
+            'from': {'email': settings.DEFAULT_FROM_EMAIL},
+            'content': [{'type': 'text/html', 'value': self.BODY_TAG}],
+            'personalizations': [
+                {
+                    'to': [{'email': email.to}],
+                    'subject': email.subject,
+                    'substitutions': {self.BODY_TAG: email.html},
+                }
+                for email in emails
+            ],
+        }
+        try:
+            response = self.session.post(self.API_URL, json=message, timeout=self.timeout)
+        except requests.RequestException as e:
+            error = f"SendGrid request failed: {e}"
+        else:
+            if response.status_code < 300:
+                return {email.notification_id: None for email in emails}
+            error = f"SendGrid returned {response.status_code}: {response.text[:500]}"
+        return {email.notification_id: error for email in emails}
+
+
+class DjangoMailProvider(EmailProvider):
+    """Sends through the configured EMAIL_BACKEND, opening one connection per batch"""
+
+    def send_batch(self, emails: List[OutboundEmail]) -> Dict[int, Optional[str]]:
+        results = {}
+        with get_connection() as connection:
+            for email in emails:
+                message = EmailMessage(email.subject, email.html, settings.DEFAULT_FROM_EMAIL, [email.to],
+                                       connection=connection)
+                message.content_subtype = 'html'
+                try:
+                    message.send()
+                    results[email.notification_id] = None
+                except Exception as e:
+                    results[email.notification_id] = str(e)
+        return results
+
+
+class FakeEmailProvider(EmailProvider):
+    """
+    Keeps sent emails in memory instead of sending them; for tests, local
+    development and benchmarks.
+
+    Args:
+        latency: Seconds each send_batch call takes, to stand in for the network
+        failing: Addresses every send to fails for
+    """
+
+    def __init__(self, latency: float = 0, failing=(), max_batch_size: int = 100):
+        self.latency = latency
+        self.failing = set(failing)
+        self.max_batch_size = max_batch_size
+        self.sent: List[OutboundEmail] = []
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def send_batch(self, emails: List[OutboundEmail]) -> Dict[int, Optional[str]]:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            self.sent.extend(email for email in emails if email.to not in self.failing)
+        return {
+            email.notification_id: "Rejected by fake provider" if email.to in self.failing else None
+            for email in emails
+        }
+
+
+@lru_cache(maxsize=None)
+def get_email_provider() -> EmailProvider:
+    """The process-wide provider named by EMAIL_OUTBOX_PROVIDER"""
+    return import_string(settings.EMAIL_OUTBOX_PROVIDER)()
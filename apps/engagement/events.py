@@ -14,8 +14,9 @@ from apps.capabilities.talent.models import Person
 from apps.capabilities.security.models import OrganisationPersonRoleAssignment
 from apps.event_hub.events import EventTypes
 from apps.event_hub.services.event_bus import EventBus
-from django.db import transaction
 from apps.event_hub.services.factory import get_event_bus
+from apps.event_hub.services.registry import listens_to
+from apps.engagement.services import NotificationFanoutService
 from django.urls import reverse
 
 logger = logging.getLogger(__name__)
@@ -36,134 +37,70 @@ def create_notification(event_type: str, person_id: str, message: str) -> Notifi
     
     return event
 
+def _get_product_stakeholder_ids(product: Product, payload: dict) -> set:
+    """Ids of the people who should hear about changes to a product"""
+    people_to_notify = set()
+
+    if product.organisation:
+        people_to_notify.update(person.id for person in RoleService.get_organisation_managers(product.organisation))
+        people_to_notify.update(person.id for person in RoleService.get_product_managers(product))
+    elif product.person_id:
+        people_to_notify.add(product.person_id)
+
+    if not people_to_notify:
+        person_id = payload.get('personId')
+        if person_id:
+            if Person.objects.filter(id=person_id).exists():
+                people_to_notify.add(int(person_id))
+            else:
+                logger.error(f"Person {person_id} not found")
+
+    return people_to_notify
+
+
+def _notify_product_stakeholders(event_type: str, payload: dict) -> bool:
+    """Fan a product event out to every stakeholder with a constant number of queries"""
+    product_id = payload.get('productId')
+    if product_id is None:
+        logger.error(f"No productId in event payload. Payload: {payload}")
+        return False
+
+    try:
+        product = Product.objects.get(id=product_id)
+    except Product.DoesNotExist:
+        logger.error(f"Product {product_id} not found")
+        return False
+
+    # Format the notification parameters
+    notification_params = {
+        'product_name': product.name,
+        'product_url': reverse('portal:product-summary', kwargs={'product_slug': product.slug})
+    }
+
+    person_ids = _get_product_stakeholder_ids(product, payload)
+    events = NotificationFanoutService.fan_out(
+        event_type, person_ids, notification_params, idempotency_key=payload.get('idempotencyKey')
+    )
+    return len(events) > 0
+
+@listens_to(EventTypes.PRODUCT_CREATED)
 def handle_product_created(event_type: str = None, payload: dict = None, **kwargs):
     """Handle product created event by creating NotifiableEvents for relevant stakeholders"""
     try:
         payload = payload or kwargs.get('payload', {})
         logger.debug(f"Received product created event payload: {payload}")
-        
-        product_id = payload.get('productId')
-        if product_id is None:
-            logger.error(f"No productId in event payload. Payload: {payload}")
-            return False
-        
-        try:
-            product = Product.objects.get(id=product_id)
-        except Product.DoesNotExist:
-            logger.error(f"Product {product_id} not found")
-            return False
-
-        # Format the notification parameters
-        notification_params = {
-            'product_name': product.name,
-            'product_url': reverse('portal:product-summary', kwargs={'product_slug': product.slug})
-        }
-
-        # Get all stakeholders to notify
-        people_to_notify = set()
-        
-        if product.organisation:
-            people_to_notify.update(RoleService.get_organisation_managers(product.organisation))
-            people_to_notify.update(RoleService.get_product_managers(product))
-        elif product.person:
-            people_to_notify.add(product.person)
-        
-        if not people_to_notify:
-            person_id = payload.get('personId')
-            if person_id:
-                try:
-                    person = Person.objects.get(id=person_id)
-                    people_to_notify.add(person)
-                except Person.DoesNotExist:
-                    logger.error(f"Person {person_id} not found")
-                    
-        events = []
-        for person in people_to_notify:
-            logger.info(f"Person to notify: {person.full_name}")
-            with transaction.atomic():
-                notifiable_event = NotifiableEvent.objects.create(
-                    event_type=EventTypes.PRODUCT_CREATED,
-                    person=person,
-                    params=notification_params  # Use the formatted params
-                )
-                logger.info(f"NotifiableEvent created: {notifiable_event.id}")
-                events.append(notifiable_event)
-
-                # Use process_notification task directly
-                from apps.engagement.tasks import process_notification
-                transaction.on_commit(lambda: process_notification(
-                    event_type=EventTypes.PRODUCT_CREATED,
-                    payload={'event_id': notifiable_event.id}
-                ))
-        
-        return len(events) > 0
-        
+        return _notify_product_stakeholders(EventTypes.PRODUCT_CREATED, payload)
     except Exception as e:
         logger.error(f"Error in handle_product_created: {e}", exc_info=True)
         return False
 
+@listens_to(EventTypes.PRODUCT_UPDATED)
 def handle_product_updated(event_type: str = None, payload: dict = None, **kwargs):
     """Handle product updated event by creating NotifiableEvents"""
     try:
         payload = payload or kwargs.get('payload', {})
         logger.debug(f"Received product updated event payload: {payload}")
-        
-        product_id = payload.get('productId')
-        if product_id is None:
-            logger.error(f"No productId in event payload. Payload: {payload}")
-            return False
-        
-        try:
-            product = Product.objects.get(id=product_id)
-        except Product.DoesNotExist:
-            logger.error(f"Product {product_id} not found")
-            return False
-
-        # Format the notification parameters
-        notification_params = {
-            'product_name': product.name,
-            'product_url': reverse('portal:product-summary', kwargs={'product_slug': product.slug})
-        }
-
-        # Get all stakeholders to notify
-        people_to_notify = set()
-        
-        if product.organisation:
-            people_to_notify.update(RoleService.get_organisation_managers(product.organisation))
-            people_to_notify.update(RoleService.get_product_managers(product))
-        elif product.person:
-            people_to_notify.add(product.person)
-        
-        if not people_to_notify:
-            person_id = payload.get('personId')
-            if person_id:
-                try:
-                    person = Person.objects.get(id=person_id)
-                    people_to_notify.add(person)
-                except Person.DoesNotExist:
-                    logger.error(f"Person {person_id} not found")
-                    
-        events = []
-        for person in people_to_notify:
-            logger.info(f"Person to notify: {person.full_name}")
-            with transaction.atomic():
-                notifiable_event = NotifiableEvent.objects.create(
-                    event_type=EventTypes.PRODUCT_UPDATED,
-                    person=person,
-                    params=notification_params  # Use the formatted params instead of raw payload
-                )
-                logger.info(f"NotifiableEvent created: {notifiable_event.id}")
-                events.append(notifiable_event)
-
-                # Use process_notification task directly
-                from apps.engagement.tasks import process_notification
-                transaction.on_commit(lambda: process_notification(
-                    event_type=EventTypes.PRODUCT_UPDATED,
-                    payload={'event_id': notifiable_event.id}
-                ))
-        
-        return len(events) > 0
-        
+        return _notify_product_stakeholders(EventTypes.PRODUCT_UPDATED, payload)
     except Exception as e:
         logger.error(f"Error in handle_product_updated: {e}", exc_info=True)
         return False
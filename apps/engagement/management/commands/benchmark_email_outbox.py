@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.capabilities.security.models import User
+from apps.capabilities.talent.models import Person
+from apps.common.benchmarks import ROLLED_BACK_HELP, rolled_back
+from apps.engagement.email_providers import FakeEmailProvider
+from apps.engagement.models import EmailNotification
+from apps.engagement.services import EmailOutboxService
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure email outbox throughput with a fake provider that takes --latency ms per call, "
+        "sending one email per call and then in batches. " + ROLLED_BACK_HELP
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--emails", type=int, default=5_000)
+        parser.add_argument("--people", type=int, default=500)
+        parser.add_argument("--latency", type=float, default=50, help="Milliseconds per provider call")
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows claimed per round")
+        parser.add_argument("--provider-batch", type=int, default=100, help="Emails per provider call")
+        parser.add_argument("--unbatched-limit", type=int, default=200,
+                            help="Emails to send one per call, as that run is slow")
+
+    def handle(self, *args, **options):
+        with rolled_back(self.stdout):
+            self._seed(options)
+            self._run("one email per call", options["unbatched_limit"], 1, 1, options)
+            self._run("batched", options["emails"], options["batch_size"], options["provider_batch"], options)
+
+    def _seed(self, options):
+        self.stdout.write(f"Seeding {options['emails']} pending emails for {options['people']} people...")
+        users = User.objects.bulk_create(
+            [User(username=f"benchmail{i}", email=f"benchmail{i}@example.com") for i in range(options["people"])],
+            batch_size=5_000,
+        )
+        people = Person.objects.bulk_create(
+            [Person(user=user, full_name=user.username, preferred_name=user.username) for user in users],
+            batch_size=5_000,
+        )
+        EmailNotification.objects.bulk_create(
+            [
+                EmailNotification(person=people[i % len(people)], title=f"Email {i}", body="<p>Benchmark</p>")
+                for i in range(options["emails"])
+            ],
+            batch_size=5_000,
+        )
+
+    def _run(self, label, emails, batch_size, provider_batch, options):
+        EmailNotification.objects.update(
+            status=EmailNotification.Status.PENDING, next_attempt_at=timezone.now(), attempts=0
+        )
+        provider = FakeEmailProvider(latency=options["latency"] / 1000, max_batch_size=provider_batch)
+
+        started = time.perf_counter()
+        sent = 0
+        while sent < emails:
+            notifications = EmailOutboxService.claim(min(batch_size, emails - sent))
+            if not notifications:
+                break
+            sent += EmailOutboxService.send(notifications, provider)[0]
+        elapsed = time.perf_counter() - started
+
+        rate = sent / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{label:<20} {sent:>7} sent in {elapsed:7.2f}s   {rate:9.0f} emails/s   "
+            f"{provider.calls} provider calls"
+        )
@@ -0,0 +1,95 @@
+import random
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.capabilities.security.models import User
+from apps.capabilities.talent.models import Person
+from apps.common.benchmarks import ROLLED_BACK_HELP, rolled_back
+from apps.engagement.models import AppNotification
+from apps.engagement.services import NotificationService, UnreadNotificationCounter
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the notification bell (unread count plus recent list) against a synthetic "
+        "notification table. " + ROLLED_BACK_HELP
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--notifications", type=int, default=1_000_000)
+        parser.add_argument("--people", type=int, default=2_000)
+        parser.add_argument("--unread", type=float, default=0.3, help="Share of notifications left unread")
+        parser.add_argument("--samples", type=int, default=200, help="Header renders to time")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        with rolled_back(self.stdout):
+            people = self._seed(options)
+            try:
+                self._run(people, options["samples"])
+            finally:
+                UnreadNotificationCounter.invalidate(person.id for person in people)
+
+    def _seed(self, options):
+        batch_size = 10_000
+        self.stdout.write(f"Seeding {options['notifications']} notifications for {options['people']} people...")
+        users = User.objects.bulk_create(
+            [User(username=f"benchbell{i}", email=f"benchbell{i}@example.com") for i in range(options["people"])],
+            batch_size=batch_size,
+        )
+        people = Person.objects.bulk_create(
+            [Person(user=user, full_name=user.username, preferred_name=user.username) for user in users],
+            batch_size=batch_size,
+        )
+
+        for first in range(0, options["notifications"], batch_size):
+            AppNotification.objects.bulk_create([
+                AppNotification(
+                    person=random.choice(people),
+                    title=f"Notification {i}",
+                    message="Benchmark notification",
+                    is_read=random.random() >= options["unread"],
+                )
+                for i in range(first, min(first + batch_size, options["notifications"]))
+            ])
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE "{AppNotification._meta.db_table}"')
+        return people
+
+    def _time(self, label, people, samples, render):
+        timings = []
+        for _ in range(samples):
+            person = random.choice(people)
+            start = time.perf_counter()
+            render(person)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1] if timings else 0
+        self.stdout.write(f"{label:<32} median {median(timings):8.3f} ms   p95 {p95:8.3f} ms")
+
+    def _run(self, people, samples):
+        service = NotificationService()
+
+        def count_query(person):
+            return AppNotification.objects.filter(person=person, is_read=False).count()
+
+        def header(person):
+            return service.get_notification_count(person), list(service.get_recent_notifications(person))
+
+        def header_with_count_query(person):
+            return count_query(person), list(service.get_recent_notifications(person))
+
+        self._time("unread COUNT query", people, samples, count_query)
+        self._time("header with COUNT query", people, samples, header_with_count_query)
+        self._time("header, cold counter", people, samples, header)
+        self._time("header, warm counter", people, samples, header)
+
+        person = people[0]
+        self.stdout.write("\nPlans:")
+        self.stdout.write(AppNotification.objects.filter(person=person, is_read=False).explain())
+        self.stdout.write(service.get_recent_notifications(person).explain())
@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.engagement.services import ExpiredRowCleanupService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired notifications, notifiable events and event log rows in chunks, "
+        "as the scheduled cleanup_expired_rows job does, reporting progress as it goes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--step", action="append", choices=ExpiredRowCleanupService.STEPS,
+                            help="Only run this step; may be repeated")
+        parser.add_argument("--chunk-size", type=int, default=settings.CLEANUP_CHUNK_SIZE)
+        parser.add_argument("--throttle", type=float, default=settings.CLEANUP_THROTTLE_SECONDS,
+                            help="Seconds to sleep between chunks")
+        parser.add_argument("--max-seconds", type=float, default=None, help="Stop after this long")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def progress(step, deleted):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{step:<20} {deleted:>10} deleted   {elapsed:8.1f}s")
+
+        totals = ExpiredRowCleanupService.run(
+            steps=options["step"] or ExpiredRowCleanupService.STEPS,
+            chunk_size=options["chunk_size"],
+            throttle=options["throttle"],
+            max_seconds=options["max_seconds"],
+            progress=progress,
+        )
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{step} {deleted}" for step, deleted in totals.items())
+        self.stdout.write(self.style.SUCCESS(f"Done in {elapsed:.1f}s: {summary}"))
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.2 on 2026-10-17 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0010_add_basic_notification_templates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notifiableevent',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='notifiableevent',
+            constraint=models.UniqueConstraint(condition=models.Q(('idempotency_key__isnull', False)), fields=('idempotency_key', 'event_type', 'person'), name='unique_notifiable_event_delivery'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.2 on 2026-10-17 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0011_notifiableevent_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='appnotification',
+            name='engagement__is_read_dd8c61_idx',
+        ),
+        migrations.AddIndex(
+            model_name='appnotification',
+            index=models.Index(fields=['person', 'is_read', '-created_at'], name='appnotif_person_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appnotification',
+            index=models.Index(fields=['person', '-created_at'], name='appnotif_person_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.2 on 2026-10-17 04:38
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def retire_unsent_emails(apps, schema_editor):
+    """Emails from before the outbox were never sent; don't send them days late now"""
+    EmailNotification = apps.get_model('engagement', 'EmailNotification')
+    EmailNotification.objects.update(status='FAILED', last_error='Created before the email outbox; not sent')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0013_schedule_cleanup_expired_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailnotification',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='last_error',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Waiting to be sent'), ('SENDING', 'Claimed by a worker'), ('SENT', 'Sent'), ('FAILED', 'Gave up')], default='PENDING', max_length=10),
+        ),
+        migrations.RunPython(retire_unsent_emails, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='emailnotif_outbox_idx'),
+        ),
+    ]
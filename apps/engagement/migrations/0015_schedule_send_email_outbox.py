@@ -0,0 +1,33 @@
+from django.db import migrations
+
+SCHEDULE_NAME = 'send_email_outbox'
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.update_or_create(
+        name=SCHEDULE_NAME,
+        defaults={
+            'func': 'apps.engagement.tasks.send_email_outbox',
+            'schedule_type': 'I',  # Schedule.MINUTES
+            'minutes': 1,
+            'repeats': -1,
+        }
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model('django_q', 'Schedule')
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0014_emailnotification_delivery_state'),
+        ('django_q', '0014_schedule_cluster'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
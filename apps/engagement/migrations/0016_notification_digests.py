@@ -0,0 +1,27 @@
+# Generated by Django 4.2.2 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0015_schedule_send_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notifiableevent',
+            name='digest_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationpreference',
+            name='digest',
+            field=models.CharField(choices=[('IMMEDIATE', 'As they happen'), ('HOURLY', 'Hourly digest'), ('DAILY', 'Daily digest')], default='IMMEDIATE', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='notifiableevent',
+            index=models.Index(condition=models.Q(('digest_at__isnull', False)), fields=['digest_at', 'person'], name='notifiableevent_digest_idx'),
+        ),
+    ]
@@ -24,11 +24,27 @@ class NotifiableEvent(TimeStampMixin):
     person = models.ForeignKey('talent.Person', on_delete=models.CASCADE)
     params = models.JSONField(default=dict)
     delete_at = models.DateTimeField(default=default_delete_at)
+    # Key of the published event this was created for, so a retried delivery can't notify twice
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+    # Set while the event waits for its person's next digest; cleared once the digest is delivered
+    digest_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         indexes = [
             models.Index(fields=['delete_at']),
             models.Index(fields=['person']),
+            models.Index(
+                fields=['digest_at', 'person'],
+                condition=models.Q(digest_at__isnull=False),
+                name='notifiableevent_digest_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['idempotency_key', 'event_type', 'person'],
+                condition=models.Q(idempotency_key__isnull=False),
+                name='unique_notifiable_event_delivery',
+            ),
         ]
 
     def __str__(self):
@@ -92,6 +108,11 @@ class NotificationPreference(TimeStampMixin):
         EMAIL = "EMAIL", "Email only"
         BOTH = "BOTH", "Both app and email"
 
+    class Digest(models.TextChoices):
+        IMMEDIATE = "IMMEDIATE", "As they happen"
+        HOURLY = "HOURLY", "Hourly digest"
+        DAILY = "DAILY", "Daily digest"
+
     person = models.OneToOneField(
         "talent.Person",
         on_delete=models.CASCADE,
@@ -102,6 +123,11 @@ class NotificationPreference(TimeStampMixin):
         choices=Type.choices,
         default=Type.BOTH
     )
+    digest = models.CharField(
+        max_length=10,
+        choices=Digest.choices,
+        default=Digest.IMMEDIATE
+    )
 
     class Meta:
         verbose_name_plural = "Notification Preferences"
@@ -118,7 +144,14 @@ class NotificationPreference(TimeStampMixin):
 
 
 class EmailNotification(TimeStampMixin):
-    """Record of emails sent to users"""
+    """An email to a person and its delivery state; sent by EmailOutboxService"""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Waiting to be sent"
+        SENDING = "SENDING", "Claimed by a worker"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Gave up"
+
     notifiable_event = models.ForeignKey(
         NotifiableEvent, 
         on_delete=models.CASCADE, 
@@ -137,12 +170,20 @@ class EmailNotification(TimeStampMixin):
     body = models.CharField(max_length=4000, null=True, blank=True)
     sent_at = models.DateTimeField(auto_now_add=True)
     delete_at = models.DateTimeField(default=default_delete_at)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
 
     class Meta:
         indexes = [
             models.Index(fields=['notifiable_event']),
             models.Index(fields=['sent_at']),
             models.Index(fields=['delete_at']),
+            # The outbox claim: due rows in the order they became due
+            models.Index(fields=['status', 'next_attempt_at'], name='emailnotif_outbox_idx'),
         ]
 
     def __str__(self):
@@ -174,7 +215,10 @@ class AppNotification(TimeStampMixin):
     class Meta:
         indexes = [
             models.Index(fields=['notifiable_event']),
-            models.Index(fields=['is_read']),
+            # Unread count and unread list for a person, newest first
+            models.Index(fields=['person', 'is_read', '-created_at'], name='appnotif_person_unread_idx'),
+            # Recent list regardless of read status
+            models.Index(fields=['person', '-created_at'], name='appnotif_person_recent_idx'),
             models.Index(fields=['read_at']),
             models.Index(fields=['delete_at']),
         ]
@@ -182,10 +226,17 @@ class AppNotification(TimeStampMixin):
     def __str__(self):
         return f"App notification for {self.notifiable_event}"
 
-    def mark_as_read(self):
+    def mark_as_read(self) -> bool:
+        """Mark as read; returns False if it already was, leaving read_at alone"""
+        from .services import UnreadNotificationCounter
+
+        now = timezone.now()
+        updated = AppNotification.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=now)
         self.is_read = True
-        self.read_at = timezone.now()
-        self.save(update_fields=['is_read', 'read_at'])
+        if updated:
+            self.read_at = now
+            UnreadNotificationCounter.adjust({self.person_id: -1})
+        return bool(updated)
 
 
 class AppNotificationTemplate(models.Model):
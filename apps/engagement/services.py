@@ -1,14 +1,99 @@
-from typing import Optional
+import logging
+import random
+import string
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.utils import timezone
-from django.db.models import QuerySet
+from django.utils.html import escape
+from django.db.models import F, Q, QuerySet
 
 from apps.engagement.models import (
     NotifiableEvent,
     AppNotification,
+    AppNotificationTemplate,
     EmailNotification,
+    EmailNotificationTemplate,
     NotificationPreference
 )
 from apps.capabilities.talent.models import Person
+from apps.engagement.email_providers import EmailProvider, OutboundEmail, get_email_provider
+from apps.event_hub.models import EventLog
+from apps.event_hub.services.partitions import EventLogPartitionService
+
+logger = logging.getLogger(__name__)
+
+
+class UnreadNotificationCounter:
+    """
+    Per-person count of unread app notifications, kept in the Django cache so
+    the notification bell doesn't run a COUNT on every page.
+
+    A miss is filled with one COUNT over the (person, is_read, created_at)
+    index. After that, every path that creates or reads notifications adjusts
+    the cached count once its transaction commits, so rolled back writes never
+    change it. Entries expire after UNREAD_NOTIFICATION_CACHE_TIMEOUT, which
+    bounds any drift from a write racing a miss.
+    """
+
+    KEY_PREFIX = 'engagement:unread'
+
+    @classmethod
+    def _key(cls, person_id: int) -> str:
+        return f"{cls.KEY_PREFIX}:{person_id}"
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'UNREAD_NOTIFICATION_CACHE_TIMEOUT', 300)
+
+    @classmethod
+    def get(cls, person_id: int) -> int:
+        """Unread notifications of a person"""
+        key = cls._key(person_id)
+        count = cache.get(key)
+        if count is None:
+            count = AppNotification.objects.filter(person_id=person_id, is_read=False).count()
+            cache.add(key, count, cls._timeout())
+        return count
+
+    @classmethod
+    def adjust(cls, deltas: Dict[int, int]) -> None:
+        """
+        Change cached counts by the given amounts when the current transaction
+        commits. Uncached counts are left alone; the next read counts them.
+
+        Args:
+            deltas: Mapping of person id to the change in their unread count
+        """
+        deltas = {person_id: delta for person_id, delta in deltas.items() if person_id is not None and delta}
+        if deltas:
+            transaction.on_commit(lambda: cls._apply(deltas))
+
+    @classmethod
+    def _apply(cls, deltas: Dict[int, int]) -> None:
+        for person_id, delta in deltas.items():
+            key = cls._key(person_id)
+            try:
+                count = cache.incr(key, delta)
+            except ValueError:
+                continue
+            if count < 0:
+                cache.delete(key)
+
+    @classmethod
+    def invalidate(cls, person_ids: Iterable[int]) -> None:
+        """
+        Drop cached counts so they are recounted on the next read; again on
+        commit, in case a read refilled them from the old rows meanwhile.
+        """
+        keys = [cls._key(person_id) for person_id in person_ids]
+        if keys:
+            cache.delete_many(keys)
+            transaction.on_commit(lambda: cache.delete_many(keys))
 
 
 class NotificationService:
@@ -52,17 +137,16 @@ class NotificationService:
     def mark_all_as_read(self, person: Person) -> int:
         """Mark all unread notifications as read for a person"""
         now = timezone.now()
-        return AppNotification.objects.filter(
+        updated = AppNotification.objects.filter(
             person=person,
             is_read=False
         ).update(is_read=True, read_at=now)
+        UnreadNotificationCounter.adjust({person.id: -updated})
+        return updated
 
     def get_notification_count(self, person: Person) -> int:
         """Get count of unread notifications"""
-        return AppNotification.objects.filter(
-            person=person,
-            is_read=False
-        ).count()
+        return UnreadNotificationCounter.get(person.id)
 
     def get_recent_notifications(self, person: Person, limit: int = 5) -> QuerySet[AppNotification]:
         """Get most recent notifications regardless of read status"""
@@ -73,11 +157,14 @@ class NotificationService:
     def update_notification_preferences(
         self, 
         person: Person, 
-        product_notifications: str
+        product_notifications: str,
+        digest: Optional[str] = None
     ) -> NotificationPreference:
         """Update notification preferences for a person"""
         prefs, _ = NotificationPreference.objects.get_or_create(person=person)
         prefs.product_notifications = product_notifications
+        if digest is not None:
+            prefs.digest = digest
         prefs.save()
         return prefs
 
@@ -98,10 +185,789 @@ class NotificationService:
         Clean up notifications past their delete_at date
         Returns tuple of (app_notifications_deleted, email_notifications_deleted)
         """
+        totals = ExpiredRowCleanupService.run(steps=ExpiredRowCleanupService.NOTIFICATION_STEPS, throttle=0)
+        return totals['app_notifications'], totals['email_notifications']
+
+
+class ExpiredRowCleanupService:
+    """
+    Deletes expired notifications and event log rows in bounded chunks.
+
+    Each chunk reads up to chunk_size ids of expired rows and removes them with
+    a plain DELETE ... WHERE id IN (...), so Django never collects cascades into
+    memory. Notifications that belong to an expired NotifiableEvent go in the
+    same transaction as the event, whatever their own delete_at. Chunks commit
+    one at a time, the run sleeps `throttle` seconds between them, and it stops
+    after max_seconds; whatever is left waits for the next run.
+    """
+
+    NOTIFICATION_STEPS = ('app_notifications', 'email_notifications', 'notifiable_events')
+    STEPS = NOTIFICATION_STEPS + ('event_logs',)
+
+    @classmethod
+    def run(
+        cls,
+        now=None,
+        steps: Iterable[str] = STEPS,
+        chunk_size: Optional[int] = None,
+        throttle: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Delete expired rows.
+
+        Args:
+            now: Expiry cut-off; defaults to the current time
+            steps: Which of STEPS to run, in that order
+            chunk_size: Ids per DELETE; defaults to CLEANUP_CHUNK_SIZE
+            throttle: Seconds to sleep between chunks; defaults to CLEANUP_THROTTLE_SECONDS
+            max_seconds: Time budget for the whole run; no limit if None
+            progress: Called with (step, rows deleted so far) after each chunk
+
+        Returns:
+            Rows deleted per step
+        """
+        now = now or timezone.now()
+        chunk_size = chunk_size or getattr(settings, 'CLEANUP_CHUNK_SIZE', 5000)
+        throttle = getattr(settings, 'CLEANUP_THROTTLE_SECONDS', 0.1) if throttle is None else throttle
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+
+        def purge(step, model, condition, dependants=(), on_chunk=None):
+            deleted = 0
+            while deadline is None or time.monotonic() < deadline:
+                ids = list(
+                    model.objects.filter(condition).order_by('pk').values_list('pk', flat=True)[:chunk_size]
+                )
+                if not ids:
+                    break
+                with transaction.atomic():
+                    if on_chunk:
+                        on_chunk(ids)
+                    for dependant, column in dependants:
+                        cls._delete_in(dependant, column, ids)
+                    deleted += cls._delete_in(model, model._meta.pk.column, ids)
+                if progress:
+                    progress(step, deleted)
+                if len(ids) < chunk_size:
+                    break
+                if throttle:
+                    time.sleep(throttle)
+            return deleted
+
+        def forget_unread_counts(ids):
+            UnreadNotificationCounter.invalidate(
+                AppNotification.objects.filter(pk__in=ids, is_read=False)
+                .values_list('person_id', flat=True).distinct()
+            )
+
+        def forget_event_unread_counts(ids):
+            UnreadNotificationCounter.invalidate(
+                AppNotification.objects.filter(notifiable_event_id__in=ids, is_read=False)
+                .values_list('person_id', flat=True).distinct()
+            )
+
+        expired = Q(delete_at__lte=now)
+        totals = {}
+        for step in steps:
+            if step == 'app_notifications':
+                totals[step] = purge(step, AppNotification, expired, on_chunk=forget_unread_counts)
+            elif step == 'email_notifications':
+                totals[step] = purge(step, EmailNotification, expired)
+            elif step == 'notifiable_events':
+                totals[step] = purge(
+                    step, NotifiableEvent, expired,
+                    dependants=((AppNotification, 'notifiable_event_id'), (EmailNotification, 'notifiable_event_id')),
+                    on_chunk=forget_event_unread_counts,
+                )
+            elif step == 'event_logs':
+                totals[step] = purge(step, EventLog, cls._expired_event_logs(now))
+            else:
+                raise ValueError(f"Unknown cleanup step {step}; expected one of {cls.STEPS}")
+        return totals
+
+    @staticmethod
+    def _expired_event_logs(now) -> Q:
+        """
+        Event log rows with their own delete_at in the past. Unless the table is
+        partitioned, where retention drops whole partitions, rows past
+        EVENT_LOG_RETENTION_DAYS go too.
+        """
+        expired = Q(delete_at__lte=now)
+        if not EventLogPartitionService.is_partitioned():
+            expired |= Q(created_at__lt=now - timedelta(days=settings.EVENT_LOG_RETENTION_DAYS))
+        return expired
+
+    @staticmethod
+    def _delete_in(model, column: str, ids: list) -> int:
+        """DELETE straight from the model's table, bypassing signals and cascade collection"""
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({', '.join(['%s'] * len(ids))})",
+                ids
+            )
+            return cursor.rowcount
+
+
+class EmailOutboxService:
+    """
+    Delivers pending EmailNotification rows through the configured provider.
+
+    A worker claims up to batch_size due rows with SELECT ... FOR UPDATE SKIP
+    LOCKED and marks them SENDING in a short transaction, so concurrent workers
+    never claim the same row and no lock is held while the provider is called.
+    Claimed rows are sent in provider-sized batches. Successes become SENT;
+    failures are retried with exponential backoff and become FAILED after
+    EMAIL_OUTBOX_MAX_ATTEMPTS. A SENDING row whose worker died is claimed again
+    once its EMAIL_OUTBOX_LEASE_SECONDS lease runs out.
+    """
+
+    NO_RECIPIENT = "No recipient email address"
+
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        """Wait before retry number `attempts`: base * 2^(attempts - 1), capped at a day, plus jitter"""
+        base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60)
+        delay = min(base * 2 ** max(attempts - 1, 0), 24 * 60 * 60)
+        return timedelta(seconds=delay * random.uniform(1, 1.1))
+
+    @staticmethod
+    def claim(batch_size: int, now=None) -> list[EmailNotification]:
+        """
+        Claim due notifications for this worker.
+
+        Args:
+            batch_size: Most rows to claim
+            now: Claim time; defaults to the current time
+
+        Returns:
+            The claimed notifications with their person and user loaded
+        """
+        now = now or timezone.now()
+        lease_expired = now - timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_LEASE_SECONDS', 300))
+        with transaction.atomic():
+            ids = list(
+                EmailNotification.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=EmailNotification.Status.PENDING, next_attempt_at__lte=now)
+                    | Q(status=EmailNotification.Status.SENDING, claimed_at__lt=lease_expired)
+                )
+                .order_by('next_attempt_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return []
+            EmailNotification.objects.filter(id__in=ids).update(
+                status=EmailNotification.Status.SENDING, claimed_at=now, attempts=F('attempts') + 1
+            )
+        return list(EmailNotification.objects.filter(id__in=ids).select_related('person__user').order_by('id'))
+
+    @staticmethod
+    def send(notifications: list[EmailNotification], provider: EmailProvider = None) -> tuple[int, int]:
+        """
+        Send claimed notifications and record the outcome on each.
+
+        Returns:
+            Tuple of (sent, failed)
+        """
+        provider = provider or get_email_provider()
+        results = {}
+        emails = []
+        for notification in notifications:
+            address = notification.person.user.email if notification.person else None
+            if address:
+                emails.append(OutboundEmail(notification.id, address, notification.title, notification.body or ''))
+            else:
+                results[notification.id] = EmailOutboxService.NO_RECIPIENT
+
+        for first in range(0, len(emails), provider.max_batch_size):
+            batch = emails[first:first + provider.max_batch_size]
+            try:
+                results.update(provider.send_batch(batch))
+            except Exception as e:
+                logger.error(f"Email provider failed on a batch of {len(batch)}: {e}", exc_info=True)
+                results.update({email.notification_id: str(e) or e.__class__.__name__ for email in batch})
+
+        return EmailOutboxService._record(notifications, results)
+
+    @staticmethod
+    def _record(notifications: list[EmailNotification], results: dict) -> tuple[int, int]:
         now = timezone.now()
-        app_deleted = AppNotification.objects.filter(delete_at__lte=now).delete()[0]
-        email_deleted = EmailNotification.objects.filter(delete_at__lte=now).delete()[0]
-        NotifiableEvent.objects.filter(delete_at__lte=now).delete()
-        
-        return app_deleted, email_deleted
+        max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        sent_ids = [notification.id for notification in notifications if results.get(notification.id) is None]
+        EmailNotification.objects.filter(id__in=sent_ids).update(
+            status=EmailNotification.Status.SENT, delivered_at=now, claimed_at=None, last_error=None
+        )
+
+        failed = [notification for notification in notifications if results.get(notification.id) is not None]
+        for notification in failed:
+            notification.last_error = results[notification.id]
+            notification.claimed_at = None
+            if notification.attempts >= max_attempts or notification.last_error == EmailOutboxService.NO_RECIPIENT:
+                notification.status = EmailNotification.Status.FAILED
+            else:
+                notification.status = EmailNotification.Status.PENDING
+                notification.next_attempt_at = now + EmailOutboxService.backoff(notification.attempts)
+        EmailNotification.objects.bulk_update(failed, ['status', 'next_attempt_at', 'claimed_at', 'last_error'])
+        return len(sent_ids), len(failed)
+
+    @staticmethod
+    def run(
+        batch_size: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        provider: EmailProvider = None,
+    ) -> Dict[str, int]:
+        """
+        Claim and send batches until nothing is due or the time budget is spent.
+
+        Args:
+            batch_size: Rows claimed per round; defaults to EMAIL_OUTBOX_BATCH_SIZE
+            max_seconds: Time budget; no limit if None
+            provider: Defaults to the process-wide EMAIL_OUTBOX_PROVIDER
+
+        Returns:
+            Totals of claimed, sent and failed notifications
+        """
+        batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 500)
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        totals = {'claimed': 0, 'sent': 0, 'failed': 0}
+        while deadline is None or time.monotonic() < deadline:
+            notifications = EmailOutboxService.claim(batch_size)
+            if not notifications:
+                break
+            sent, failed = EmailOutboxService.send(notifications, provider)
+            totals['claimed'] += len(notifications)
+            totals['sent'] += sent
+            totals['failed'] += failed
+            if len(notifications) < batch_size:
+                break
+        return totals
+
+
+class CompiledTemplate:
+    """
+    A str.format template parsed once into literal text and field references,
+    so rendering is a join rather than a re-parse. Raises KeyError for missing
+    params, like str.format does.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.pieces = []
+        self.fields = set()
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(source):
+            if literal:
+                self.pieces.append((literal, None, None, None))
+            if field_name is None:
+                continue
+            if not field_name.isidentifier() or (format_spec and '{' in format_spec):
+                # Positional fields, attribute/index lookups and nested specs are
+                # rare enough to leave to str.format, which also reports the errors
+                self.pieces = None
+                return
+            self.fields.add(field_name)
+            self.pieces.append((None, field_name, format_spec, conversion))
+
+    def render(self, params: dict) -> str:
+        if self.pieces is None:
+            return self.source.format(**params)
+
+        parts = []
+        for literal, field_name, format_spec, conversion in self.pieces:
+            if field_name is None:
+                parts.append(literal)
+                continue
+            value = params[field_name]
+            if conversion == 'r':
+                value = repr(value)
+            elif conversion == 's':
+                value = str(value)
+            elif conversion == 'a':
+                value = ascii(value)
+            parts.append(format(value, format_spec) if format_spec else str(value))
+        return ''.join(parts)
+
+
+class CompiledNotificationTemplate:
+    """Pre-parsed title and body of an app or email notification template"""
+
+    def __init__(self, template):
+        self.event_type = template.event_type
+        self.title = CompiledTemplate(template.title)
+        self.body = CompiledTemplate(template.template)
+
+        permitted = {param.strip() for param in template.permitted_params.split(',') if param.strip()}
+        unknown = (self.title.fields | self.body.fields) - permitted
+        if permitted and unknown:
+            logger.warning(f"Template for {self.event_type} uses params that aren't permitted: {sorted(unknown)}")
+
+    def render(self, params: dict) -> tuple[str, str]:
+        return self.title.render(params), self.body.render(params)
+
+    def render_many(self, params_list: Iterable[dict], error: tuple[str, str]) -> list[tuple[str, str]]:
+        """
+        Render (title, body) for many param dicts against this template.
+
+        Args:
+            params_list: One dict of template params per notification
+            error: (title, body) used for any params that don't fit the template
+
+        Returns:
+            One (title, body) tuple per param dict, in order
+        """
+        rendered = []
+        for params in params_list:
+            try:
+                rendered.append(self.render(params))
+            except (KeyError, IndexError, ValueError) as e:
+                logger.error(f"Missing template parameter: {e}")
+                rendered.append(error)
+        return rendered
 
+
+class NotificationTemplateCache:
+    """
+    In-process cache of compiled App/EmailNotificationTemplates keyed by event type.
+
+    Compiled templates are kept per process, tagged with a version number held
+    in the shared Django cache. Saving or deleting any template bumps the
+    version, so every process recompiles on its next lookup. Compiled templates
+    are also dropped after NOTIFICATION_TEMPLATE_CACHE_TIMEOUT seconds, which
+    bounds how long an edit that skipped the signals (a queryset update, a
+    lost version key) can go unseen. Missing templates are cached too, as None.
+    """
+
+    VERSION_KEY = 'engagement:notification_templates:version'
+    _compiled: dict = {}
+    _version = None
+    _compiled_at = 0.0
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'NOTIFICATION_TEMPLATE_CACHE_TIMEOUT', 300)
+
+    @classmethod
+    def get_version(cls) -> int:
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            # Seeded from the clock so an evicted key never comes back as a
+            # version some process has already compiled templates under
+            version = time.time_ns()
+            if not cache.add(cls.VERSION_KEY, version, None):
+                version = cache.get(cls.VERSION_KEY, version)
+        return version
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Make every process recompile its templates on next use"""
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            cache.set(cls.VERSION_KEY, time.time_ns(), None)
+        cls._compiled = {}
+        cls._version = None
+
+    @classmethod
+    def get_many(cls, model, event_types: Iterable[str]) -> dict[str, Optional[CompiledNotificationTemplate]]:
+        """
+        Compiled templates of one model for several event types, with a single
+        query for whichever are not cached yet.
+
+        Args:
+            model: AppNotificationTemplate or EmailNotificationTemplate
+            event_types: EventTypes values to look up
+
+        Returns:
+            Dict mapping each event type to its compiled template, or None if it has none
+        """
+        version = cls.get_version()
+        now = time.monotonic()
+        if cls._version != version or now - cls._compiled_at > cls._timeout():
+            cls._compiled = {}
+            cls._version = version
+            cls._compiled_at = now
+        compiled = cls._compiled.setdefault(model, {})
+
+        event_types = set(event_types)
+        missing = event_types - compiled.keys()
+        cls.hits += len(event_types) - len(missing)
+        if missing:
+            cls.misses += len(missing)
+            templates = model.objects.in_bulk(missing)
+            for event_type in missing:
+                template = templates.get(event_type)
+                compiled[event_type] = CompiledNotificationTemplate(template) if template is not None else None
+
+        return {event_type: compiled[event_type] for event_type in event_types}
+
+    @classmethod
+    def get(cls, model, event_type: str) -> Optional[CompiledNotificationTemplate]:
+        return cls.get_many(model, [event_type])[event_type]
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {'hits': cls.hits, 'misses': cls.misses}
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        cls.hits = 0
+        cls.misses = 0
+
+
+class NotificationFanoutService:
+    """
+    Set-based notification delivery. However many people an event fans out to,
+    the work is a fixed number of queries: one insert per notification table,
+    two preference lookups and, on a cold template cache, one template lookup
+    per channel. Events for people who chose a digest are only stamped with
+    digest_at and left for NotificationDigestService.
+    """
+
+    ERROR_TITLE = "Notification Error"
+    ERROR_MESSAGE = "There was an error processing this notification."
+    MISSING_TITLE = "System Notification"
+    MISSING_EMAIL_BODY = "A notification was generated but the template was not found."
+
+    @staticmethod
+    def fan_out(
+        event_type: str,
+        person_ids: Iterable[int],
+        params: dict,
+        idempotency_key: Optional[str] = None,
+    ) -> list[NotifiableEvent]:
+        """
+        Create one NotifiableEvent per person and deliver them all in a single transaction.
+
+        Args:
+            event_type: The EventTypes value being notified about
+            person_ids: People to notify; duplicates are ignored
+            params: Template parameters shared by every notification
+            idempotency_key: Key of the published event; people already notified
+                under it are skipped, so a retried task doesn't notify twice
+
+        Returns:
+            The created events
+        """
+        person_ids = set(person_ids)
+        if idempotency_key and person_ids:
+            person_ids -= set(NotifiableEvent.objects.filter(
+                idempotency_key=idempotency_key, event_type=event_type, person_id__in=person_ids
+            ).values_list('person_id', flat=True))
+        person_ids = sorted(person_ids)
+        if not person_ids:
+            return []
+
+        digests = NotificationFanoutService.get_digests(set(person_ids))
+        now = timezone.now()
+        with transaction.atomic():
+            events = NotifiableEvent.objects.bulk_create([
+                NotifiableEvent(
+                    event_type=event_type,
+                    person_id=person_id,
+                    params=params,
+                    idempotency_key=idempotency_key,
+                    digest_at=NotificationDigestService.window_end(digests[person_id], now)
+                    if person_id in digests else None
+                )
+                for person_id in person_ids
+            ])
+            NotificationFanoutService.deliver(events, digests)
+        logger.info(f"Fanned out {event_type} to {len(events)} people")
+        return events
+
+    @staticmethod
+    def deliver(events: list[NotifiableEvent], digests: Optional[dict[int, str]] = None) -> tuple[int, int]:
+        """
+        Create the app and email notifications for already saved events,
+        honouring each person's notification preference. Events of people
+        who receive digests are held back for NotificationDigestService.
+
+        Args:
+            events: Saved NotifiableEvent instances
+            digests: Result of get_digests for the events' people, if the caller has it
+
+        Returns:
+            Tuple of (app_notifications_created, email_notifications_created)
+        """
+        if digests is None:
+            digests = NotificationFanoutService.get_digests({event.person_id for event in events})
+        events = NotificationDigestService.hold(events, digests)
+        if not events:
+            return 0, 0
+
+        preferences = NotificationFanoutService.get_preferences({event.person_id for event in events})
+        app_events = [
+            event for event in events
+            if preferences[event.person_id] in (NotificationPreference.Type.APPS, NotificationPreference.Type.BOTH)
+        ]
+        email_events = [
+            event for event in events
+            if preferences[event.person_id] in (NotificationPreference.Type.EMAIL, NotificationPreference.Type.BOTH)
+        ]
+
+        app_notifications = [
+            AppNotification(notifiable_event=event, person_id=event.person_id, title=title, message=message)
+            for event, (title, message) in NotificationFanoutService._render_all(
+                AppNotificationTemplate,
+                app_events,
+                missing=(NotificationFanoutService.MISSING_TITLE, NotificationFanoutService.ERROR_MESSAGE)
+            )
+        ]
+        email_notifications = [
+            EmailNotification(notifiable_event=event, person_id=event.person_id, title=title, body=body)
+            for event, (title, body) in NotificationFanoutService._render_all(
+                EmailNotificationTemplate,
+                email_events,
+                missing=(NotificationFanoutService.MISSING_TITLE, NotificationFanoutService.MISSING_EMAIL_BODY)
+            )
+        ]
+
+        AppNotification.objects.bulk_create(app_notifications)
+        EmailNotification.objects.bulk_create(email_notifications)
+        UnreadNotificationCounter.adjust(Counter(notification.person_id for notification in app_notifications))
+        return len(app_notifications), len(email_notifications)
+
+    @staticmethod
+    def get_preferences(person_ids: set[int]) -> dict[int, str]:
+        """
+        Look up the product notification channel for many people at once,
+        creating the default BOTH preference for anyone who has none yet.
+
+        Args:
+            person_ids: People to look up
+
+        Returns:
+            Dict mapping person id to NotificationPreference.Type value
+        """
+        preferences = dict(
+            NotificationPreference.objects
+            .filter(person_id__in=person_ids)
+            .values_list('person_id', 'product_notifications')
+        )
+        missing = person_ids - preferences.keys()
+        if missing:
+            NotificationPreference.objects.bulk_create(
+                [
+                    NotificationPreference(person_id=person_id, product_notifications=NotificationPreference.Type.BOTH)
+                    for person_id in missing
+                ],
+                ignore_conflicts=True
+            )
+            logger.info(f"Created default notification preferences for {len(missing)} people")
+            preferences.update(dict.fromkeys(missing, NotificationPreference.Type.BOTH))
+        return preferences
+
+    @staticmethod
+    def get_digests(person_ids: set[int]) -> dict[int, str]:
+        """
+        Digest mode of the people among person_ids who receive digests; anyone
+        missing from the result is notified immediately.
+
+        Returns:
+            Dict mapping person id to NotificationPreference.Digest value
+        """
+        if not person_ids:
+            return {}
+        return dict(
+            NotificationPreference.objects
+            .filter(person_id__in=person_ids)
+            .exclude(digest=NotificationPreference.Digest.IMMEDIATE)
+            .exclude(product_notifications=NotificationPreference.Type.NONE)
+            .values_list('person_id', 'digest')
+        )
+
+    @staticmethod
+    def _render_all(model, events: list[NotifiableEvent], missing: tuple[str, str]):
+        """Yield (event, (title, body)) for each event, rendering each event type as one batch"""
+        by_type: dict[str, list[NotifiableEvent]] = {}
+        for event in events:
+            by_type.setdefault(event.event_type, []).append(event)
+
+        templates = NotificationTemplateCache.get_many(model, by_type)
+        error = (NotificationFanoutService.ERROR_TITLE, NotificationFanoutService.ERROR_MESSAGE)
+        for event_type, typed_events in by_type.items():
+            template = templates[event_type]
+            if template is None:
+                logger.error(f"No {model._meta.verbose_name} found for event type: {event_type}")
+                rendered = [missing] * len(typed_events)
+            else:
+                rendered = template.render_many([event.params for event in typed_events], error)
+            yield from zip(typed_events, rendered)
+
+
+class NotificationDigestService:
+    """
+    Rolls the notifications of people who chose an hourly or daily digest
+    into one app notification and one email per person per window.
+
+    Their NotifiableEvents are still saved as they happen, but instead of being
+    rendered they are stamped with digest_at, the end of the person's current
+    window. The scheduled run() picks up every event whose window has closed,
+    renders it with the usual templates and writes one summary per channel,
+    so a busy person costs two notification rows and one email per window
+    rather than per event.
+    """
+
+    # Items listed in full before the summary ends with "...and N more"
+    MAX_ITEMS = 20
+    # AppNotification.message and EmailNotification.body are CharField(max_length=4000)
+    MAX_LENGTH = 4000
+
+    @staticmethod
+    def window_end(digest: str, now=None):
+        """
+        When the window containing now closes: the next full hour for hourly
+        digests, the next NOTIFICATION_DIGEST_HOUR (UTC) for daily ones.
+        """
+        now = now or timezone.now()
+        if digest == NotificationPreference.Digest.HOURLY:
+            return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        end = now.replace(hour=settings.NOTIFICATION_DIGEST_HOUR, minute=0, second=0, microsecond=0)
+        return end if end > now else end + timedelta(days=1)
+
+    @staticmethod
+    def hold(events: list[NotifiableEvent], digests: dict[int, str]) -> list[NotifiableEvent]:
+        """
+        Stamp the events of digest receivers with digest_at, saving any that
+        weren't stamped when they were created.
+
+        Returns:
+            The events to deliver now
+        """
+        if not digests:
+            return [event for event in events if event.digest_at is None]
+
+        now = timezone.now()
+        stamped = []
+        for event in events:
+            if event.digest_at is None and event.person_id in digests:
+                event.digest_at = NotificationDigestService.window_end(digests[event.person_id], now)
+                stamped.append(event)
+        if stamped:
+            NotifiableEvent.objects.bulk_update(stamped, ['digest_at'])
+        return [event for event in events if event.digest_at is None]
+
+    @classmethod
+    def run(cls, now=None, batch_size: int = 500) -> dict:
+        """
+        Deliver every digest whose window has closed.
+
+        People are processed batch_size at a time, each batch in its own
+        transaction; a person's due events are always summarised together.
+
+        Args:
+            now: Deliver digests due at this time; defaults to now
+            batch_size: People per transaction
+
+        Returns:
+            Dict with the number of people, events, app_notifications and email_notifications
+        """
+        now = now or timezone.now()
+        totals = {'people': 0, 'events': 0, 'app_notifications': 0, 'email_notifications': 0}
+        last_person_id = 0
+        while True:
+            person_ids = list(
+                NotifiableEvent.objects
+                .filter(digest_at__lte=now, person_id__gt=last_person_id)
+                .order_by('person_id')
+                .values_list('person_id', flat=True)
+                .distinct()[:batch_size]
+            )
+            if not person_ids:
+                return totals
+            last_person_id = person_ids[-1]
+
+            with transaction.atomic():
+                events = list(
+                    NotifiableEvent.objects.select_for_update(skip_locked=True)
+                    .filter(person_id__in=person_ids, digest_at__lte=now)
+                    .order_by('created_at', 'id')
+                )
+                if not events:
+                    continue
+                app_count, email_count = cls._deliver(events)
+                NotifiableEvent.objects.filter(id__in=[event.id for event in events]).update(digest_at=None)
+
+            totals['people'] += len({event.person_id for event in events})
+            totals['events'] += len(events)
+            totals['app_notifications'] += app_count
+            totals['email_notifications'] += email_count
+
+    @classmethod
+    def _deliver(cls, events: list[NotifiableEvent]) -> tuple[int, int]:
+        preferences = NotificationFanoutService.get_preferences({event.person_id for event in events})
+        channels = {
+            AppNotificationTemplate: (NotificationPreference.Type.APPS, NotificationPreference.Type.BOTH),
+            EmailNotificationTemplate: (NotificationPreference.Type.EMAIL, NotificationPreference.Type.BOTH),
+        }
+        missing = {
+            AppNotificationTemplate: NotificationFanoutService.ERROR_MESSAGE,
+            EmailNotificationTemplate: NotificationFanoutService.MISSING_EMAIL_BODY,
+        }
+        # {model: {person_id: [(title, body), ...]}} in the order the events happened
+        items = {}
+        for model, types in channels.items():
+            rendered = dict(
+                (event.id, parts) for event, parts in NotificationFanoutService._render_all(
+                    model,
+                    [event for event in events if preferences[event.person_id] in types],
+                    missing=(NotificationFanoutService.MISSING_TITLE, missing[model])
+                )
+            )
+            by_person = items[model] = {}
+            for event in events:
+                if event.id in rendered:
+                    by_person.setdefault(event.person_id, []).append(rendered[event.id])
+
+        app_notifications = [
+            AppNotification(
+                person_id=person_id,
+                title=cls.title(len(parts)),
+                message=cls.compose([f"{title}\n{message}" for title, message in parts], "\n\n"),
+            )
+            for person_id, parts in items[AppNotificationTemplate].items()
+        ]
+        email_notifications = [
+            EmailNotification(
+                person_id=person_id,
+                title=cls.title(len(parts)),
+                body=cls.compose([f"<h3>{escape(title)}</h3>{body}" for title, body in parts], "<hr>"),
+            )
+            for person_id, parts in items[EmailNotificationTemplate].items()
+        ]
+        AppNotification.objects.bulk_create(app_notifications)
+        EmailNotification.objects.bulk_create(email_notifications)
+        UnreadNotificationCounter.adjust(Counter(notification.person_id for notification in app_notifications))
+        return len(app_notifications), len(email_notifications)
+
+    @staticmethod
+    def title(count: int) -> str:
+        return f"{count} new notification{'' if count == 1 else 's'}"
+
+    @classmethod
+    def compose(cls, parts: list[str], separator: str) -> str:
+        """
+        Join as many whole parts as fit in MAX_LENGTH, ending with a count of
+        the rest. Parts are never cut, since an email part is HTML and a cut
+        could end it inside a tag or an entity.
+        """
+        # Leave room for the "...and N more" line
+        budget = cls.MAX_LENGTH - 50
+        included = []
+        size = 0
+        for part in parts[:cls.MAX_ITEMS]:
+            size += len(part) + len(separator)
+            if size > budget:
+                break
+            included.append(part)
+        more = f"...and {len(parts) - len(included)} more"
+        if not included:
+            return more
+        text = separator.join(included)
+        if len(parts) > len(included):
+            text += f"{separator}{more}"
+        return text
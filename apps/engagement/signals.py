@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch.dispatcher import receiver
+
+from .models import AppNotification, AppNotificationTemplate, EmailNotificationTemplate
+
+
+@receiver(post_save, sender=AppNotificationTemplate)
+@receiver(post_save, sender=EmailNotificationTemplate)
+@receiver(post_delete, sender=AppNotificationTemplate)
+@receiver(post_delete, sender=EmailNotificationTemplate)
+def invalidate_notification_templates(sender, instance, **kwargs):
+    """Recompile notification templates everywhere once one of them changes"""
+    from .services import NotificationTemplateCache
+
+    NotificationTemplateCache.invalidate()
+
+
+@receiver(post_save, sender=AppNotification)
+def count_unread_notification(sender, instance, created, **kwargs):
+    """Keep the unread counter right for notifications created one at a time"""
+    from .services import UnreadNotificationCounter
+
+    if created and not instance.is_read:
+        UnreadNotificationCounter.adjust({instance.person_id: 1})
@@ -1,12 +1,12 @@
 import logging
-from apps.engagement.models import (
-    NotifiableEvent,
-    AppNotification,
-    EmailNotification,
-    AppNotificationTemplate,
-    EmailNotificationTemplate,
-    NotificationPreference
+from apps.engagement.models import NotifiableEvent
+from apps.engagement.services import (
+    EmailOutboxService,
+    ExpiredRowCleanupService,
+    NotificationDigestService,
+    NotificationFanoutService,
 )
+from django.conf import settings
 from django.db import transaction
 
 logger = logging.getLogger(__name__)
@@ -24,82 +24,39 @@ def process_notification(event_type=None, payload=None):
         with transaction.atomic():
             try:
                 event = NotifiableEvent.objects.select_for_update().get(id=event_id)
-                person = event.person
-                
-                # Get or create notification preferences with default BOTH
-                prefs, created = NotificationPreference.objects.get_or_create(
-                    person=person,
-                    defaults={'product_notifications': NotificationPreference.Type.BOTH}
-                )
-                
-                if created:
-                    logger.info(f"Created default notification preferences for person {person.id}")
-                
-                # Get notification type based on preferences
-                notification_type = prefs.product_notifications
-                
-                if notification_type in [NotificationPreference.Type.APPS, NotificationPreference.Type.BOTH]:
-                    try:
-                        template = AppNotificationTemplate.objects.get(event_type=event.event_type)
-                        
-                        try:
-                            title = template.title.format(**event.params)
-                            message = template.template.format(**event.params)
-                        except KeyError as e:
-                            logger.error(f"Missing template parameter: {e}")
-                            title = "Notification Error"
-                            message = "There was an error processing this notification."
-                            
-                        AppNotification.objects.create(
-                            notifiable_event=event,
-                            person=person,
-                            title=title,
-                            message=message
-                        )
-                    except AppNotificationTemplate.DoesNotExist:
-                        logger.error(f"No app template found for event type: {event.event_type}")
-                        # Create default notification when template is missing
-                        AppNotification.objects.create(
-                            notifiable_event=event,
-                            person=person,
-                            title="System Notification",
-                            message="There was an error processing this notification."
-                        )
-                        
-                if notification_type in [NotificationPreference.Type.EMAIL, NotificationPreference.Type.BOTH]:
-                    try:
-                        template = EmailNotificationTemplate.objects.get(event_type=event.event_type)
-                        
-                        try:
-                            title = template.title.format(**event.params)
-                            body = template.template.format(**event.params)
-                        except KeyError as e:
-                            logger.error(f"Missing template parameter: {e}")
-                            title = "Notification Error"
-                            body = "There was an error processing this notification."
-                            
-                        EmailNotification.objects.create(
-                            notifiable_event=event,
-                            person=person,
-                            title=title,
-                            body=body
-                        )
-                    except EmailNotificationTemplate.DoesNotExist:
-                        logger.error(f"No email template found for event type: {event.event_type}")
-                        # Create default notification when template is missing
-                        EmailNotification.objects.create(
-                            notifiable_event=event,
-                            person=person,
-                            title="System Notification",
-                            body="A notification was generated but the template was not found."
-                        )
-                        
-                return True
-                
             except NotifiableEvent.DoesNotExist:
                 logger.error(f"Event {event_id} not found")
                 return False
+
+            NotificationFanoutService.deliver([event])
+            return True
             
     except Exception as e:
         logger.error(f"Error processing notification: {str(e)}")
         return False
+
+
+def cleanup_expired_rows():
+    """Scheduled job: delete expired notifications and event log rows within one time budget"""
+    totals = ExpiredRowCleanupService.run(
+        max_seconds=getattr(settings, 'CLEANUP_MAX_SECONDS', 60),
+        progress=lambda step, deleted: logger.info(f"Cleanup {step}: {deleted} rows deleted"),
+    )
+    logger.info(f"Cleanup finished: {totals}")
+    return totals
+
+
+def send_email_outbox():
+    """Scheduled job: send due email notifications within one time budget"""
+    totals = EmailOutboxService.run(max_seconds=getattr(settings, 'EMAIL_OUTBOX_MAX_SECONDS', 50))
+    if totals['claimed']:
+        logger.info(f"Email outbox: {totals}")
+    return totals
+
+
+def send_notification_digests():
+    """Scheduled job: deliver the hourly and daily digests whose window has closed"""
+    totals = NotificationDigestService.run()
+    if totals['people']:
+        logger.info(f"Notification digests: {totals}")
+    return totals
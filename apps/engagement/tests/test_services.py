@@ -0,0 +1,252 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.capabilities.talent.models import Person
+from apps.engagement.models import (
+    AppNotification,
+    AppNotificationTemplate,
+    EmailNotification,
+    NotifiableEvent,
+    NotificationPreference
+)
+from apps.engagement.email_providers import FakeEmailProvider
+from apps.engagement.services import (
+    EmailOutboxService,
+    ExpiredRowCleanupService,
+    NotificationDigestService,
+    NotificationFanoutService,
+    NotificationService,
+    NotificationTemplateCache
+)
+from apps.event_hub.events import EventTypes
+from apps.event_hub.models import EventLog
+
+
+def make_people(count, prefix):
+    User = get_user_model()
+    users = User.objects.bulk_create([
+        User(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com") for i in range(count)
+    ])
+    return Person.objects.bulk_create([
+        Person(user=user, full_name=user.username, preferred_name=user.username) for user in users
+    ])
+
+
+@pytest.fixture
+def app_template():
+    return AppNotificationTemplate.objects.create(
+        event_type=EventTypes.PRODUCT_CREATED,
+        title="New Product: {product_name}",
+        template="{product_name} is at {product_url}",
+        permitted_params="product_name,product_url"
+    )
+
+
+@pytest.mark.django_db
+class TestNotificationFanoutService:
+    params = {'product_name': "Widget", 'product_url': "/widget/"}
+
+    def test_fan_out_honours_preferences(self, app_template):
+        app_only, email_only, no_prefs = make_people(3, "fanout")
+        NotificationPreference.objects.create(person=app_only, product_notifications=NotificationPreference.Type.APPS)
+        NotificationPreference.objects.create(person=email_only, product_notifications=NotificationPreference.Type.EMAIL)
+
+        events = NotificationFanoutService.fan_out(
+            EventTypes.PRODUCT_CREATED, [app_only.id, email_only.id, no_prefs.id, app_only.id], self.params
+        )
+
+        assert len(events) == 3
+        assert set(AppNotification.objects.values_list('person_id', flat=True)) == {app_only.id, no_prefs.id}
+        assert set(EmailNotification.objects.values_list('person_id', flat=True)) == {email_only.id, no_prefs.id}
+        assert AppNotification.objects.filter(message="Widget is at /widget/").count() == 2
+        # No email template exists, so the fallback body is used
+        assert not EmailNotification.objects.exclude(body=NotificationFanoutService.MISSING_EMAIL_BODY).exists()
+        assert NotificationPreference.objects.get(person=no_prefs).product_notifications == NotificationPreference.Type.BOTH
+
+    def test_query_count_does_not_grow_with_audience(self, app_template):
+        def count_queries(people):
+            with CaptureQueriesContext(connection) as context:
+                NotificationFanoutService.fan_out(EventTypes.PRODUCT_CREATED, [p.id for p in people], self.params)
+            return len(context.captured_queries)
+
+        count_queries(make_people(1, "warm"))
+        assert count_queries(make_people(3, "small")) == count_queries(make_people(50, "large"))
+
+    def test_redelivery_with_the_same_idempotency_key_is_skipped(self, app_template):
+        first, second = make_people(2, "retry")
+
+        delivered = NotificationFanoutService.fan_out(EventTypes.PRODUCT_CREATED, [first.id], self.params, "key-1")
+        retried = NotificationFanoutService.fan_out(
+            EventTypes.PRODUCT_CREATED, [first.id, second.id], self.params, "key-1"
+        )
+
+        assert len(delivered) == 1
+        assert [event.person_id for event in retried] == [second.id]
+        assert AppNotification.objects.filter(person=first).count() == 1
+
+
+@pytest.mark.django_db
+class TestNotificationTemplateCache:
+    def test_templates_are_compiled_once_and_refreshed_on_save(self, app_template):
+        params_list = [{'product_name': name, 'product_url': f"/{name}/"} for name in ("a", "b")]
+        error = ("error", "error")
+
+        template = NotificationTemplateCache.get(AppNotificationTemplate, EventTypes.PRODUCT_CREATED)
+        assert template.render_many(params_list + [{}], error) == [("New Product: a", "a is at /a/"),
+                                                                   ("New Product: b", "b is at /b/"),
+                                                                   error]
+        with CaptureQueriesContext(connection) as context:
+            NotificationTemplateCache.get(AppNotificationTemplate, EventTypes.PRODUCT_CREATED)
+        assert not context.captured_queries
+
+        app_template.title = "{product_name:>3}!"
+        app_template.save()
+        template = NotificationTemplateCache.get(AppNotificationTemplate, EventTypes.PRODUCT_CREATED)
+        assert template.render(params_list[0])[0] == "  a!"
+
+    def test_compiled_templates_expire_without_a_version_bump(self, app_template):
+        NotificationTemplateCache.get(AppNotificationTemplate, EventTypes.PRODUCT_CREATED)
+        # An edit that skips the post_save signal leaves the version alone
+        AppNotificationTemplate.objects.filter(pk=app_template.pk).update(title="Edited: {product_name}")
+        template = NotificationTemplateCache.get(AppNotificationTemplate, EventTypes.PRODUCT_CREATED)
+        assert template.render({'product_name': "a", 'product_url': "/a/"})[0] == "New Product: a"
+
+        NotificationTemplateCache._compiled_at -= NotificationTemplateCache._timeout() + 1
+        template = NotificationTemplateCache.get(AppNotificationTemplate, EventTypes.PRODUCT_CREATED)
+        assert template.render({'product_name': "a", 'product_url': "/a/"})[0] == "Edited: a"
+
+
+@pytest.mark.django_db
+class TestUnreadNotificationCounter:
+    def test_counter_follows_creates_and_reads(self, app_template, django_capture_on_commit_callbacks):
+        person, other = make_people(2, "bell")
+        service = NotificationService()
+        params = {'product_name': "Widget", 'product_url': "/widget/"}
+
+        assert service.get_notification_count(person) == 0
+        with django_capture_on_commit_callbacks(execute=True):
+            NotificationFanoutService.fan_out(EventTypes.PRODUCT_CREATED, [person.id, other.id], params)
+            NotificationFanoutService.fan_out(EventTypes.PRODUCT_CREATED, [person.id], params)
+        with CaptureQueriesContext(connection) as context:
+            assert service.get_notification_count(person) == 2
+        assert not context.captured_queries
+
+        first = AppNotification.objects.filter(person=person).first()
+        with django_capture_on_commit_callbacks(execute=True):
+            assert first.mark_as_read()
+            assert not first.mark_as_read()
+        assert service.get_notification_count(person) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert service.mark_all_as_read(person) == 1
+        assert service.get_notification_count(person) == 0
+        assert service.get_notification_count(other) == 1
+
+
+@pytest.mark.django_db
+class TestExpiredRowCleanupService:
+    def test_deletes_expired_rows_in_chunks_with_their_notifications(self, app_template):
+        people = make_people(5, "expired")
+        past = timezone.now() - timedelta(days=1)
+        events = NotificationFanoutService.fan_out(
+            EventTypes.PRODUCT_CREATED, [person.id for person in people], {'product_name': "x", 'product_url': "/x/"}
+        )
+        # The events expire before their notifications do
+        NotifiableEvent.objects.filter(id__in=[event.id for event in events[:3]]).update(delete_at=past)
+        EventLog.objects.create(event_type=EventTypes.TEST_EVENT, payload={}, delete_at=past)
+        stale = EventLog.objects.create(event_type=EventTypes.TEST_EVENT, payload={})
+        EventLog.objects.filter(id=stale.id).update(created_at=past - timedelta(days=365))
+        kept_log = EventLog.objects.create(event_type=EventTypes.TEST_EVENT, payload={})
+        progress = []
+
+        totals = ExpiredRowCleanupService.run(chunk_size=2, throttle=0, progress=lambda *args: progress.append(args))
+
+        assert totals == {'app_notifications': 0, 'email_notifications': 0, 'notifiable_events': 3, 'event_logs': 2}
+        assert progress == [('notifiable_events', 2), ('notifiable_events', 3), ('event_logs', 2)]
+        assert set(NotifiableEvent.objects.values_list('id', flat=True)) == {event.id for event in events[3:]}
+        assert set(AppNotification.objects.values_list('notifiable_event_id', flat=True)) == {
+            event.id for event in events[3:]
+        }
+        assert list(EventLog.objects.values_list('id', flat=True)) == [kept_log.id]
+
+
+@pytest.mark.django_db
+class TestEmailOutboxService:
+    def test_sends_in_batches_and_retries_failures_with_backoff(self, settings):
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        first, second, bouncing = make_people(3, "outbox")
+        for person in (first, second, bouncing):
+            EmailNotification.objects.create(person=person, title="Hello", body="<p>Hi</p>")
+        provider = FakeEmailProvider(failing={bouncing.user.email}, max_batch_size=2)
+
+        assert EmailOutboxService.run(batch_size=10, provider=provider) == {'claimed': 3, 'sent': 2, 'failed': 1}
+        assert provider.calls == 2
+        assert sorted(email.to for email in provider.sent) == sorted([first.user.email, second.user.email])
+
+        retry = EmailNotification.objects.get(person=bouncing)
+        assert retry.status == EmailNotification.Status.PENDING
+        assert retry.attempts == 1
+        assert retry.next_attempt_at > timezone.now()
+        assert EmailOutboxService.claim(10) == []
+
+        claimed = EmailOutboxService.claim(10, now=retry.next_attempt_at)
+        assert EmailOutboxService.send(claimed, provider) == (0, 1)
+        retry.refresh_from_db()
+        assert retry.status == EmailNotification.Status.FAILED
+        assert retry.last_error == "Rejected by fake provider"
+        assert EmailNotification.objects.filter(status=EmailNotification.Status.SENT).count() == 2
+
+
+@pytest.mark.django_db
+class TestNotificationDigestService:
+    params = {'product_name': "Widget", 'product_url': "/widget/"}
+
+    def test_events_are_held_and_rolled_into_one_notification_per_window(self, app_template):
+        hourly, immediate = make_people(2, "digest")
+        NotificationPreference.objects.create(
+            person=hourly, product_notifications=NotificationPreference.Type.BOTH,
+            digest=NotificationPreference.Digest.HOURLY
+        )
+
+        for _ in range(3):
+            NotificationFanoutService.fan_out(EventTypes.PRODUCT_CREATED, [hourly.id, immediate.id], self.params)
+
+        assert AppNotification.objects.filter(person=immediate).count() == 3
+        assert not AppNotification.objects.filter(person=hourly).exists()
+        held = NotifiableEvent.objects.filter(person=hourly)
+        assert held.filter(digest_at__isnull=False).count() == 3
+
+        # Nothing is due until the window closes
+        assert NotificationDigestService.run()['people'] == 0
+        totals = NotificationDigestService.run(now=held.first().digest_at)
+
+        assert totals == {'people': 1, 'events': 3, 'app_notifications': 1, 'email_notifications': 1}
+        digest = AppNotification.objects.get(person=hourly)
+        assert digest.title == "3 new notifications"
+        assert digest.message.count("Widget is at /widget/") == 3
+        assert EmailNotification.objects.filter(person=hourly).count() == 1
+        assert not held.filter(digest_at__isnull=False).exists()
+
+    def test_window_end(self):
+        now = timezone.now().replace(hour=10, minute=30)
+        assert NotificationDigestService.window_end(NotificationPreference.Digest.HOURLY, now) == \
+            now.replace(hour=11, minute=0, second=0, microsecond=0)
+        daily = NotificationDigestService.window_end(NotificationPreference.Digest.DAILY, now)
+        assert daily > now and daily - now <= timedelta(days=1)
+
+    def test_compose_truncates_long_digests(self):
+        parts = [f"item {i}" for i in range(30)]
+        text = NotificationDigestService.compose(parts, "\n")
+        assert text.endswith(f"...and {30 - NotificationDigestService.MAX_ITEMS} more")
+        assert len(NotificationDigestService.compose(["x" * 3000] * 3, "\n")) <= NotificationDigestService.MAX_LENGTH
+
+    def test_compose_keeps_parts_whole(self):
+        part = f"<h3>Title</h3><p>{'a &amp; b ' * 250}</p>"
+        text = NotificationDigestService.compose([part] * 3, "<hr>")
+        assert text == f"{part}<hr>...and 2 more"
+        assert NotificationDigestService.compose(["x" * 5000], "<hr>") == "...and 1 more"
@@ -5,5 +5,6 @@ class EventHubConfig(AppConfig):
     name = 'apps.event_hub'
 
     def ready(self):
-        # Import any signal handlers or event listeners here
-        pass
+        # Build the listener registry once per process, before any event is published
+        from apps.event_hub.services.registry import build_listener_registry
+        build_listener_registry()
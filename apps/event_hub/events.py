@@ -21,6 +21,12 @@ class EventTypes:
         TEST_MULTIPLE_LISTENERS: _("Test Multiple Listeners"),
     }
 
+    # Payload field naming the entity an event is about, for events whose rapid
+    # repeats are merged into one (see EventCoalescer)
+    COALESCE_KEYS = {
+        PRODUCT_UPDATED: 'productId',
+    }
+
 
     @classmethod
     def is_notifiable(cls, event_name: str) -> bool:
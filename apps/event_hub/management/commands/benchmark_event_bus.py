@@ -0,0 +1,62 @@
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+from django_q.models import OrmQ
+
+from apps.event_hub.events import EventTypes
+from apps.event_hub.models import EventLog
+from apps.event_hub.services.backends.batched import BatchedDjangoQBackend
+from apps.event_hub.services.backends.django_q import DjangoQBackend
+from apps.event_hub.services.event_bus import EventBus
+
+
+def noop_listener(event_type=None, payload=None):
+    """Listener for benchmark events; workers that pick them up do nothing"""
+    return True
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare publish throughput of the per-event Django-Q backend and the batched "
+        "backend. Events are grouped into simulated requests; the EventLog and ORM "
+        "queue rows written by the run are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=5_000)
+        parser.add_argument("--per-request", type=int, default=20, help="Events published per simulated request")
+
+    def handle(self, *args, **options):
+        last_log_id = EventLog.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        last_queue_id = OrmQ.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        try:
+            for label, backend in (("django-q (per event)", DjangoQBackend()),
+                                   ("batched", BatchedDjangoQBackend())):
+                self._run(label, backend, options["events"], options["per_request"])
+        finally:
+            EventLog.objects.filter(id__gt=last_log_id).delete()
+            OrmQ.objects.filter(id__gt=last_queue_id).delete()
+
+    def _run(self, label, backend, events, per_request):
+        bus = EventBus(backend)
+        # Set directly so the benchmark listener never reaches the shared registry
+        bus.listeners[EventTypes.TEST_EVENT] = {noop_listener}
+        queued_before = OrmQ.objects.count()
+
+        started = time.perf_counter()
+        for first in range(0, events, per_request):
+            with self._request(backend):
+                for i in range(first, min(first + per_request, events)):
+                    bus.publish(EventTypes.TEST_EVENT, {"sequence": i})
+        elapsed = time.perf_counter() - started
+
+        tasks = OrmQ.objects.count() - queued_before
+        self.stdout.write(f"{label:<22} {events / elapsed:10.0f} events/s   "
+                          f"{elapsed * 1000 / events:6.3f} ms/event   {tasks} tasks queued")
+
+    @staticmethod
+    def _request(backend):
+        if isinstance(backend, BatchedDjangoQBackend):
+            return backend.batch()
+        return nullcontext()
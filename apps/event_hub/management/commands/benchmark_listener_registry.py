@@ -0,0 +1,85 @@
+import time
+from statistics import median
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from apps.event_hub.services import registry
+from apps.event_hub.services.backends.base import EventBusBackend
+from apps.event_hub.services.event_bus import EventBus
+
+CACHE_KEY = 'event_hub:benchmark_listeners'
+
+
+class _NullBackend(EventBusBackend):
+    def enqueue_task(self, listener, event_data, event_type):
+        return None
+
+    def execute_task_sync(self, listener, event_data, event_type):
+        return None
+
+    def report_error(self, error, context=None):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare bus start-up and publish overhead of the static listener registry with "
+        "the previous cache-backed registration, which read-modify-wrote the listener set "
+        "in the Django cache per registration and re-imported every path per EventBus."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=50, help="Start-ups to time")
+        parser.add_argument("--publishes", type=int, default=100_000)
+
+    def handle(self, *args, **options):
+        listeners = registry.get_listener_registry()
+        if not listeners:
+            self.stdout.write("No listeners are registered; nothing to compare.")
+            return
+
+        try:
+            self._time("cache-backed start-up", options["rounds"], lambda: self._legacy_startup(listeners))
+        finally:
+            cache.delete(CACHE_KEY)
+        self._time("registry start-up", options["rounds"], self._registry_startup)
+
+        event_type = next(iter(listeners))
+        bus = EventBus(_NullBackend())
+        started = time.perf_counter()
+        for _ in range(options["publishes"]):
+            bus.publish(event_type, {})
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{'publish overhead':<24} {elapsed * 1_000_000 / options['publishes']:8.2f} us/event")
+
+    def _time(self, label, rounds, startup):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            startup()
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(f"{label:<24} median {median(timings):8.3f} ms   max {max(timings):8.3f} ms")
+
+    @staticmethod
+    def _legacy_startup(listeners):
+        """Registration and bus construction as they worked before the registry"""
+        cache.delete(CACHE_KEY)
+        for event_type, event_listeners in listeners.items():
+            for listener in event_listeners:
+                cached = cache.get(CACHE_KEY, {})
+                cached.setdefault(event_type, set()).add(registry.listener_path(listener))
+                cache.set(CACHE_KEY, cached)
+
+        loaded = {}
+        for event_type, paths in cache.get(CACHE_KEY, {}).items():
+            for path in paths:
+                module_path, function_name = path.rsplit('.', 1)
+                module = __import__(module_path, fromlist=[function_name])
+                loaded.setdefault(event_type, set()).add(getattr(module, function_name))
+        return loaded
+
+    @staticmethod
+    def _registry_startup():
+        registry.reset_listener_registry()
+        EventBus(_NullBackend())
@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.event_hub.services.metrics import BUCKETS_MS, STAGES, EventMetrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Show event pipeline counters, failure rates and latency percentiles per event type "
+        "and per listener. Percentiles are bucket upper bounds in milliseconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stage", choices=STAGES, help="Only show this stage")
+        parser.add_argument("--json", action="store_true", help="Print the raw snapshot as JSON")
+        parser.add_argument("--reset", action="store_true", help="Clear all recorded metrics")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            EventMetrics.reset()
+            self.stdout.write("Event metrics cleared.")
+            return
+
+        snapshot = EventMetrics.snapshot(options["stage"])
+        if options["json"]:
+            self.stdout.write(json.dumps(snapshot, indent=2))
+            return
+        if not snapshot:
+            self.stdout.write("No event metrics recorded yet.")
+            return
+
+        for stage in STAGES:
+            series = snapshot.get(stage)
+            if not series:
+                continue
+            self.stdout.write(f"\n{stage}")
+            self.stdout.write(
+                f"  {'key':<60} {'count':>8} {'failed':>7} {'fail %':>7} {'avg ms':>9} "
+                f"{'p50':>7} {'p95':>7} {'p99':>7}"
+            )
+            for key, stats in sorted(series.items(), key=lambda item: -item[1]['count']):
+                self.stdout.write(
+                    f"  {key:<60} {stats['count']:>8} {stats['failures']:>7} "
+                    f"{stats['failure_rate'] * 100:>6.1f}% {stats['avg_ms']:>9.2f} "
+                    f"{self._ms(stats['p50_ms'])} {self._ms(stats['p95_ms'])} {self._ms(stats['p99_ms'])}"
+                )
+
+    @staticmethod
+    def _ms(value):
+        return f"{f'>{BUCKETS_MS[-1]}' if value is None else value:>7}"
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.event_hub.services.partitions import EventLogPartitionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming event log partitions and drop the ones past retention. "
+        "Run it at least once per partition interval, e.g. from a daily schedule."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=3, help="Future partitions to keep ready")
+        parser.add_argument("--retention-days", type=int, default=settings.EVENT_LOG_RETENTION_DAYS)
+        parser.add_argument("--no-drop", action="store_true", help="Only create partitions")
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--list", action="store_true", help="List the existing partitions and exit")
+
+    def handle(self, *args, **options):
+        if not EventLogPartitionService.is_partitioned():
+            raise CommandError(
+                "event_hub_eventlog is not partitioned; run the event_hub migrations on Postgres first."
+            )
+
+        if options["list"]:
+            for partition in EventLogPartitionService.list_partitions():
+                self.stdout.write(f"{partition.name}  {partition.start} .. {partition.end}")
+            self.stdout.write(f"{EventLogPartitionService.default_partition_rows()} rows in the default partition")
+            return
+
+        verb = "Would" if options["dry_run"] else "Did"
+        created = EventLogPartitionService.ensure_partitions(ahead=options["ahead"], dry_run=options["dry_run"])
+        for partition in created:
+            self.stdout.write(f"{verb} create {partition.name} ({partition.start} .. {partition.end})")
+
+        if not options["no_drop"]:
+            dropped = EventLogPartitionService.drop_expired(options["retention_days"], dry_run=options["dry_run"])
+            for partition in dropped:
+                self.stdout.write(f"{verb} drop {partition.name} ({partition.start} .. {partition.end})")
+
+        orphans = EventLogPartitionService.default_partition_rows()
+        if orphans:
+            self.stderr.write(
+                f"{orphans} rows are in the default partition and are not covered by retention; "
+                f"create partitions further ahead."
+            )
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from apps.event_hub.models import ReplayCheckpoint
+from apps.event_hub.services.replay import EventReplayService
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run logged events through their listeners, or through --listener paths. "
+        "With --checkpoint, progress is saved and re-running the same command resumes it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="ISO datetime, inclusive")
+        parser.add_argument("--until", help="ISO datetime, exclusive")
+        parser.add_argument("--event-type", action="append", default=[], dest="event_types")
+        parser.add_argument("--listener", action="append", default=[], dest="listeners",
+                            help="Dotted path of a listener to run instead of the registered ones")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--checkpoint", help="Name to save progress under")
+        parser.add_argument("--restart", action="store_true", help="Discard the checkpoint and start over")
+        parser.add_argument("--dry-run", action="store_true", help="Stream the events without running listeners")
+
+    def handle(self, *args, **options):
+        since = self._parse(options["since"], "--since")
+        until = self._parse(options["until"], "--until")
+        if options["restart"] and options["checkpoint"]:
+            ReplayCheckpoint.objects.filter(name=options["checkpoint"]).delete()
+
+        def progress(result):
+            self.stdout.write(f"{result.processed} events replayed ({result.failed} failed), "
+                              f"{result.rate:.0f}/s, up to event {result.last_key[1]}")
+
+        try:
+            result = EventReplayService.replay(
+                since=since,
+                until=until,
+                event_types=options["event_types"],
+                listener_paths=options["listeners"],
+                workers=options["workers"],
+                batch_size=options["batch_size"],
+                checkpoint_name=options["checkpoint"],
+                dry_run=options["dry_run"],
+                progress=progress if options["verbosity"] > 1 else None,
+            )
+        except (ImportError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stderr.write(error)
+        mode = "Dry run: read" if options["dry_run"] else "Replayed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{mode} {result.processed} events in {result.elapsed:.1f}s ({result.rate:.0f}/s), "
+            f"{result.failed} failed"
+        ))
+
+    @staticmethod
+    def _parse(value, option):
+        if value is None:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError(f"{option} must be an ISO datetime")
+        return parsed
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.db import migrations
+
+TABLE = 'event_hub_eventlog'
+OLD_TABLE = 'event_hub_eventlog_unpartitioned'
+INDEX = 'event_hub_e_event_t_e9f592_idx'
+
+
+def _fix_id_sequence(cursor, source, target):
+    """Keep ids growing from where the source table left off"""
+    cursor.execute(
+        "SELECT is_identity FROM information_schema.columns WHERE table_name = %s AND column_name = 'id'",
+        [source]
+    )
+    is_identity = cursor.fetchone()[0] == 'YES'
+    if is_identity:
+        # LIKE ... INCLUDING IDENTITY gives the new table a fresh sequence
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{target}', 'id'), "
+            f"COALESCE((SELECT max(id) FROM \"{target}\"), 0) + 1, false)"
+        )
+    else:
+        # A serial default still points at the old table's sequence; move its ownership
+        cursor.execute(f"SELECT pg_get_serial_sequence('{source}', 'id')")
+        sequence = cursor.fetchone()[0]
+        if sequence:
+            cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{target}".id')
+
+
+def partition_eventlog(apps, schema_editor):
+    """
+    Rebuild event_hub_eventlog as a table range-partitioned by created_at. The
+    primary key becomes (id, created_at), as Postgres requires the partition
+    key in every unique constraint; ids still come from a single sequence.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    from apps.event_hub.services.partitions import EventLogPartitionService
+
+    if EventLogPartitionService.is_partitioned():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{OLD_TABLE}"')
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" (LIKE "{OLD_TABLE}" INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+        # A partition for every period that holds existing rows, plus the next few
+        cursor.execute(f'SELECT min(created_at)::date FROM "{OLD_TABLE}"')
+        oldest = cursor.fetchone()[0]
+        interval = EventLogPartitionService.get_interval()
+        start = EventLogPartitionService.period_start(oldest, interval) if oldest else None
+        if start:
+            cursor.execute("SELECT (now() AT TIME ZONE 'UTC')::date")
+            today = cursor.fetchone()[0]
+            while start <= today + timedelta(days=1):
+                end = EventLogPartitionService.next_period(start, interval)
+                EventLogPartitionService.create_partition(start, end, cursor=cursor)
+                start = end
+
+        cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{OLD_TABLE}"')
+        _fix_id_sequence(cursor, OLD_TABLE, TABLE)
+        cursor.execute(f'DROP TABLE "{OLD_TABLE}"')
+
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, created_at)')
+        cursor.execute(f'CREATE INDEX "{INDEX}" ON "{TABLE}" (event_type, created_at)')
+
+    EventLogPartitionService.ensure_partitions()
+
+
+def unpartition_eventlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    from apps.event_hub.services.partitions import EventLogPartitionService
+
+    if not EventLogPartitionService.is_partitioned():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{OLD_TABLE}"')
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" (LIKE "{OLD_TABLE}" INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS)'
+        )
+        cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{OLD_TABLE}"')
+        _fix_id_sequence(cursor, OLD_TABLE, TABLE)
+        cursor.execute(f'DROP TABLE "{OLD_TABLE}" CASCADE')
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id)')
+        cursor.execute(f'CREATE INDEX "{INDEX}" ON "{TABLE}" (event_type, created_at)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_hub', '0010_eventlog_delete_at_alter_eventlog_parent_event_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_eventlog, unpartition_eventlog),
+    ]
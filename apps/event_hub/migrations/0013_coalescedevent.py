@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_hub', '0012_replaycheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoalescedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=100)),
+                ('entity_id', models.CharField(max_length=100)),
+                ('payload', models.JSONField()),
+                ('coalesced', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('due_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['due_at'], name='event_hub_c_due_at_5ea9d9_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='coalescedevent',
+            constraint=models.UniqueConstraint(fields=('event_type', 'entity_id'), name='unique_coalesced_event'),
+        ),
+    ]
@@ -7,7 +7,12 @@ from apps.common import settings
 from .events import EventTypes
 
 class EventLog(models.Model):
-    """Log of all events that pass through the event bus"""
+    """
+    Log of all events that pass through the event bus.
+
+    On Postgres the table is range-partitioned by created_at and old rows are
+    removed by dropping whole partitions; see EventLogPartitionService.
+    """
     
     event_type = models.CharField(max_length=100)
     payload = models.JSONField()
@@ -31,3 +36,47 @@ class EventLog(models.Model):
     def save(self, *args, **kwargs):
         self.clean()
         super().save(*args, **kwargs)
+
+
+class ReplayCheckpoint(models.Model):
+    """Progress of a named event replay, so an interrupted replay can resume"""
+
+    name = models.CharField(max_length=100, unique=True)
+    filters = models.JSONField(default=dict)
+    listener_paths = models.JSONField(default=list)
+    last_created_at = models.DateTimeField(null=True, blank=True)
+    last_event_id = models.BigIntegerField(null=True, blank=True)
+    processed = models.PositiveBigIntegerField(default=0)
+    failed = models.PositiveBigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Replay {self.name}: {self.processed} processed, {self.failed} failed"
+
+
+class CoalescedEvent(models.Model):
+    """
+    An event held back so rapid repeats for the same entity are published
+    once; see EventCoalescer. There is at most one row per entity and event
+    type, and it is removed when the event is finally published.
+    """
+
+    event_type = models.CharField(max_length=100)
+    entity_id = models.CharField(max_length=100)
+    payload = models.JSONField()
+    coalesced = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    due_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event_type', 'entity_id'], name='unique_coalesced_event'),
+        ]
+        indexes = [
+            models.Index(fields=['due_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} for {self.entity_id} ({self.coalesced} coalesced)"
@@ -0,0 +1,162 @@
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Union, Dict, Callable, List
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django_q.tasks import async_task
+
+from apps.event_hub.models import EventLog
+from .django_q import TASK_HOOK, DjangoQBackend
+
+logger = logging.getLogger(__name__)
+
+
+def process_event_batch(events: List[Dict]) -> None:
+    """Worker side of a flushed batch: run each event's listeners in publish order"""
+    from apps.event_hub.services.event_bus import process_event_task
+
+    logger.info(f"Processing batch of {len(events)} events")
+    for event in events:
+        process_event_task(event['event_type'], {
+            'event_id': event['event_id'],
+            'created_at': event.get('created_at'),
+            'payload': event['payload'],
+            'listener_paths': event['listener_paths']
+        })
+
+
+class BatchedDjangoQBackend(DjangoQBackend):
+    """
+    Django-Q backend that buffers published events instead of enqueueing each one.
+
+    Events published inside a transaction join the buffer when the outermost
+    transaction commits, and are dropped if it, or the savepoint they were
+    published in, rolls back. Events published
+    during a request or a batch() block are flushed when it ends; anything else
+    is flushed straight away. A flush writes every buffered EventLog row with one
+    bulk_create and enqueues a single Django-Q task for the whole batch.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self.max_batch_size = settings.EVENT_BUS.get('BATCH_SIZE', 500)
+        request_started.connect(self._request_started, dispatch_uid=f'event_bus_batch_start_{id(self)}', weak=False)
+        request_finished.connect(self._request_finished, dispatch_uid=f'event_bus_batch_flush_{id(self)}', weak=False)
+
+    @property
+    def _state(self) -> threading.local:
+        """Per-thread buffer, so concurrent requests never flush each other's events"""
+        if not hasattr(self._local, 'buffer'):
+            self._local.buffer = []
+            self._local.batch_id = uuid.uuid4().hex
+            self._local.deferring = False
+            self._local.commit_hook = None
+        return self._local
+
+    def enqueue_task(self, listener: Union[str, Callable], event_data: Dict, event_type: str) -> str:
+        """Buffers an event; returns the id of the batch it will be flushed with"""
+        # bulk_create skips EventLog.save, so validate up front as the per-event path does
+        EventLog(event_type=event_type, payload=event_data['payload']).clean()
+        event = {
+            'event_type': event_type,
+            'payload': event_data['payload'],
+            'listener_paths': event_data['listener_paths']
+        }
+        state = self._state
+        connection = transaction.get_connection()
+        if connection.in_atomic_block:
+            self._pending_events(connection).append(event)
+        else:
+            self._add([event])
+        return state.batch_id
+
+    def _pending_events(self, connection) -> List[Dict]:
+        """Events waiting for the current transaction or savepoint to commit"""
+        hook = self._state.commit_hook
+        savepoint_ids = list(connection.savepoint_ids)
+        # Only the newest queued hook, registered at this savepoint depth, can
+        # take more events. Django discards a hook registered inside a savepoint
+        # when the savepoint rolls back, so events must not join a hook from an
+        # outer level; starting a new hook after an inner one also keeps the
+        # hooks, and so the events, in publish order.
+        if (
+            hook is None
+            or not connection.run_on_commit
+            or connection.run_on_commit[-1][1] is not hook
+            or hook.savepoint_ids != savepoint_ids
+        ):
+            events = []
+
+            def hook():
+                self._add(events)
+
+            hook.events = events
+            hook.savepoint_ids = savepoint_ids
+            self._local.commit_hook = hook
+            transaction.on_commit(hook)
+        return hook.events
+
+    def _add(self, events: List[Dict]) -> None:
+        state = self._state
+        state.buffer.extend(events)
+        if len(state.buffer) >= self.max_batch_size or not state.deferring:
+            self.flush()
+
+    def flush(self) -> str:
+        """
+        Write the buffered events and enqueue them as one task.
+
+        Returns:
+            str: Task ID, or None if there was nothing to flush
+        """
+        state = self._state
+        events = state.buffer
+        if not events:
+            return None
+
+        state.buffer = []
+        batch_id, state.batch_id = state.batch_id, uuid.uuid4().hex
+        try:
+            logs = EventLog.objects.bulk_create(
+                [EventLog(event_type=event['event_type'], payload=event['payload']) for event in events],
+                batch_size=self.max_batch_size
+            )
+            for event, log in zip(events, logs):
+                event['event_id'] = log.id
+                event['created_at'] = log.created_at.timestamp()
+
+            task_id = async_task(
+                'apps.event_hub.services.backends.batched.process_event_batch',
+                events=events,
+                hook=TASK_HOOK
+            )
+            logger.info(f"Batch {batch_id} of {len(events)} events enqueued as task {task_id}")
+            return task_id
+
+        except Exception as e:
+            logger.error(f"Error flushing event batch: {str(e)}", exc_info=True)
+            self.report_error(e, {'batch_id': batch_id, 'events': len(events)})
+            raise
+
+    @contextmanager
+    def batch(self):
+        """Buffer everything published inside the block and flush it as one batch on exit"""
+        state = self._state
+        previous, state.deferring = state.deferring, True
+        try:
+            yield
+        finally:
+            state.deferring = previous
+            if not previous:
+                self.flush()
+
+    def _request_started(self, **kwargs):
+        self._state.deferring = True
+
+    def _request_finished(self, **kwargs):
+        self._state.deferring = False
+        self.flush()
@@ -14,9 +14,13 @@ import threading
 from django_q.brokers import get_broker
 from apps.event_hub.models import EventLog
 from apps.event_hub.events import EventTypes
+from apps.event_hub.services.metrics import EventMetrics
+from apps.event_hub.services.registry import resolve_listener
 
 logger = logging.getLogger(__name__)
 
+TASK_HOOK = 'apps.event_hub.services.backends.django_q.task_hook'
+
 def _create_event_log(event_data: Dict, event_type: str, parent_event_id: Optional[int] = None) -> EventLog:
     """Create an event log entry"""
     return EventLog.objects.create(
@@ -28,10 +32,7 @@ def _create_event_log(event_data: Dict, event_type: str, parent_event_id: Option
 def _execute_listener(listener: Union[str, Callable], event_data: Dict, event_type: str = None) -> Any:
     """Execute a listener function"""
     if isinstance(listener, str):
-        logger.info(f"Importing listener from path: {listener}")
-        module_path, function_name = listener.rsplit('.', 1)
-        module = __import__(module_path, fromlist=[function_name])
-        listener = getattr(module, function_name)
+        listener = resolve_listener(listener)
     
     try:
         # Add event_type to event data
@@ -59,9 +60,11 @@ class DjangoQBackend(EventBusBackend):
                 event_type=event_type,
                 data={
                     'event_id': event_log.id,
+                    'created_at': event_log.created_at.timestamp(),
                     'payload': event_data['payload'],
                     'listener_paths': event_data['listener_paths']
-                }
+                },
+                hook=TASK_HOOK
             )
             
             logger.info(f"Task enqueued with ID: {task_id} for event_log: {event_log.id}")
@@ -120,4 +123,8 @@ def task_hook(task):
         logger.info(f"Task result: {task.result}")
         # Task is automatically deleted after this
     else:
-        logger.error(f"Task failed with error: {task.result}")
\ No newline at end of file
+        logger.error(f"Task failed with error: {task.result}")
+
+    if task.started and task.stopped:
+        key = (task.kwargs or {}).get('event_type') or task.func
+        EventMetrics.observe('task', key, (task.stopped - task.started).total_seconds(), not task.success)
\ No newline at end of file
@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Union, Dict, Callable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+
+from apps.event_hub.models import EventLog
+from apps.event_hub.services.metrics import EventMetrics
+from apps.event_hub.services.registry import listener_path, resolve_listener
+from .base import EventBusBackend
+
+logger = logging.getLogger(__name__)
+
+
+class ListenerTimeout(Exception):
+    pass
+
+
+class ThreadedBackend(EventBusBackend):
+    """
+    Runs listeners inside the current process on a bounded thread pool, with no
+    broker round trip.
+
+    Each listener of an event is a separate pool job, so a failing or slow
+    listener never affects the others. Events published inside a transaction
+    are dispatched once it commits. A watchdog reports any listener still
+    running past EVENT_BUS['LISTENER_TIMEOUT']; Python threads can't be
+    killed, so an overrunning listener keeps its worker until it returns, and
+    jobs that have not started by their deadline are cancelled.
+
+    With EVENT_BUS['SYNC'] set, listeners run in the publishing thread instead,
+    which is what tests and single-node setups without a broker want.
+    """
+
+    def __init__(self):
+        config = settings.EVENT_BUS
+        self.synchronous = config.get('SYNC', False)
+        self.timeout = config.get('LISTENER_TIMEOUT', 5)
+        self.logging_enabled = config.get('LOGGING_ENABLED', True)
+        workers = config.get('THREAD_POOL_SIZE', 4)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='event-bus')
+        # Bounds queued plus running jobs; publishers block once it is used up
+        self._slots = threading.BoundedSemaphore(workers * config.get('THREAD_QUEUE_FACTOR', 25))
+        self._in_flight: Dict[Future, tuple] = {}
+        self._lock = threading.Lock()
+        self._watchdog = None
+
+    def enqueue_task(self, listener: Union[str, Callable], event_data: Dict, event_type: str) -> str:
+        """Dispatches each listener of the event; returns an id for the dispatch"""
+        task_id = uuid.uuid4().hex
+        payload = event_data['payload']
+        listeners = [resolve_listener(path) for path in event_data['listener_paths']]
+        event_id = self._log_event(payload, event_type)
+
+        if self.synchronous:
+            for listener in listeners:
+                self._run(listener, payload, event_type, event_id)
+        else:
+            transaction.on_commit(lambda: self._dispatch(listeners, payload, event_type, event_id))
+        return task_id
+
+    def execute_task_sync(self, listener: Union[str, Callable], event_data: Dict, event_type: str) -> None:
+        """Execute a single listener in the calling thread"""
+        if isinstance(listener, str):
+            listener = resolve_listener(listener)
+        return listener(event_type=event_type, payload=event_data)
+
+    def report_error(self, error: Exception, context: Dict = None) -> None:
+        """Report error to monitoring system"""
+        error_message = f"Error in threaded backend: {str(error)}"
+        error_context = {
+            "error_type": error.__class__.__name__,
+            "error_message": str(error),
+            "context": context,
+            "backend": "threaded"
+        }
+        logger.error(error_message, extra=error_context)
+
+        if hasattr(settings, 'EVENT_BUS_ERROR_CALLBACK'):
+            try:
+                error_callback = import_string(settings.EVENT_BUS_ERROR_CALLBACK)
+                error_callback(error_message, error_context)
+            except Exception:
+                logger.exception("Failed to execute error callback")
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _log_event(self, payload: Dict, event_type: str) -> Optional[int]:
+        if not self.logging_enabled:
+            return None
+        return EventLog.objects.create(event_type=event_type, payload=payload).id
+
+    def _dispatch(self, listeners, payload: Dict, event_type: str, event_id: Optional[int]) -> None:
+        self._ensure_watchdog()
+        for listener in listeners:
+            self._slots.acquire()
+            try:
+                # Held across submit so _finished can't run before the entry exists
+                with self._lock:
+                    future = self._executor.submit(self._run_in_worker, listener, payload, event_type, event_id)
+                    self._in_flight[future] = (time.monotonic() + self.timeout, listener, event_type, event_id)
+            except Exception:
+                self._slots.release()
+                raise
+            future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(future, None)
+        self._slots.release()
+
+    def _run_in_worker(self, listener: Callable, payload: Dict, event_type: str, event_id: Optional[int]) -> None:
+        try:
+            self._run(listener, payload, event_type, event_id)
+        finally:
+            close_old_connections()
+
+    def _run(self, listener: Callable, payload: Dict, event_type: str, event_id: Optional[int]) -> None:
+        started = time.monotonic()
+        try:
+            listener(event_type=event_type, payload=payload)
+        except Exception as e:
+            EventMetrics.observe('listener', listener_path(listener), time.monotonic() - started, failed=True)
+            self._record_failure(e, listener, event_type, event_id)
+            return
+
+        elapsed = time.monotonic() - started
+        EventMetrics.observe('listener', listener_path(listener), elapsed)
+        if self.synchronous and elapsed > self.timeout:
+            self._record_failure(
+                ListenerTimeout(f"{listener_path(listener)} took {elapsed:.2f}s, over its {self.timeout}s timeout"),
+                listener, event_type, event_id
+            )
+
+    def _record_failure(self, error: Exception, listener: Callable, event_type: str, event_id: Optional[int]) -> None:
+        self.report_error(error, {'listener': listener_path(listener), 'event_type': event_type, 'event_id': event_id})
+        if event_id is not None:
+            try:
+                EventLog.objects.filter(id=event_id).update(error=f"{listener_path(listener)}: {error}")
+            except Exception:
+                logger.exception("Failed to record listener error on event log")
+
+    def _ensure_watchdog(self) -> None:
+        if self._watchdog is None or not self._watchdog.is_alive():
+            with self._lock:
+                if self._watchdog is None or not self._watchdog.is_alive():
+                    self._watchdog = threading.Thread(target=self._watch, name='event-bus-watchdog', daemon=True)
+                    self._watchdog.start()
+
+    def _watch(self) -> None:
+        """Report listeners past their deadline, and cancel those that never started"""
+        interval = min(1.0, self.timeout / 2)
+        reported = set()
+        while True:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                overdue = [
+                    (future, entry) for future, entry in self._in_flight.items()
+                    if entry[0] <= now and future not in reported
+                ]
+                reported.intersection_update(self._in_flight)
+            for future, (deadline, listener, event_type, event_id) in overdue:
+                reported.add(future)
+                state = "cancelled before starting" if future.cancel() else "still running"
+                self._record_failure(
+                    ListenerTimeout(f"{listener_path(listener)} exceeded its {self.timeout}s timeout ({state})"),
+                    listener, event_type, event_id
+                )
+                close_old_connections()
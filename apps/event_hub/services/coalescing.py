@@ -0,0 +1,121 @@
+import logging
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django_q.models import Schedule
+from django_q.tasks import schedule
+
+from apps.event_hub.events import EventTypes
+from apps.event_hub.models import CoalescedEvent
+from apps.event_hub.services.metrics import EventMetrics
+
+logger = logging.getLogger(__name__)
+
+FLUSH_TASK = 'apps.event_hub.services.coalescing.flush_coalesced_events'
+
+
+def flush_coalesced_events() -> int:
+    """Django-Q entry point scheduled for the end of each coalescing window"""
+    return EventCoalescer.flush_due()
+
+
+class EventCoalescer:
+    """
+    Merges rapid repeats of an event about the same entity into one.
+
+    Events listed in EventTypes.COALESCE_KEYS are not published straight
+    away. The first one for an entity is stored as a CoalescedEvent due at
+    the end of EVENT_BUS['COALESCE_WINDOW'] seconds, and a Django-Q task is
+    scheduled for then. Repeats inside the window only replace the stored
+    payload, so listeners see the latest one. When the window closes the
+    event is published once, with coalescedCount in its payload giving how
+    many events it stands for. Delivery can lag the window by up to the
+    Django-Q scheduler's polling interval.
+    """
+
+    @staticmethod
+    def get_window() -> float:
+        return settings.EVENT_BUS.get('COALESCE_WINDOW', 0)
+
+    @staticmethod
+    def entity_id(event_type: str, payload: Dict) -> Optional[str]:
+        """Entity the event is about, or None if the event type is never coalesced"""
+        key = EventTypes.COALESCE_KEYS.get(event_type)
+        if key is None or payload.get(key) is None:
+            return None
+        return str(payload[key])
+
+    @classmethod
+    def offer(cls, event_type: str, payload: Dict) -> bool:
+        """
+        Hold the event back if it can be coalesced.
+
+        Args:
+            event_type: The event being published
+            payload: Its payload
+
+        Returns:
+            bool: True if the event was taken over and must not be published now
+        """
+        window = cls.get_window()
+        entity_id = cls.entity_id(event_type, payload)
+        if not window or entity_id is None:
+            return False
+
+        with transaction.atomic():
+            pending = CoalescedEvent.objects.select_for_update().filter(
+                event_type=event_type, entity_id=entity_id
+            ).first()
+            if pending is not None:
+                pending.payload = payload
+                pending.coalesced += 1
+                pending.save(update_fields=['payload', 'coalesced'])
+                EventMetrics.count('coalesced', event_type)
+                return True
+
+            due_at = timezone.now() + timedelta(seconds=window)
+            try:
+                with transaction.atomic():
+                    CoalescedEvent.objects.create(
+                        event_type=event_type, entity_id=entity_id, payload=payload, due_at=due_at
+                    )
+            except IntegrityError:
+                # Another publisher opened the window first; merge into theirs
+                return cls.offer(event_type, payload)
+            schedule(FLUSH_TASK, schedule_type=Schedule.ONCE, next_run=due_at)
+        return True
+
+    @classmethod
+    def flush_due(cls, now=None) -> int:
+        """
+        Publish every held event whose window has closed. Rows are claimed one
+        at a time with SKIP LOCKED, so overlapping flushes never publish twice.
+
+        Returns:
+            int: Number of events published
+        """
+        from apps.event_hub.services.factory import get_event_bus
+
+        now = now or timezone.now()
+        bus = get_event_bus()
+        published = 0
+        due_ids = list(CoalescedEvent.objects.filter(due_at__lte=now).order_by('due_at').values_list('id', flat=True))
+        for event_id in due_ids:
+            with transaction.atomic():
+                pending = CoalescedEvent.objects.select_for_update(skip_locked=True).filter(id=event_id).first()
+                if pending is None:
+                    continue
+                pending.delete()
+                bus.publish(
+                    pending.event_type,
+                    {**pending.payload, 'coalescedCount': pending.coalesced + 1},
+                    coalesce=False
+                )
+            published += 1
+            if pending.coalesced:
+                logger.info(f"Published {pending.event_type} for {pending.entity_id}, "
+                            f"coalesced from {pending.coalesced + 1} events")
+        return published
@@ -1,10 +1,13 @@
-from typing import Dict, Callable
+from typing import Dict, Callable, Mapping, Tuple
 import logging
+import time
+import uuid
 from collections import defaultdict
-import pickle
-from django.core.cache import cache
 
 from apps.event_hub.models import EventLog
+from apps.event_hub.services.coalescing import EventCoalescer
+from apps.event_hub.services.metrics import EventMetrics
+from apps.event_hub.services.registry import get_listener_registry, listener_path, resolve_listener
 
 logger = logging.getLogger(__name__)
 
@@ -13,84 +16,97 @@ def process_event_task(event_type: str, data: Dict) -> None:
     logger.info(f"Processing event {event_type}")
     payload = data['payload']
     listener_paths = data['listener_paths']
-    
+    if data.get('created_at') is not None:
+        EventMetrics.observe('queue_lag', event_type, time.time() - data['created_at'])
+
+    event_started = time.perf_counter()
+    event_failed = False
     for path in listener_paths:
+        started = time.perf_counter()
+        failed = False
         try:
-            logger.info(f"Importing listener from path: {path}")
-            module_path, function_name = path.rsplit('.', 1)
-            module = __import__(module_path, fromlist=[function_name])
-            listener = getattr(module, function_name)
-            
+            listener = resolve_listener(path)
             logger.info(f"Executing listener: {listener}")
             listener(event_type=event_type, payload=payload)
         except Exception as e:
+            failed = event_failed = True
             logger.error(f"Error executing listener {path}: {e}", exc_info=True)
+        EventMetrics.observe('listener', path, time.perf_counter() - started, failed)
+    EventMetrics.observe('process', event_type, time.perf_counter() - event_started, event_failed)
 
 class EventBus:
     """
     Event bus implementation that delegates to a configured backend.
+
+    Listeners come from the process-wide registry (see registry.py), so
+    publishing never touches the cache or imports anything.
     """
-    def __init__(self, backend):
+    def __init__(self, backend, registry: Mapping[str, Tuple[Callable, ...]] = None):
         self.backend = backend  # Store the backend instance
+        self.registry = get_listener_registry() if registry is None else registry
+        # Listeners registered at runtime on this bus only, on top of the registry
         self.listeners: Dict[str, set[Callable]] = defaultdict(set)
-        # Try to load listeners from cache
-        self._load_listeners()
+        self._listener_paths: Dict[str, list[str]] = {}
 
     def register_listener(self, event_type: str, listener: Callable) -> None:
         """
-        Register a listener for a specific event type.
+        Register an extra listener on this bus instance. Prefer declaring
+        listeners with @listens_to so every process sees them.
 
         Args:
             event_type: The type of event to listen for.
             listener: Function to execute when the event occurs.
         """
-        if listener not in self.listeners[event_type]:
+        if listener not in self.registry.get(event_type, ()) and listener not in self.listeners[event_type]:
             self.listeners[event_type].add(listener)
-            # Store the listener's import path instead of the callable
-            listener_path = f"{listener.__module__}.{listener.__name__}"
-            cached_listeners = cache.get('event_bus_listeners', {})
-            if event_type not in cached_listeners:
-                cached_listeners[event_type] = set()
-            cached_listeners[event_type].add(listener_path)
-            cache.set('event_bus_listeners', cached_listeners)
-            logger.debug(f"Registered listener {listener_path} for event {event_type}")
-
-    def _load_listeners(self):
-        """Load listeners from cache"""
-        cached_listeners = cache.get('event_bus_listeners', {})
-        for event_type, listener_paths in cached_listeners.items():
-            for path in listener_paths:
-                try:
-                    module_path, function_name = path.rsplit('.', 1)
-                    module = __import__(module_path, fromlist=[function_name])
-                    listener = getattr(module, function_name)
-                    self.listeners[event_type].add(listener)
-                    logger.debug(f"Loaded listener {path} for event {event_type}")
-                except Exception as e:
-                    logger.error(f"Failed to load listener {path}: {e}")
-
-    def publish(self, event_type: str, payload: Dict) -> None:
+            self._listener_paths.pop(event_type, None)
+            logger.debug(f"Registered listener {listener_path(listener)} for event {event_type}")
+
+    def get_listener_paths(self, event_type: str) -> list[str]:
+        """Dotted paths of every listener for an event type, computed once per type"""
+        paths = self._listener_paths.get(event_type)
+        if paths is None:
+            listeners = list(self.registry.get(event_type, ())) + list(self.listeners.get(event_type, ()))
+            paths = self._listener_paths[event_type] = [listener_path(listener) for listener in listeners]
+        return paths
+
+    def publish(self, event_type: str, payload: Dict, coalesce: bool = True) -> None:
+        """
+        Hand an event to the backend for its listeners.
+
+        Every published payload carries an idempotencyKey, kept when the
+        caller supplies one, that listeners can use to make redelivery of the
+        same event harmless.
+
+        Args:
+            event_type: The EventTypes value being published
+            payload: Event data for the listeners
+            coalesce: Let EventCoalescer hold back and merge rapid repeats
+        """
         logger.info(f"Publishing event {event_type}")
-        if event_type not in self.listeners:
-            logger.warning(f"No listeners registered for event type: {event_type}")
-            return
-        
-        # Get the import paths for all listeners
-        listener_paths = [
-            f"{listener.__module__}.{listener.__name__}"
-            for listener in self.listeners[event_type]
-        ]
-        
-        logger.info(f"Enqueueing task with listener paths: {listener_paths}")
-        
-        self.backend.enqueue_task(
-            process_event_task,  # Use the standalone function instead of self.process_event
-            {
-                'payload': payload,
-                'listener_paths': listener_paths
-            },
-            event_type
-        )
+        with EventMetrics.timer('publish', event_type):
+            listener_paths = self.get_listener_paths(event_type)
+            if not listener_paths:
+                logger.warning(f"No listeners registered for event type: {event_type}")
+                return
+            if coalesce and EventCoalescer.offer(event_type, payload):
+                logger.info(f"Holding back {event_type} to coalesce repeats")
+                return
+
+            if not payload.get('idempotencyKey'):
+                payload = {**payload, 'idempotencyKey': uuid.uuid4().hex}
+
+            logger.info(f"Enqueueing task with listener paths: {listener_paths}")
+
+            with EventMetrics.timer('enqueue', event_type):
+                self.backend.enqueue_task(
+                    process_event_task,  # Use the standalone function instead of self.process_event
+                    {
+                        'payload': payload,
+                        'listener_paths': listener_paths
+                    },
+                    event_type
+                )
 
     def execute_task_sync(self, listener: Callable, payload: Dict, event_type: str) -> None:
         """
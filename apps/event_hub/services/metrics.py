@@ -0,0 +1,206 @@
+"""
+Latency and throughput metrics for the event pipeline.
+
+Every measurement belongs to a series, named by a stage and a key:
+
+    publish    event type   EventBus.publish, including the backend enqueue
+    enqueue    event type   backend.enqueue_task alone
+    queue_lag  event type   EventLog.created_at to the start of its listeners
+    process    event type   all listeners of one event; failed if any listener failed
+    listener   path         one listener run
+    task       event type   a Django-Q task end to end, reported by task_hook;
+                            batched tasks are keyed by their function
+    coalesced  event type   events merged into a later one by EventCoalescer;
+                            a count only, with no latency
+
+Each series counts runs and failures and keeps a fixed-bucket latency
+histogram. Measurements are aggregated in process and added to the Django
+cache at most every EVENT_BUS['METRICS_FLUSH_INTERVAL'] seconds, so the hot
+path never waits on the cache. With a cache shared between processes (Redis,
+Memcached, database) the totals cover the web and worker processes alike; with
+the local-memory cache each process only sees its own.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('publish', 'enqueue', 'queue_lag', 'process', 'listener', 'task', 'coalesced')
+
+# Upper bounds of the histogram buckets in milliseconds; the last bucket is unbounded
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+
+KEY_PREFIX = 'event_hub:metrics'
+INDEX_KEY = f'{KEY_PREFIX}:index'
+
+# count, failures, total microseconds, then one count per bucket plus the overflow bucket
+FIELDS = ('count', 'failures', 'sum_us') + tuple(f'b{i}' for i in range(len(BUCKETS_MS) + 1))
+
+
+def _bucket(milliseconds: float) -> int:
+    for i, bound in enumerate(BUCKETS_MS):
+        if milliseconds <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+class EventMetrics:
+    """Process-wide recorder; use the class methods directly"""
+
+    _lock = threading.Lock()
+    _pending: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0] * len(FIELDS))
+    _last_flush = time.monotonic()
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.EVENT_BUS.get('METRICS_ENABLED', True)
+
+    @classmethod
+    def observe(cls, stage: str, key: str, seconds: float, failed: bool = False) -> None:
+        """
+        Record one measurement.
+
+        Args:
+            stage: One of STAGES
+            key: Event type or listener path
+            seconds: Duration of the measured step
+            failed: Whether the step failed
+        """
+        if not cls.enabled():
+            return
+        milliseconds = max(seconds, 0) * 1000
+        with cls._lock:
+            series = cls._pending[(stage, key)]
+            series[0] += 1
+            series[1] += failed
+            series[2] += int(milliseconds * 1000)
+            series[3 + _bucket(milliseconds)] += 1
+            due = time.monotonic() - cls._last_flush >= settings.EVENT_BUS.get('METRICS_FLUSH_INTERVAL', 5)
+        if due:
+            cls.flush()
+
+    @classmethod
+    def count(cls, stage: str, key: str, amount: int = 1) -> None:
+        """Add to a series' count without recording a latency"""
+        if not cls.enabled():
+            return
+        with cls._lock:
+            cls._pending[(stage, key)][0] += amount
+
+    @classmethod
+    @contextmanager
+    def timer(cls, stage: str, key: str):
+        """Time the block; an exception escaping it counts as a failure"""
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            cls.observe(stage, key, time.perf_counter() - started, failed)
+
+    @classmethod
+    def flush(cls) -> None:
+        """Add the measurements aggregated in this process to the shared totals"""
+        with cls._lock:
+            pending = dict(cls._pending)
+            cls._pending.clear()
+            cls._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        try:
+            index = cache.get(INDEX_KEY) or []
+            names = [f'{stage}|{key}' for stage, key in pending]
+            missing = [name for name in names if name not in index]
+            if missing:
+                # Read-modify-write; a name lost to a concurrent flush is re-added on the next one
+                cache.set(INDEX_KEY, index + missing, timeout=None)
+            for (stage, key), values in pending.items():
+                for field, value in zip(FIELDS, values):
+                    if value:
+                        cls._incr(f'{KEY_PREFIX}:{stage}:{key}:{field}', value)
+        except Exception as e:
+            logger.warning(f"Could not flush event metrics: {e}")
+
+    @staticmethod
+    def _incr(key: str, value: int) -> None:
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            if not cache.add(key, value, timeout=None):
+                cache.incr(key, value)
+
+    @classmethod
+    def snapshot(cls, stage: Optional[str] = None) -> Dict[str, Dict[str, Dict]]:
+        """
+        Current totals with rates and latency percentiles.
+
+        Args:
+            stage: Only return this stage
+
+        Returns:
+            {stage: {key: {count, failures, failure_rate, avg_ms, p50_ms, p95_ms, p99_ms, buckets}}}
+            Percentiles are the upper bound of the bucket they fall in, or None
+            past the last bound.
+        """
+        cls.flush()
+        index = [name.split('|', 1) for name in cache.get(INDEX_KEY) or []]
+        index = [(s, key) for s, key in index if stage is None or s == stage]
+        keys = [f'{KEY_PREFIX}:{s}:{key}:{field}' for s, key in index for field in FIELDS]
+        stored = cache.get_many(keys)
+
+        result: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        for s, key in index:
+            values = [stored.get(f'{KEY_PREFIX}:{s}:{key}:{field}', 0) for field in FIELDS]
+            if values[0]:
+                result[s][key] = cls._summarise(values)
+        return dict(result)
+
+    @staticmethod
+    def _summarise(values: List[int]) -> Dict:
+        count, failures, sum_us = values[:3]
+        buckets = values[3:]
+
+        def percentile(fraction: float) -> Optional[float]:
+            seen = 0
+            for i, bucket_count in enumerate(buckets):
+                seen += bucket_count
+                if seen >= fraction * count:
+                    return BUCKETS_MS[i] if i < len(BUCKETS_MS) else None
+            return None
+
+        return {
+            'count': count,
+            'failures': failures,
+            'failure_rate': round(failures / count, 4),
+            'avg_ms': round(sum_us / count / 1000, 3),
+            'p50_ms': percentile(0.5),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'buckets': {
+                (f'le_{bound}' if i < len(BUCKETS_MS) else 'inf'): bucket_count
+                for i, (bound, bucket_count) in enumerate(zip(BUCKETS_MS + (None,), buckets))
+                if bucket_count
+            },
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """Discard both the pending and the shared totals"""
+        with cls._lock:
+            cls._pending.clear()
+        names = cache.get(INDEX_KEY) or []
+        cache.delete_many([
+            f'{KEY_PREFIX}:{stage}:{key}:{field}'
+            for stage, key in (name.split('|', 1) for name in names)
+            for field in FIELDS
+        ])
+        cache.delete(INDEX_KEY)
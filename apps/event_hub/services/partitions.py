@@ -0,0 +1,198 @@
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# pg_get_expr output for a range partition: FOR VALUES FROM ('...') TO ('...')
+BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: date
+    end: date
+
+
+class EventLogPartitionService:
+    """
+    Manages the range partitions of the event_hub_eventlog table, which is
+    partitioned by created_at (see migration 0011).
+
+    Partitions are named event_hub_eventlog_pYYYYMMDD after the first day they
+    hold and cover one EVENT_LOG_PARTITION_INTERVAL ('day', 'week' or
+    'month'). Retention drops whole partitions once everything in them is
+    older than EVENT_LOG_RETENTION_DAYS, instead of deleting rows.
+    """
+
+    TABLE = 'event_hub_eventlog'
+    DEFAULT_PARTITION = f'{TABLE}_default'
+    INTERVALS = ('day', 'week', 'month')
+
+    @staticmethod
+    def get_interval() -> str:
+        interval = getattr(settings, 'EVENT_LOG_PARTITION_INTERVAL', 'week')
+        if interval not in EventLogPartitionService.INTERVALS:
+            raise ValueError(f"EVENT_LOG_PARTITION_INTERVAL must be one of {EventLogPartitionService.INTERVALS}")
+        return interval
+
+    @staticmethod
+    def is_partitioned() -> bool:
+        if connection.vendor != 'postgresql':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s",
+                [EventLogPartitionService.TABLE]
+            )
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def period_start(day: date, interval: str) -> date:
+        """First day of the partition period containing day"""
+        if interval == 'month':
+            return day.replace(day=1)
+        if interval == 'week':
+            return day - timedelta(days=day.weekday())
+        return day
+
+    @staticmethod
+    def next_period(start: date, interval: str) -> date:
+        if interval == 'month':
+            return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        if interval == 'week':
+            return start + timedelta(days=7)
+        return start + timedelta(days=1)
+
+    @staticmethod
+    def partition_name(start: date) -> str:
+        return f"{EventLogPartitionService.TABLE}_p{start:%Y%m%d}"
+
+    @staticmethod
+    def list_partitions() -> List[Partition]:
+        """Range partitions of the table with their bounds as Postgres records them, oldest first"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+                """,
+                [EventLogPartitionService.TABLE]
+            )
+            rows = cursor.fetchall()
+
+        partitions = []
+        for name, bound in rows:
+            match = BOUND_PATTERN.search(bound or '')
+            if match is None:  # the DEFAULT partition
+                continue
+            start, end = (
+                datetime.fromisoformat(value).astimezone(dt_timezone.utc).date() for value in match.groups()
+            )
+            partitions.append(Partition(name, start, end))
+        return sorted(partitions, key=lambda partition: partition.start)
+
+    @staticmethod
+    def create_partition(start: date, end: date, cursor=None) -> Partition:
+        """Create the partition for [start, end) unless it already exists"""
+        name = EventLogPartitionService.partition_name(start)
+        sql = (
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{EventLogPartitionService.TABLE}" '
+            f'FOR VALUES FROM (%s) TO (%s)'
+        )
+        bounds = [
+            datetime.combine(start, time.min, tzinfo=dt_timezone.utc),
+            datetime.combine(end, time.min, tzinfo=dt_timezone.utc),
+        ]
+        if cursor is None:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, bounds)
+        else:
+            cursor.execute(sql, bounds)
+        return Partition(name, start, end)
+
+    @staticmethod
+    def ensure_partitions(ahead: int = 3, since: Optional[date] = None, dry_run: bool = False) -> List[Partition]:
+        """
+        Make sure a partition exists for every period from since (default: the
+        current one) up to ahead periods into the future.
+
+        Args:
+            ahead: Number of future periods to create
+            since: Earliest day that needs a partition
+            dry_run: Only report what would be created
+
+        Returns:
+            The partitions that were (or would be) created
+        """
+        interval = EventLogPartitionService.get_interval()
+        today = timezone.now().astimezone(dt_timezone.utc).date()
+        existing = EventLogPartitionService.list_partitions()
+
+        start = EventLogPartitionService.period_start(since or today, interval)
+        last = EventLogPartitionService.period_start(today, interval)
+        for _ in range(ahead):
+            last = EventLogPartitionService.next_period(last, interval)
+
+        created = []
+        while start <= last:
+            end = EventLogPartitionService.next_period(start, interval)
+            # Partitions of another width may already cover part of the period;
+            # only the uncovered tail is created
+            uncovered = max([start] + [p.end for p in existing if p.start <= start < p.end])
+            if uncovered < end and not any(p.start < end and uncovered < p.end for p in existing):
+                name = EventLogPartitionService.partition_name(uncovered)
+                if not dry_run:
+                    EventLogPartitionService.create_partition(uncovered, end)
+                    logger.info(f"Created event log partition {name}")
+                created.append(Partition(name, uncovered, end))
+            start = end
+        return created
+
+    @staticmethod
+    def drop_expired(retention_days: Optional[int] = None, dry_run: bool = False) -> List[Partition]:
+        """
+        Detach and drop every partition whose newest possible row is older
+        than the retention period.
+
+        Args:
+            retention_days: Defaults to EVENT_LOG_RETENTION_DAYS
+            dry_run: Only report what would be dropped
+
+        Returns:
+            The partitions that were (or would be) dropped
+        """
+        if retention_days is None:
+            retention_days = settings.EVENT_LOG_RETENTION_DAYS
+        cutoff = (timezone.now() - timedelta(days=retention_days)).astimezone(dt_timezone.utc).date()
+
+        expired = [
+            partition for partition in EventLogPartitionService.list_partitions()
+            if partition.end <= cutoff
+        ]
+        if dry_run:
+            return expired
+
+        for partition in expired:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE "{EventLogPartitionService.TABLE}" DETACH PARTITION "{partition.name}"')
+                cursor.execute(f'DROP TABLE "{partition.name}"')
+            logger.info(f"Dropped event log partition {partition.name}")
+        return expired
+
+    @staticmethod
+    def default_partition_rows() -> int:
+        """Rows that fell outside every range partition; these are never dropped by retention"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{EventLogPartitionService.DEFAULT_PARTITION}"')
+            return cursor.fetchone()[0]
@@ -0,0 +1,106 @@
+"""
+Process-wide registry of event listeners.
+
+Listeners are declared at import time, either with the ``listens_to``
+decorator or through an ``event_listeners`` mapping on an AppConfig:
+
+    class EngagementConfig(AppConfig):
+        event_listeners = {
+            EventTypes.PRODUCT_CREATED: ['apps.engagement.events.handle_product_created'],
+        }
+
+The registry is built once, after the app registry is ready, by importing each
+installed app's ``events`` module and reading the AppConfig mappings. From then
+on it is an immutable mapping of event type to a tuple of callables, so
+publishing an event is a dictionary lookup.
+"""
+import logging
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Tuple
+
+from django.apps import apps
+from django.utils.module_loading import autodiscover_modules, import_string
+
+logger = logging.getLogger(__name__)
+
+_declared: Dict[str, List[Callable]] = defaultdict(list)
+_registry: Mapping[str, Tuple[Callable, ...]] = None
+_by_path: Mapping[str, Callable] = MappingProxyType({})
+_lock = threading.Lock()
+
+
+def listens_to(*event_types: str) -> Callable:
+    """Declare the decorated function as a listener for the given event types"""
+    def decorator(listener: Callable) -> Callable:
+        for event_type in event_types:
+            if listener not in _declared[event_type]:
+                _declared[event_type].append(listener)
+        return listener
+    return decorator
+
+
+def listener_path(listener: Callable) -> str:
+    return f"{listener.__module__}.{listener.__name__}"
+
+
+def get_listener_registry() -> Mapping[str, Tuple[Callable, ...]]:
+    """The immutable event type -> listeners mapping, built on first use"""
+    if _registry is None:
+        build_listener_registry()
+    return _registry
+
+
+def build_listener_registry() -> Mapping[str, Tuple[Callable, ...]]:
+    """Discover every declared listener and freeze the result"""
+    global _registry, _by_path
+
+    with _lock:
+        if _registry is not None:
+            return _registry
+
+        apps.check_apps_ready()
+        autodiscover_modules('events')
+
+        listeners: Dict[str, List[Callable]] = defaultdict(list)
+        for event_type, declared in _declared.items():
+            listeners[event_type].extend(declared)
+        for app_config in apps.get_app_configs():
+            for event_type, paths in getattr(app_config, 'event_listeners', {}).items():
+                for path in paths:
+                    listener = import_string(path) if isinstance(path, str) else path
+                    if listener not in listeners[event_type]:
+                        listeners[event_type].append(listener)
+
+        _by_path = MappingProxyType({
+            listener_path(listener): listener
+            for event_listeners in listeners.values()
+            for listener in event_listeners
+        })
+        _registry = MappingProxyType({
+            event_type: tuple(event_listeners) for event_type, event_listeners in listeners.items()
+        })
+        logger.debug(f"Listener registry built: {sum(map(len, _registry.values()))} listeners, "
+                     f"{len(_registry)} event types")
+        return _registry
+
+
+def reset_listener_registry() -> None:
+    """Forget the built registry so the next lookup rebuilds it; for tests and benchmarks"""
+    global _registry, _by_path
+
+    with _lock:
+        _registry = None
+        _by_path = MappingProxyType({})
+    resolve_listener.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def resolve_listener(path: str) -> Callable:
+    """Callable for a dotted listener path; registered listeners need no import"""
+    listener = _by_path.get(path)
+    if listener is None:
+        listener = import_string(path)
+    return listener
@@ -0,0 +1,214 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.event_hub.models import EventLog, ReplayCheckpoint
+from apps.event_hub.services.registry import get_listener_registry, listener_path, resolve_listener
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayResult:
+    processed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    last_key: Optional[Tuple[datetime, int]] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+class EventReplayService:
+    """
+    Re-runs logged events through listeners.
+
+    Rows are streamed in (created_at, id) order with a server-side cursor, so
+    memory use depends on batch size, not on how many rows match. Batches run
+    on a thread pool, and the checkpoint only advances past batches that have
+    finished along with every batch before them. A resumed replay therefore
+    never skips events, though it can re-run up to workers * 2 batches.
+    """
+
+    MAX_ERRORS = 100
+
+    @staticmethod
+    def get_queryset(
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        event_types: Sequence[str] = (),
+        after: Optional[Tuple[datetime, int]] = None,
+    ):
+        queryset = EventLog.objects.all()
+        if since:
+            queryset = queryset.filter(created_at__gte=since)
+        if until:
+            queryset = queryset.filter(created_at__lt=until)
+        if event_types:
+            queryset = queryset.filter(event_type__in=event_types)
+        if after:
+            created_at, event_id = after
+            queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=event_id))
+        return queryset.order_by('created_at', 'id').only('id', 'event_type', 'payload', 'created_at')
+
+    @staticmethod
+    def get_listeners(
+        event_types: Sequence[str], listener_paths: Sequence[str] = ()
+    ) -> Dict[str, Tuple[Callable, ...]]:
+        """
+        Listeners to replay each event type to: the given paths for every type,
+        or by default whatever the registry has for it.
+        """
+        if listener_paths:
+            listeners = tuple(resolve_listener(path) for path in listener_paths)
+            return {event_type: listeners for event_type in event_types} if event_types else {None: listeners}
+        registry = get_listener_registry()
+        return {event_type: registry.get(event_type, ()) for event_type in (event_types or registry.keys())}
+
+    @staticmethod
+    def stream(queryset, batch_size: int) -> Iterator[List[EventLog]]:
+        """Yield lists of up to batch_size rows, reading through a server-side cursor"""
+        batch = []
+        for event in queryset.iterator(chunk_size=batch_size):
+            batch.append(event)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @classmethod
+    def replay(
+        cls,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        event_types: Sequence[str] = (),
+        listener_paths: Sequence[str] = (),
+        workers: int = 4,
+        batch_size: int = 500,
+        checkpoint_name: Optional[str] = None,
+        dry_run: bool = False,
+        progress: Optional[Callable[[ReplayResult], None]] = None,
+    ) -> ReplayResult:
+        """
+        Replay matching events.
+
+        Args:
+            since / until: created_at range, since inclusive and until exclusive
+            event_types: Only replay these types; all types if empty
+            listener_paths: Dotted listener paths to run; the registered listeners if empty
+            workers: Batches processed in parallel
+            batch_size: Rows per batch, and per round trip to the cursor
+            checkpoint_name: Save progress under this name and resume from it if it exists
+            dry_run: Read and batch the events without running any listener, to measure
+                throughput; checkpoints are neither read nor written
+            progress: Called with the running totals after each checkpointed batch
+
+        Returns:
+            ReplayResult totals for this run
+        """
+        event_types = list(event_types)
+        listeners = cls.get_listeners(event_types, listener_paths)
+        checkpoint = None
+        if checkpoint_name and not dry_run:
+            checkpoint = cls._get_checkpoint(checkpoint_name, since, until, event_types, listener_paths)
+        after = None
+        if checkpoint and checkpoint.last_event_id is not None:
+            after = (checkpoint.last_created_at, checkpoint.last_event_id)
+            logger.info(f"Resuming replay {checkpoint_name} after event {checkpoint.last_event_id}")
+
+        queryset = cls.get_queryset(since, until, event_types, after)
+        result = ReplayResult()
+        started = time.perf_counter()
+        pending: Deque[Tuple[Future, Tuple[datetime, int]]] = deque()
+
+        def settle(block: bool) -> None:
+            # Only the oldest unfinished batch may move the checkpoint forward
+            while pending and (block or pending[0][0].done()):
+                future, last_key = pending.popleft()
+                processed, failed, errors = future.result()
+                result.processed += processed
+                result.failed += failed
+                result.last_key = last_key
+                result.errors.extend(errors[:cls.MAX_ERRORS - len(result.errors)])
+                result.elapsed = time.perf_counter() - started
+                cls._save_checkpoint(checkpoint, processed, failed, last_key)
+                if progress:
+                    progress(result)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='event-replay') as executor:
+            for batch in cls.stream(queryset, batch_size):
+                last_key = (batch[-1].created_at, batch[-1].id)
+                pending.append((executor.submit(cls._run_batch, batch, listeners, dry_run), last_key))
+                settle(block=False)
+                while len(pending) >= workers * 2:
+                    pending[0][0].result()
+                    settle(block=False)
+            settle(block=True)
+
+        result.elapsed = time.perf_counter() - started
+        if checkpoint:
+            checkpoint.completed_at = timezone.now()
+            checkpoint.save(update_fields=['completed_at', 'updated_at'])
+        return result
+
+    @staticmethod
+    def _run_batch(batch: List[EventLog], listeners: Dict, dry_run: bool) -> Tuple[int, int, List[str]]:
+        if dry_run:
+            return len(batch), 0, []
+
+        failed = 0
+        errors = []
+        fallback = listeners.get(None, ())
+        try:
+            for event in batch:
+                event_failed = False
+                for listener in listeners.get(event.event_type, fallback):
+                    try:
+                        listener(event_type=event.event_type, payload=event.payload)
+                    except Exception as e:
+                        event_failed = True
+                        errors.append(f"event {event.id}: {listener_path(listener)}: {e}")
+                        logger.error(f"Replay of event {event.id} failed in {listener_path(listener)}: {e}")
+                failed += event_failed
+        finally:
+            # Each pool thread has its own connection; don't leave them open
+            connections.close_all()
+        return len(batch), failed, errors
+
+    @staticmethod
+    def _get_checkpoint(name, since, until, event_types, listener_paths) -> ReplayCheckpoint:
+        filters = {
+            'since': since.isoformat() if since else None,
+            'until': until.isoformat() if until else None,
+            'event_types': sorted(event_types),
+        }
+        checkpoint, created = ReplayCheckpoint.objects.get_or_create(
+            name=name,
+            defaults={'filters': filters, 'listener_paths': list(listener_paths)}
+        )
+        if not created and (checkpoint.filters != filters or checkpoint.listener_paths != list(listener_paths)):
+            raise ValueError(
+                f"Replay checkpoint {name} was started with different filters or listeners: "
+                f"{checkpoint.filters} {checkpoint.listener_paths}"
+            )
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint: Optional[ReplayCheckpoint], processed: int, failed: int, last_key) -> None:
+        if checkpoint is None:
+            return
+        checkpoint.processed += processed
+        checkpoint.failed += failed
+        checkpoint.last_created_at, checkpoint.last_event_id = last_key
+        checkpoint.save(update_fields=['processed', 'failed', 'last_created_at', 'last_event_id', 'updated_at'])
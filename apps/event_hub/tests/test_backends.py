@@ -0,0 +1,115 @@
+import pytest
+from django.db import transaction
+
+from apps.event_hub.events import EventTypes
+from apps.event_hub.models import EventLog
+from apps.event_hub.services.backends.batched import BatchedDjangoQBackend
+from apps.event_hub.services.backends.threaded import ThreadedBackend
+from apps.event_hub.services.event_bus import EventBus
+
+
+def listener(event_type=None, payload=None):
+    return True
+
+
+@pytest.fixture
+def bus():
+    bus = EventBus(BatchedDjangoQBackend())
+    bus.listeners[EventTypes.TEST_EVENT] = {listener}
+    return bus
+
+
+@pytest.mark.django_db
+class TestBatchedDjangoQBackend:
+    def test_batch_is_written_and_enqueued_once(self, bus, mocker, django_capture_on_commit_callbacks):
+        async_task = mocker.patch('apps.event_hub.services.backends.batched.async_task', return_value='task-1')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with bus.backend.batch():
+                for i in range(3):
+                    bus.publish(EventTypes.TEST_EVENT, {'sequence': i})
+                assert not async_task.called
+
+        async_task.assert_called_once()
+        events = async_task.call_args.kwargs['events']
+        assert [event['payload']['sequence'] for event in events] == [0, 1, 2]
+        assert set(EventLog.objects.values_list('id', flat=True)) == {event['event_id'] for event in events}
+
+    def test_events_from_rolled_back_transaction_are_dropped(self, bus, mocker, django_capture_on_commit_callbacks):
+        async_task = mocker.patch('apps.event_hub.services.backends.batched.async_task', return_value='task-1')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    bus.publish(EventTypes.TEST_EVENT, {'sequence': 'rolled back'})
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            bus.publish(EventTypes.TEST_EVENT, {'sequence': 'kept'})
+
+        events = async_task.call_args.kwargs['events']
+        assert [event['payload']['sequence'] for event in events] == ['kept']
+
+    def test_events_from_rolled_back_savepoint_are_dropped(self, bus, mocker, django_capture_on_commit_callbacks):
+        async_task = mocker.patch('apps.event_hub.services.backends.batched.async_task', return_value='task-1')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                bus.publish(EventTypes.TEST_EVENT, {'sequence': 'outer'})
+                try:
+                    with transaction.atomic():
+                        bus.publish(EventTypes.TEST_EVENT, {'sequence': 'inner rolled back'})
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                with transaction.atomic():
+                    bus.publish(EventTypes.TEST_EVENT, {'sequence': 'inner'})
+                bus.publish(EventTypes.TEST_EVENT, {'sequence': 'outer again'})
+
+        sequences = [
+            event['payload']['sequence'] for call in async_task.call_args_list for event in call.kwargs['events']
+        ]
+        assert sequences == ['outer', 'inner', 'outer again']
+
+
+calls = []
+
+
+def failing_listener(event_type=None, payload=None):
+    raise ValueError("boom")
+
+
+def recording_listener(event_type=None, payload=None):
+    calls.append(payload['sequence'])
+
+
+@pytest.mark.django_db
+class TestThreadedBackend:
+    @pytest.fixture(autouse=True)
+    def reset_calls(self):
+        calls.clear()
+
+    def make_bus(self, settings, **config):
+        settings.EVENT_BUS = {**settings.EVENT_BUS, **config}
+        bus = EventBus(ThreadedBackend())
+        bus.listeners[EventTypes.TEST_EVENT] = {failing_listener, recording_listener}
+        return bus
+
+    def test_failing_listener_does_not_stop_the_others(self, settings):
+        bus = self.make_bus(settings, SYNC=True)
+
+        bus.publish(EventTypes.TEST_EVENT, {'sequence': 1})
+
+        assert calls == [1]
+        assert "boom" in EventLog.objects.get().error
+
+    def test_listeners_run_on_the_pool_after_commit(self, settings, django_capture_on_commit_callbacks):
+        bus = self.make_bus(settings, SYNC=False, LOGGING_ENABLED=False)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for i in range(5):
+                bus.publish(EventTypes.TEST_EVENT, {'sequence': i})
+            assert calls == []
+        bus.backend.shutdown()
+
+        assert sorted(calls) == [0, 1, 2, 3, 4]
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.event_hub.events import EventTypes
+from apps.event_hub.models import CoalescedEvent
+from apps.event_hub.services.coalescing import EventCoalescer
+from apps.event_hub.services.event_bus import EventBus
+from apps.event_hub.services.metrics import EventMetrics
+
+
+def product_listener(event_type=None, payload=None):
+    return True
+
+
+@pytest.fixture
+def bus(mocker):
+    bus = EventBus(mocker.Mock(), registry={
+        EventTypes.PRODUCT_UPDATED: (product_listener,),
+        EventTypes.PRODUCT_CREATED: (product_listener,),
+    })
+    mocker.patch('apps.event_hub.services.factory.get_event_bus', return_value=bus)
+    return bus
+
+
+@pytest.mark.django_db
+@override_settings(EVENT_BUS={'COALESCE_WINDOW': 30})
+def test_rapid_updates_are_published_once_with_the_latest_payload(bus, mocker):
+    schedule = mocker.patch('apps.event_hub.services.coalescing.schedule')
+    EventMetrics.reset()
+
+    for name in ("one", "two", "three"):
+        bus.publish(EventTypes.PRODUCT_UPDATED, {'productId': 7, 'name': name})
+    bus.publish(EventTypes.PRODUCT_CREATED, {'productId': 7})
+
+    assert schedule.call_count == 1
+    assert CoalescedEvent.objects.get().coalesced == 2
+    assert [call.args[2] for call in bus.backend.enqueue_task.call_args_list] == [EventTypes.PRODUCT_CREATED]
+    assert EventMetrics.snapshot('coalesced')['coalesced'][EventTypes.PRODUCT_UPDATED]['count'] == 2
+
+    assert EventCoalescer.flush_due() == 0
+    assert EventCoalescer.flush_due(now=timezone.now() + timedelta(seconds=31)) == 1
+
+    payload = bus.backend.enqueue_task.call_args.args[1]['payload']
+    assert payload['name'] == "three"
+    assert payload['coalescedCount'] == 3
+    assert payload['idempotencyKey']
+    assert not CoalescedEvent.objects.exists()
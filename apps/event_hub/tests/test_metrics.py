@@ -0,0 +1,80 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.event_hub.events import EventTypes
+from apps.event_hub.services import event_bus
+from apps.event_hub.services.event_bus import EventBus
+from apps.event_hub.services.metrics import EventMetrics
+
+
+def failing_listener(event_type=None, payload=None):
+    raise RuntimeError("boom")
+
+
+def passing_listener(event_type=None, payload=None):
+    return True
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    EventMetrics.reset()
+    yield EventMetrics
+    EventMetrics.reset()
+
+
+def test_observations_are_summarised_per_series():
+    for seconds in (0.0005, 0.003, 0.003, 0.2):
+        EventMetrics.observe('listener', 'some.listener', seconds)
+    EventMetrics.observe('listener', 'some.listener', 0.004, failed=True)
+
+    stats = EventMetrics.snapshot('listener')['listener']['some.listener']
+
+    assert stats['count'] == 5
+    assert stats['failures'] == 1
+    assert stats['failure_rate'] == 0.2
+    assert stats['p50_ms'] == 5
+    assert stats['p99_ms'] == 250
+    assert stats['buckets'] == {'le_1': 1, 'le_5': 3, 'le_250': 1}
+
+
+def test_hot_path_waits_for_the_flush_interval(mocker):
+    incr = mocker.patch('django.core.cache.cache.incr')
+    with override_settings(EVENT_BUS={'METRICS_FLUSH_INTERVAL': 60}):
+        EventMetrics.flush()
+        EventMetrics.observe('publish', EventTypes.TEST_EVENT, 0.001)
+    incr.assert_not_called()
+
+
+def test_pipeline_records_publish_listener_and_queue_lag(mocker):
+    bus = EventBus(mocker.Mock(), registry={EventTypes.TEST_EVENT: (passing_listener, failing_listener)})
+    bus.publish(EventTypes.TEST_EVENT, {})
+    event_bus.process_event_task(EventTypes.TEST_EVENT, {
+        'created_at': 0,
+        'payload': {},
+        'listener_paths': bus.get_listener_paths(EventTypes.TEST_EVENT),
+    })
+
+    snapshot = EventMetrics.snapshot()
+
+    assert snapshot['publish'][EventTypes.TEST_EVENT]['count'] == 1
+    assert snapshot['enqueue'][EventTypes.TEST_EVENT]['count'] == 1
+    assert snapshot['process'][EventTypes.TEST_EVENT]['failures'] == 1
+    assert snapshot['queue_lag'][EventTypes.TEST_EVENT]['p50_ms'] is None
+    listeners = snapshot['listener']
+    assert listeners[f'{__name__}.passing_listener']['failures'] == 0
+    assert listeners[f'{__name__}.failing_listener']['failure_rate'] == 1.0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_staff_only(client, django_user_model):
+    EventMetrics.observe('publish', EventTypes.TEST_EVENT, 0.001)
+    user = django_user_model.objects.create_user(username='ops', password='secret')
+    client.force_login(user)
+    assert client.get(reverse('event_hub_metrics')).status_code == 403
+
+    user.is_staff = True
+    user.save()
+    response = client.get(reverse('event_hub_metrics'), {'stage': 'publish'})
+    assert response.status_code == 200
+    assert response.json()['publish'][EventTypes.TEST_EVENT]['count'] == 1
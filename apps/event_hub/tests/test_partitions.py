@@ -0,0 +1,37 @@
+from datetime import date, datetime, timezone
+
+from apps.event_hub.services.partitions import EventLogPartitionService, Partition
+
+
+def test_ensure_partitions_fills_gaps_without_overlapping(settings, mocker):
+    settings.EVENT_LOG_PARTITION_INTERVAL = 'week'
+    mocker.patch('apps.event_hub.services.partitions.timezone.now',
+                 return_value=datetime(2026, 10, 14, 12, tzinfo=timezone.utc))
+    # Monthly partitions were used before switching to weekly ones
+    mocker.patch.object(EventLogPartitionService, 'list_partitions', return_value=[
+        Partition('event_hub_eventlog_p20260901', date(2026, 9, 1), date(2026, 10, 1)),
+        Partition('event_hub_eventlog_p20261012', date(2026, 10, 12), date(2026, 10, 19)),
+    ])
+
+    created = EventLogPartitionService.ensure_partitions(ahead=2, since=date(2026, 9, 28), dry_run=True)
+
+    assert [(p.start, p.end) for p in created] == [
+        (date(2026, 10, 1), date(2026, 10, 5)),
+        (date(2026, 10, 5), date(2026, 10, 12)),
+        (date(2026, 10, 19), date(2026, 10, 26)),
+        (date(2026, 10, 26), date(2026, 11, 2)),
+    ]
+
+
+def test_only_partitions_wholly_past_retention_are_dropped(mocker):
+    mocker.patch('apps.event_hub.services.partitions.timezone.now',
+                 return_value=datetime(2026, 10, 14, 12, tzinfo=timezone.utc))
+    mocker.patch.object(EventLogPartitionService, 'list_partitions', return_value=[
+        Partition('event_hub_eventlog_p20260831', date(2026, 8, 31), date(2026, 9, 7)),
+        Partition('event_hub_eventlog_p20260907', date(2026, 9, 7), date(2026, 9, 14)),
+        Partition('event_hub_eventlog_p20260914', date(2026, 9, 14), date(2026, 9, 21)),
+    ])
+
+    expired = EventLogPartitionService.drop_expired(retention_days=30, dry_run=True)
+
+    assert [p.name for p in expired] == ['event_hub_eventlog_p20260831', 'event_hub_eventlog_p20260907']
@@ -0,0 +1,43 @@
+import pytest
+
+from apps.engagement.events import handle_product_created
+from apps.event_hub.events import EventTypes
+from apps.event_hub.services import registry
+from apps.event_hub.services.event_bus import EventBus
+
+
+def declared_listener(event_type=None, payload=None):
+    return True
+
+
+@pytest.fixture
+def fresh_registry(mocker):
+    mocker.patch.dict(registry._declared, {})
+    registry.reset_listener_registry()
+    yield
+    registry.reset_listener_registry()
+
+
+def test_registry_collects_declared_listeners_and_is_read_only(fresh_registry):
+    registry.listens_to(EventTypes.TEST_EVENT)(declared_listener)
+
+    listeners = registry.get_listener_registry()
+
+    assert listeners[EventTypes.TEST_EVENT] == (declared_listener,)
+    assert listeners[EventTypes.PRODUCT_CREATED] == (handle_product_created,)
+    with pytest.raises(TypeError):
+        listeners[EventTypes.TEST_EVENT] = ()
+    assert registry.resolve_listener(registry.listener_path(declared_listener)) is declared_listener
+
+
+def test_publish_does_not_touch_the_cache(fresh_registry, mocker):
+    registry.listens_to(EventTypes.TEST_EVENT)(declared_listener)
+    backend = mocker.Mock()
+    bus = EventBus(backend)
+    cache_get = mocker.patch('django.core.cache.cache.get')
+    import_module = mocker.patch('builtins.__import__')
+
+    bus.publish(EventTypes.TEST_EVENT, {'sequence': 1})
+
+    assert not cache_get.called and not import_module.called
+    assert backend.enqueue_task.call_args.args[1]['listener_paths'] == [registry.listener_path(declared_listener)]
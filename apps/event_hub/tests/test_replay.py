@@ -0,0 +1,55 @@
+import pytest
+
+from apps.event_hub.events import EventTypes
+from apps.event_hub.models import EventLog, ReplayCheckpoint
+from apps.event_hub.services.replay import EventReplayService
+
+replayed = []
+
+
+def recording_listener(event_type=None, payload=None):
+    if payload['sequence'] == 3:
+        raise ValueError("bad event")
+    replayed.append(payload['sequence'])
+
+
+LISTENER = f"{__name__}.recording_listener"
+
+
+@pytest.mark.django_db
+class TestEventReplayService:
+    @pytest.fixture(autouse=True)
+    def events(self):
+        replayed.clear()
+        return [
+            EventLog.objects.create(event_type=EventTypes.TEST_EVENT, payload={'sequence': i})
+            for i in range(7)
+        ]
+
+    def test_replay_resumes_from_checkpoint(self):
+        result = EventReplayService.replay(
+            listener_paths=[LISTENER], workers=2, batch_size=3, checkpoint_name='listener-fix'
+        )
+
+        assert (result.processed, result.failed) == (7, 1)
+        assert sorted(replayed) == [0, 1, 2, 4, 5, 6]
+        assert "bad event" in result.errors[0]
+
+        replayed.clear()
+        EventLog.objects.create(event_type=EventTypes.TEST_EVENT, payload={'sequence': 7})
+        result = EventReplayService.replay(
+            listener_paths=[LISTENER], workers=2, batch_size=3, checkpoint_name='listener-fix'
+        )
+
+        assert replayed == [7]
+        checkpoint = ReplayCheckpoint.objects.get(name='listener-fix')
+        assert (checkpoint.processed, checkpoint.failed) == (8, 1)
+
+    def test_dry_run_runs_no_listeners_and_saves_nothing(self):
+        result = EventReplayService.replay(
+            listener_paths=[LISTENER], batch_size=2, checkpoint_name='dry', dry_run=True
+        )
+
+        assert result.processed == 7
+        assert replayed == []
+        assert not ReplayCheckpoint.objects.exists()
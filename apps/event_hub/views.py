@@ -0,0 +1,16 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from apps.event_hub.services.metrics import STAGES, EventMetrics
+
+
+@require_GET
+def event_metrics_view(request):
+    """Event pipeline metrics as JSON; ?stage= narrows it to one stage. Staff only."""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+
+    stage = request.GET.get('stage') or None
+    if stage is not None and stage not in STAGES:
+        return JsonResponse({'error': f"Unknown stage, expected one of {', '.join(STAGES)}"}, status=400)
+    return JsonResponse(EventMetrics.snapshot(stage))
@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from groq import Groq
+
+from apps.portal.services.ai_services import LLMService
+from apps.portal.services.fake_llm import FakeLLMServer
+from apps.portal.services.llm_gateway import DEFAULT_MODEL, DEFAULT_PARAMS, LLMGateway
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the LLM gateway against a client per call, using an in-process fake LLM server: "
+        "parallel requests, time to first streamed token, and cached replies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=16)
+        parser.add_argument("--concurrency", type=int, default=4, help="Gateway limiter size and client threads")
+        parser.add_argument("--latency", type=float, default=0.2, help="Fake server seconds before the first token")
+        parser.add_argument("--token-delay", type=float, default=0.002, help="Fake server seconds between chunks")
+
+    def handle(self, *args, **options):
+        server = FakeLLMServer(latency=options["latency"], token_delay=options["token_delay"]).start()
+        try:
+            self._run(server, options)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _report(self, label, elapsed, server, requests_before):
+        self.stdout.write(
+            f"{label:<34} {elapsed * 1000:9.1f} ms   model calls {server.requests - requests_before:4d}"
+            f"   peak in flight {server.max_in_flight:3d}"
+        )
+        server.max_in_flight = 0
+
+    def _run(self, server, options):
+        prompts = [LLMService.get_generate_messages(f"Product {i}") for i in range(options["requests"])]
+        concurrency = options["concurrency"]
+
+        def legacy(messages):
+            # What _make_llm_request did: a new client, and connection, for every call
+            client = Groq(api_key="fake", base_url=server.url)
+            response = client.chat.completions.create(model=DEFAULT_MODEL, messages=messages, **DEFAULT_PARAMS)
+            return response.choices[0].message.content
+
+        before, start = server.requests, time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(legacy, prompts))
+        self._report(f"client per call, {concurrency} threads", time.perf_counter() - start, server, before)
+
+        gateway = LLMGateway(api_key="fake", base_url=server.url, max_concurrency=concurrency)
+        for key in (gateway.cache_key(DEFAULT_MODEL, messages, DEFAULT_PARAMS) for messages in prompts):
+            cache.delete(key)
+        before, start = server.requests, time.perf_counter()
+        gateway.complete_many(prompts)
+        self._report("gateway complete_many", time.perf_counter() - start, server, before)
+
+        before, start = server.requests, time.perf_counter()
+        gateway.complete_many(prompts)
+        self._report("gateway complete_many, cached", time.perf_counter() - start, server, before)
+
+        messages = LLMService.get_generate_messages("Streamed product")
+        before, start = server.requests, time.perf_counter()
+        first_token = None
+        for _ in gateway.stream(messages, use_cache=False):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        total = time.perf_counter() - start
+        self.stdout.write(f"{'stream, first token':<34} {first_token * 1000:9.1f} ms")
+        self._report("stream, whole reply", total, server, before)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.portal.services.fake_llm import FakeLLMServer
+
+
+class Command(BaseCommand):
+    help = "Serve a fake Groq chat completions API locally; set GROQ_BASE_URL to the printed URL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token")
+        parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between streamed chunks")
+
+    def handle(self, *args, **options):
+        server = FakeLLMServer(options["host"], options["port"], latency=options["latency"],
+                               token_delay=options["token_delay"])
+        self.stdout.write(f"Fake LLM listening; export GROQ_BASE_URL={server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -2,11 +2,11 @@ import json
 import logging
 import time
 from typing import Tuple, Optional
-from django.conf import settings
-from groq import Groq
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import httpx
 
+from .llm_gateway import DEFAULT_MODEL, LLMGatewayError, get_llm_gateway
+
 print("=== AI Services module loading ===")
 print(f"Module path: {__file__}")
 logger = logging.getLogger(__name__)
@@ -95,23 +95,13 @@ class LLMService:
             f"attempt {retry_state.attempt_number}"
         )
     )
-    def _make_llm_request(prompt_messages: list, model: str = "llama3-groq-70b-8192-tool-use-preview") -> Tuple[bool, str, Optional[str]]:
-        """Make the actual LLM API request with retry logic"""
+    def _make_llm_request(prompt_messages: list, model: str = DEFAULT_MODEL) -> Tuple[bool, str, Optional[str]]:
+        """Make the LLM API request through the process-wide gateway, which pools, limits and caches"""
         try:
-            client = Groq(api_key=settings.GROQ_API_KEY)
-            
-            response = client.chat.completions.create(
-                model=model,
-                messages=prompt_messages,
-                temperature=0.1,
-                max_tokens=2000,
-                top_p=0.9
-            )
-            
-            return True, response.choices[0].message.content, None
+            return True, get_llm_gateway().complete(prompt_messages, model=model), None
 
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error during LLM request: {e}")
+        except LLMGatewayError as e:
+            logger.error(f"LLM request failed: {e}")
             return False, None, f"Connection error: {str(e)}"
         except Exception as e:
             logger.error(f"Unexpected error during LLM request: {e}")
@@ -130,14 +120,10 @@ class LLMService:
             ]
         }
 
-    @classmethod
-    def generate_product_tree(cls, product_name: str, product_description: str, additional_context: str = "") -> Tuple[bool, str, Optional[str]]:
-        """Generate initial product tree structure."""
-        print("=== Starting generate_product_tree ===")  # Debug print
-        print(f"Product name: {product_name}")          # Debug print
-        logger.info(f"Starting generate_product_tree for product: {product_name}")
-        
-        prompt_messages = [{
+    @staticmethod
+    def get_generate_messages(product_name: str) -> list:
+        """Prompt for a new product tree; shared by the blocking and the streamed generation"""
+        return [{
             "role": "system",
             "content": """You are a product strategist creating intuitive product trees that focus on user journeys and business value.
 Think about the key paths users take to achieve their goals."""
@@ -153,6 +139,15 @@ Please return the response as a JSON object with this structure:
     "children": []
 }}"""
         }]
+
+    @classmethod
+    def generate_product_tree(cls, product_name: str, product_description: str, additional_context: str = "") -> Tuple[bool, str, Optional[str]]:
+        """Generate initial product tree structure."""
+        print("=== Starting generate_product_tree ===")  # Debug print
+        print(f"Product name: {product_name}")          # Debug print
+        logger.info(f"Starting generate_product_tree for product: {product_name}")
+        
+        prompt_messages = cls.get_generate_messages(product_name)
         
         print("=== Making LLM request ===")  # Debug print
         success, content, error = cls._make_llm_request(prompt_messages)
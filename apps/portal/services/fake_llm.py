@@ -0,0 +1,150 @@
+"""
+A local stand-in for the Groq chat completions API, for tests, local
+development and benchmarks without network access or an API key.
+
+It answers POST /openai/v1/chat/completions, streamed or not, with a small
+product tree in the JSON shape the product tree prompts ask for, named after
+the product mentioned in the last message. Point GROQ_BASE_URL at it, e.g. by
+running `manage.py fake_llm_server`, or start one in-process with start().
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+COMPLETIONS_PATH = '/openai/v1/chat/completions'
+
+
+def fake_product_tree(messages: List[Dict]) -> str:
+    """The reply for a conversation: a product tree for the product named in it"""
+    text = messages[-1].get('content', '') if messages else ''
+    match = re.search(r"(?:interact with|for product:?) ([^\n.]+)", text)
+    product = match.group(1).strip() if match else 'Product'
+    tree = {
+        'name': product,
+        'description': f"How people use {product}",
+        'lens_type': 'experience',
+        'children': [
+            {
+                'name': journey,
+                'description': f"{journey} in {product}",
+                'lens_type': 'experience',
+                'children': [],
+            }
+            for journey in ('Onboarding', 'Core workflow', 'Collaboration', 'Billing')
+        ],
+    }
+    return json.dumps(tree, indent=2)
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection pooling is exercised
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if self.path.rstrip('/') != COMPLETIONS_PATH:
+            self._send_json(404, {'error': {'message': f"Unknown path {self.path}"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if server.fail:
+                self._send_json(500, {'error': {'message': 'Fake LLM failure'}})
+                return
+            content = fake_product_tree(body.get('messages', []))
+            if body.get('stream'):
+                self._stream(body.get('model', ''), content)
+            else:
+                time.sleep(server.latency + server.token_delay * len(self._chunks(content)))
+                self._send_json(200, {
+                    'id': f"fake-{server.requests}",
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': body.get('model', ''),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': content},
+                        'finish_reason': 'stop',
+                    }],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+                })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    @staticmethod
+    def _chunks(content: str, size: int = 8) -> List[str]:
+        return [content[i:i + size] for i in range(0, len(content), size)]
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, model: str, content: str) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        time.sleep(self.server.latency)
+        for i, piece in enumerate(self._chunks(content)):
+            time.sleep(self.server.token_delay)
+            chunk = {
+                'id': 'fake-stream',
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}],
+            }
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self._write_chunk('')
+
+    def _write_chunk(self, text: str) -> None:
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """
+    Args:
+        port: 0 picks a free port
+        latency: Seconds before the first token of every reply
+        token_delay: Seconds between streamed chunks of eight characters
+        fail: Answer every request with a 500
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0, token_delay: float = 0,
+                 fail: bool = False):
+        super().__init__((host, port), FakeLLMHandler)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeLLMServer':
+        """Serve from a daemon thread; stop with shutdown()"""
+        threading.Thread(target=self.serve_forever, name='fake-llm', daemon=True).start()
+        return self
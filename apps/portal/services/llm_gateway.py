@@ -0,0 +1,242 @@
+"""
+Process-wide gateway for LLM chat completions.
+
+The gateway runs one asyncio event loop in a daemon thread and keeps a single
+AsyncGroq client on it, so every request of the process shares its connection
+pool instead of building a client per call. Sync code (views, Django-Q tasks)
+and async code submit requests to that loop and either wait for the reply or
+read the tokens as they arrive.
+
+An asyncio semaphore caps the requests in flight at LLM_MAX_CONCURRENCY;
+further requests wait their turn rather than piling onto the provider's rate
+limit. Replies are cached in the Django cache under a hash of the model, the
+messages and the sampling parameters, so an identical request, e.g. the page
+load that follows a streamed preview, is answered without calling the model.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+from groq import AsyncGroq
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "llama3-groq-70b-8192-tool-use-preview"
+DEFAULT_PARAMS = {'temperature': 0.1, 'max_tokens': 2000, 'top_p': 0.9}
+
+
+class LLMGatewayError(Exception):
+    """The model could not be reached or returned an error"""
+
+
+class LLMGateway:
+    """
+    Args:
+        api_key: Defaults to GROQ_API_KEY
+        base_url: Defaults to GROQ_BASE_URL, None meaning Groq itself
+        max_concurrency: Requests sent to the model at once
+        max_connections: Size of the client's connection pool
+        timeout: Seconds a request, or the wait for the next streamed token, may take
+    """
+
+    CACHE_PREFIX = 'llm:response'
+
+    def __init__(self, api_key: str = None, base_url: str = None, max_concurrency: int = None,
+                 max_connections: int = None, timeout: float = None):
+        self.api_key = api_key or settings.GROQ_API_KEY
+        self.base_url = base_url or settings.GROQ_BASE_URL
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.max_connections = max_connections or settings.LLM_MAX_CONNECTIONS
+        self.timeout = timeout or settings.LLM_TIMEOUT
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._pid = None
+
+    # Event loop and client
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """The gateway's loop, started on first use and again in a forked worker"""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='llm-gateway', daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+                self._loop, self._pid = loop, os.getpid()
+            return self._loop
+
+    async def _setup(self) -> None:
+        # Created on the loop they are used from
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = AsyncGroq(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=self.timeout,
+            ),
+        )
+
+    def _submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop())
+
+    # Cache
+
+    @classmethod
+    def cache_key(cls, model: str, messages: List[Dict], params: Dict) -> str:
+        """Content address of a request: the same model, messages and parameters give the same key"""
+        document = json.dumps({'model': model, 'messages': messages, 'params': params},
+                              sort_keys=True, separators=(',', ':'))
+        return f"{cls.CACHE_PREFIX}:{hashlib.sha256(document.encode()).hexdigest()}"
+
+    def _cached(self, key: str) -> Optional[str]:
+        content = cache.get(key)
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    @staticmethod
+    def _store(key: str, content: str) -> None:
+        if content:
+            cache.set(key, content, settings.LLM_CACHE_TIMEOUT)
+
+    # Requests, run on the gateway loop
+
+    async def _complete(self, model: str, messages: List[Dict], params: Dict) -> str:
+        async with self._semaphore:
+            try:
+                response = await self._client.chat.completions.create(model=model, messages=messages, **params)
+            except Exception as e:
+                raise LLMGatewayError(f"LLM request failed: {e}") from e
+        return response.choices[0].message.content or ''
+
+    async def _stream(self, model: str, messages: List[Dict], params: Dict, tokens: queue.Queue) -> None:
+        try:
+            async with self._semaphore:
+                stream = await self._client.chat.completions.create(
+                    model=model, messages=messages, stream=True, **params
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        tokens.put(('token', delta))
+            tokens.put(('done', None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            tokens.put(('error', f"LLM request failed: {e}"))
+
+    # Public API
+
+    def complete(self, messages: List[Dict], model: str = DEFAULT_MODEL, use_cache: bool = True, **params) -> str:
+        """
+        Get a whole completion, blocking the calling thread until it arrives.
+
+        Raises:
+            LLMGatewayError: The request failed or timed out
+        """
+        params = {**DEFAULT_PARAMS, **params}
+        key = self.cache_key(model, messages, params)
+        if use_cache and (content := self._cached(key)) is not None:
+            return content
+        future = self._submit(self._complete(model, messages, params))
+        try:
+            content = future.result(timeout=self.timeout)
+        except TimeoutError as e:
+            future.cancel()
+            raise LLMGatewayError("LLM request timed out") from e
+        if use_cache:
+            self._store(key, content)
+        return content
+
+    async def acomplete(self, messages: List[Dict], model: str = DEFAULT_MODEL, use_cache: bool = True,
+                        **params) -> str:
+        """complete for async callers; waits without blocking their event loop"""
+        params = {**DEFAULT_PARAMS, **params}
+        key = self.cache_key(model, messages, params)
+        if use_cache and (content := await asyncio.to_thread(self._cached, key)) is not None:
+            return content
+        future = self._submit(self._complete(model, messages, params))
+        try:
+            content = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError as e:
+            future.cancel()
+            raise LLMGatewayError("LLM request timed out") from e
+        if use_cache:
+            await asyncio.to_thread(self._store, key, content)
+        return content
+
+    def complete_many(self, requests: List[List[Dict]], model: str = DEFAULT_MODEL, **params) -> List[str]:
+        """
+        Run several completions in parallel, as many at once as the limiter allows.
+
+        Args:
+            requests: One message list per completion
+
+        Returns:
+            The completions, in the order of requests
+        """
+        async def gather():
+            return await asyncio.gather(*(self.acomplete(messages, model, **params) for messages in requests))
+
+        return self._submit(gather()).result()
+
+    def stream(self, messages: List[Dict], model: str = DEFAULT_MODEL, use_cache: bool = True,
+               **params) -> Iterator[str]:
+        """
+        Yield the completion token by token as the model produces it. A cached
+        reply is yielded in one piece; a finished stream is cached whole.
+        Closing the iterator early cancels the request.
+
+        Raises:
+            LLMGatewayError: The request failed, or no token came within the timeout
+        """
+        params = {**DEFAULT_PARAMS, **params}
+        key = self.cache_key(model, messages, params)
+        if use_cache and (content := self._cached(key)) is not None:
+            yield content
+            return
+
+        tokens = queue.Queue()
+        future = self._submit(self._stream(model, messages, params, tokens))
+        parts = []
+        try:
+            while True:
+                try:
+                    kind, value = tokens.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise LLMGatewayError("LLM stream timed out")
+                if kind == 'error':
+                    raise LLMGatewayError(value)
+                if kind == 'done':
+                    break
+                parts.append(value)
+                yield value
+        finally:
+            future.cancel()
+        if use_cache:
+            self._store(key, ''.join(parts))
+
+    def stats(self) -> Dict[str, int]:
+        """Cache hit/miss counters for this process"""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+@lru_cache(maxsize=None)
+def get_llm_gateway() -> LLMGateway:
+    """The process-wide gateway"""
+    return LLMGateway()
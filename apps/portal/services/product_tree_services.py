@@ -1,5 +1,6 @@
 from typing import Tuple, Optional, Dict, Any
-from apps.capabilities.product_management.models import Product
+from apps.capabilities.product_management.models import Product, ProductTree
+from apps.capabilities.product_management.services import ProductTreeWriter
 from .ai_services import LLMService
 import json
 import logging
@@ -115,13 +116,25 @@ class ProductTreeService:
     def save_tree(self, product: Product, tree: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
         Save the generated tree to the database.
+
+        The top node of the tree stands for the product itself; its children
+        become the root areas of the product's ProductTree. A tree that
+        already has areas is updated in diff mode, so only changed areas are
+        written and areas the refined tree still contains keep their ids.
         Returns: (success, error_message)
         """
         try:
-            # Convert dict to JSON string for storage if needed
-            tree_json = json.dumps(tree)
-            # Implement actual storage logic here
-            # For now, this is a placeholder
+            if isinstance(tree, str):
+                tree = json.loads(tree)
+            nodes = tree.get('children') or []
+
+            product_tree = product.product_trees.first()
+            if product_tree is None:
+                product_tree = ProductTree.objects.create(name=f"{product.name} ({product.slug})", product=product)
+                totals = ProductTreeWriter.replace(product_tree, nodes)
+            else:
+                totals = ProductTreeWriter.apply(product_tree, nodes)
+            logger.info(f"Saved product tree {product_tree.id} for {product.slug}: {totals}")
             return True, None
         except Exception as e:
             logger.error(f"Failed to save tree: {e}")
@@ -133,9 +146,17 @@ class ProductTreeService:
         Returns: The tree as a Python dict or None if not found
         """
         try:
-            # Implement actual retrieval logic here
-            # When implemented, remember to parse JSON string to dict
-            return None
+            product_tree = product.product_trees.first()
+            if product_tree is None:
+                return None
+            children = ProductTreeWriter.get_tree_nodes(product_tree.id)
+            if not children:
+                return None
+            return {
+                'name': product.name,
+                'description': product.short_description or '',
+                'children': children,
+            }
         except Exception as e:
             logger.error(f"Failed to retrieve tree: {e}")
             return None
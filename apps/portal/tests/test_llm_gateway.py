@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from django.core.cache import cache
+
+from apps.portal.services.ai_services import LLMService
+from apps.portal.services.fake_llm import FakeLLMServer
+from apps.portal.services.llm_gateway import LLMGateway, LLMGatewayError
+
+
+@pytest.fixture
+def server():
+    server = FakeLLMServer(latency=0.05).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gateway(server):
+    cache.clear()
+    return LLMGateway(api_key="fake", base_url=server.url, max_concurrency=2, timeout=10)
+
+
+class TestLLMGateway:
+    def test_identical_requests_are_answered_from_the_cache(self, server, gateway):
+        messages = LLMService.get_generate_messages("Canopy")
+
+        first = gateway.complete(messages)
+        second = gateway.complete(messages)
+
+        assert json.loads(first)["name"] == "Canopy"
+        assert second == first
+        assert server.requests == 1
+        assert gateway.stats() == {"hits": 1, "misses": 1}
+        gateway.complete(messages, temperature=0.5)
+        assert server.requests == 2
+
+    def test_parallel_requests_are_limited(self, server, gateway):
+        prompts = [LLMService.get_generate_messages(f"Product {i}") for i in range(6)]
+
+        replies = gateway.complete_many(prompts)
+
+        assert [json.loads(reply)["name"] for reply in replies] == [f"Product {i}" for i in range(6)]
+        assert server.requests == 6
+        assert server.max_in_flight == 2
+
+    def test_stream_yields_tokens_and_caches_the_reply(self, server, gateway):
+        messages = LLMService.get_generate_messages("Streamed")
+
+        tokens = list(gateway.stream(messages))
+
+        assert len(tokens) > 1
+        assert list(gateway.stream(messages)) == ["".join(tokens)]
+        assert gateway.complete(messages) == "".join(tokens)
+        assert server.requests == 1
+
+    def test_failures_raise(self, server, gateway):
+        server.fail = True
+        with pytest.raises(LLMGatewayError):
+            gateway.complete(LLMService.get_generate_messages("Broken"))
+        with pytest.raises(LLMGatewayError):
+            list(gateway.stream(LLMService.get_generate_messages("Broken")))
@@ -31,6 +31,7 @@ from .views.product_tree import (
     EditProductTreeView,
     RefineProductTreeView,
     GenerateProductTreeView,
+    StreamProductTreeView,
     SaveProductTreeView
 )
 from .views.agreement import (
@@ -82,6 +83,9 @@ urlpatterns = [
     path('product/<slug:product_slug>/tree/edit/', EditProductTreeView.as_view(), name='edit-product-tree'),
     path('product/<slug:product_slug>/tree/refine/', RefineProductTreeView.as_view(), name='refine-product-tree'),
     path('product/<slug:product_slug>/tree/generate/', GenerateProductTreeView.as_view(), name='generate-product-tree'),
+    path('product/<slug:product_slug>/tree/generate/stream/',
+         StreamProductTreeView.as_view(),
+         name='stream-product-tree'),
     path('product/<slug:product_slug>/tree/save/', SaveProductTreeView.as_view(), name='save-product-tree'),
     path('product/<slug:product_slug>/users/<int:user_id>/update/', 
          PortalUpdateProductUserView.as_view(), 
@@ -5,9 +5,13 @@ from django.contrib import messages
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.html import escape
 from apps.capabilities.product_management.models import Product
 from apps.capabilities.security.services import RoleService
+from apps.portal.services.ai_services import LLMService
+from apps.portal.services.llm_gateway import LLMGatewayError, get_llm_gateway
 from apps.portal.services.product_tree_services import ProductTreeService
 from .base import PortalBaseView
 from apps.portal.utils.json_utils import TreeJSONEncoder
@@ -171,6 +175,59 @@ class GenerateProductTreeView(PortalBaseView):
             return redirect('portal:create-product-tree', product_slug=product_slug)
 
 
+def server_sent_event(event: str, data: str = '') -> str:
+    """One SSE message; every line of data gets its own data field"""
+    return f"event: {event}\n" + ''.join(f"data: {line}\n" for line in data.split('\n')) + "\n"
+
+
+@method_decorator(csrf_protect, name='dispatch')
+class StreamProductTreeView(PortalBaseView):
+    """
+    Streams tree generation to the create page over server-sent events.
+
+    POST renders the HTMX fragment that opens the stream; GET is the stream
+    itself, a 'token' event per chunk of the reply and then 'done' or
+    'error'. The page then submits its form to GenerateProductTreeView,
+    whose identical LLM request is answered from the gateway's cache.
+    """
+    template_name = 'portal/product/product_trees/partials/generation_stream.html'
+
+    def get_product(self, request, product_slug):
+        product = get_object_or_404(Product, slug=product_slug)
+        if not RoleService.has_product_management_access(request.user.person, product):
+            return None
+        return product
+
+    def post(self, request, product_slug):
+        product = self.get_product(request, product_slug)
+        if product is None:
+            return JsonResponse({"error": "You don't have permission to edit this product"}, status=403)
+        context = {'stream_url': reverse('portal:stream-product-tree', args=(product.slug,))}
+        return render(request, self.template_name, context)
+
+    def get(self, request, product_slug):
+        product = self.get_product(request, product_slug)
+        if product is None:
+            return JsonResponse({"error": "You don't have permission to edit this product"}, status=403)
+        prompt_messages = LLMService.get_generate_messages(product.name)
+
+        def events():
+            # Don't let the browser reconnect, which would start the generation over
+            yield "retry: 86400000\n\n"
+            try:
+                for token in get_llm_gateway().stream(prompt_messages):
+                    yield server_sent_event('token', escape(token))
+                yield server_sent_event('done')
+            except LLMGatewayError as e:
+                logger.error(f"Streaming tree generation failed: {e}")
+                yield server_sent_event('error', "The AI service is temporarily unavailable.")
+
+        response = StreamingHttpResponse(events(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
 @method_decorator(csrf_protect, name='dispatch')
 class RefineProductTreeView(PortalBaseView):
     """View for refining product tree."""
@@ -330,10 +387,11 @@ class ViewProductTreeView(PortalBaseView):
         context = super().get_context_data(**kwargs)
         product = get_object_or_404(Product, slug=self.kwargs['product_slug'])
         tree_service = ProductTreeService()
+        tree_data = tree_service.get_tree(product)
         
         context.update({
             'product': product,
-            'tree_data': tree_service.get_tree(product),
+            'tree_data': json.dumps(tree_data) if tree_data else None,
             'can_edit': RoleService.has_product_management_access(self.request.user.person, product),
             'page_title': f"Product Tree - {product.name}"
         })
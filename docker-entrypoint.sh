@@ -5,6 +5,7 @@ if [ "$SERVICE_TYPE" != "worker" ]; then
     echo "Apply database migrations"
     echo "----------------------------------------------------------"
     python manage.py migrate --run-syncdb
+    python manage.py createcachetable
 
     # Prepare static files
     echo "Preparing static files"